@@ -0,0 +1,327 @@
+"""
+Bordro motoru, okuma/ayrıştırma ve dışa aktarım için tekrarlanabilir performans ölçümü ve doğruluk kontrolü.
+
+    python -m benchmarks.bench_payroll
+    python -m benchmarks.bench_payroll --boyutlar 1000,10000 --paralel 2 --cikti bench.json --onceki eski.json
+
+Sabit tohumlu sentetik liste (asgari ücret yığılmaları, standart kademeler, SGK tavanı üstü, Türkçe biçimli
+maaş metinleri, karışık Brüt/Net) üzerinde her hızlı yol, skaler motorla (calculate_payroll_month) satır satır
+hesaplanan referansla kuruşuna (0,01 TL) kadar karşılaştırılır. Sonuçlar JSON olarak yazılır; --onceki ile
+önceki bir çalıştırmaya göre yavaşlamalar listelenir. Doğrulama başarısızsa çıkış kodu 1'dir.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from bordro import DEFAULT_RULES, PAYROLL_FIELDS, Profiler, ParallelPayroll, profiling
+from bordro.dedup import calculate_employee_payroll_dedup
+from bordro.engine import calculate_employer_cost_batch, calculate_payroll_batch, calculate_payroll_month
+from bordro.export import export_bytes
+from bordro.parsing import parse_number_column, read_roster
+from bordro.pipeline import PayrollPipeline, iter_report_chunks
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+# Referansla karşılaştırılan en fazla satır (skaler motor satır başına ~1 ms)
+DEFAULT_SAMPLE_ROWS = 2_000
+# Excel çıktısı bu satır sayısına kadar ölçülür (openpyxl ile 1M satır dakikalar sürer)
+DEFAULT_XLSX_MAX_ROWS = 10_000
+# Kuruş: hızlı yollar ile referans arasındaki en büyük izin verilen fark (TL)
+TOLERANCE = 0.01
+# Önceki çalıştırmaya göre bu orandan fazla yavaşlama uyarı olarak listelenir
+REGRESSION_RATIO = 1.10
+
+COLUMNS = {"name": "Personel Adı", "wage": "Maaş", "type": "Ücret Tipi", "dept": "Departman"}
+DEPARTMENTS = ("Üretim", "Satış", "Muhasebe", "İnsan Kaynakları", "Bilgi İşlem", "Lojistik", "Yönetim")
+# Standart ücret kademeleri (brüt); Net satırlarda aynı kademelerin yaklaşık neti kullanılır
+PAY_GRADES = (36_000, 40_000, 45_000, 50_000, 60_000, 75_000, 90_000, 120_000)
+
+# --- SENTETİK LİSTE ---
+
+def _tr_format(values, rng):
+    """Sayıları karışık Türkçe biçimli metinlere çevirir: '1.234.567,89', '1234567,89', '45.000' ve boşluklu."""
+    style = rng.choice(4, size=len(values), p=[0.6, 0.2, 0.1, 0.1])
+    swap = str.maketrans(",.", ".,")
+    texts = []
+    for value, kind in zip(values.tolist(), style.tolist()):
+        if kind == 2 and value == int(value):
+            texts.append(f"{int(value):,}".translate(swap))
+        elif kind == 1:
+            texts.append(f"{value:.2f}".replace(".", ","))
+        else:
+            text = f"{value:,.2f}".translate(swap)
+            texts.append(f" {text} " if kind == 3 else text)
+    return texts
+
+def synthetic_roster(n, seed=2026, rules=DEFAULT_RULES):
+    """
+    Gerçekçi dağılımlı personel listesi ve beklenen değerler. Dönüş: (DataFrame, maaşlar, ücret tipleri).
+    Dağılım: %20 asgari ücret, %15 standart kademe, %52 log-normal (medyan ~60.000), %10 SGK tavanı üstü,
+    %2 asgari ücret altı (kısmi süreli), %1 boş maaş hücresi (hesaplamada atlanır). Satırların %30'u Net.
+    """
+    rng = np.random.default_rng(seed)
+    kind = rng.choice(6, size=n, p=[0.20, 0.15, 0.52, 0.10, 0.02, 0.01])
+    is_net = rng.random(n) < 0.30
+    net_factor = np.where(is_net, 0.72, 1.0)
+
+    wages = np.select(
+        [kind == 0, kind == 1, kind == 2, kind == 3, kind == 4],
+        [
+            np.where(is_net, rules.asgari_ucret_net, rules.asgari_ucret_brut),
+            np.round(np.asarray(PAY_GRADES)[rng.integers(len(PAY_GRADES), size=n)] * net_factor, -2),
+            np.round(np.maximum(rng.lognormal(np.log(60_000), 0.45, n), rules.asgari_ucret_brut) * net_factor, 2),
+            np.round(rules.sgk_tavan * rng.uniform(1.05, 3.0, n) * net_factor, 2),
+            np.round(rules.asgari_ucret_brut * rng.uniform(0.3, 0.95, n), 2)
+        ],
+        default=0.0
+    )
+    types = np.where(is_net, "Net", "Brüt").astype(object)
+    wage_texts = np.asarray(_tr_format(wages, rng), dtype=object)
+    wage_texts[kind == 5] = ""
+
+    df = pd.DataFrame({
+        COLUMNS["name"]: [f"Personel {i + 1}" for i in range(n)],
+        COLUMNS["wage"]: wage_texts,
+        COLUMNS["type"]: types,
+        COLUMNS["dept"]: np.asarray(DEPARTMENTS, dtype=object)[rng.integers(len(DEPARTMENTS), size=n)]
+    })
+    return df, wages, types
+
+# --- REFERANS (SKALER MOTOR) ---
+
+def reference_payroll(wage, calculation_type, rules=DEFAULT_RULES):
+    """Bir personelin 12 aylık bordrosu skaler motorla: (12, len(PAYROLL_FIELDS))."""
+    months = np.empty((12, len(PAYROLL_FIELDS)))
+    cumulative_tax_base = 0.0
+    for month in range(12):
+        res = calculate_payroll_month(wage, calculation_type, month, cumulative_tax_base, rules)
+        months[month] = [res[field] for field in PAYROLL_FIELDS]
+        cumulative_tax_base += res["income_tax_base"]
+    return months
+
+def _stacked(payroll, rows):
+    """PAYROLL_FIELDS -> (n, 12) sözlüğünden örnek satırların (k, 12, alan) dizisi."""
+    return np.stack([payroll[field][rows] for field in PAYROLL_FIELDS], axis=-1)
+
+def _check(name, size, actual, expected):
+    diff = float(np.max(np.abs(actual - expected))) if np.size(actual) else 0.0
+    return {"size": size, "path": name, "rows": int(len(actual)), "max_abs_diff": diff, "ok": diff < TOLERANCE}
+
+def net_target_check(size, payroll, rows, wages, types, rules=DEFAULT_RULES):
+    """Net satırlarda her ayın neti hedefe eşit olmalı (asgari ücrete sabitlenen aylar hariç)."""
+    net_rows = rows[types[rows] == "Net"]
+    net_pay = payroll["net_pay"][net_rows]
+    solved = payroll["gross_wage"][net_rows] > rules.asgari_ucret_brut + TOLERANCE
+    return _check("net_target", size, net_pay[solved], np.broadcast_to(wages[net_rows, None], net_pay.shape)[solved])
+
+# --- ÖLÇÜM ---
+
+def _time(fn, repeat, budget=2.0):
+    """
+    fn'i en az bir, en fazla repeat kez (toplam süre budget saniyeyi geçene kadar) çalıştırır.
+    Dönüş: (en kısa süre, çalıştırma sayısı, son sonuç)
+    """
+    best, runs, total, result = float("inf"), 0, 0.0, None
+    while runs < repeat and (runs == 0 or total < budget):
+        result = None  # Önceki sonuç bırakılır; büyük listelerde iki sonuç aynı anda bellekte tutulmaz
+        started = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - started
+        best, runs, total = min(best, seconds), runs + 1, total + seconds
+    return best, runs, result
+
+def _timing(size, name, seconds, runs, rows=None):
+    rows = size if rows is None else rows
+    return {"size": size, "path": name, "seconds": round(seconds, 6), "runs": runs,
+            "rows_per_sec": round(rows / seconds, 1) if seconds > 0 else None}
+
+def bench_size(n, args, rules=DEFAULT_RULES):
+    """Bir liste boyutu için süreler, hat aşamaları ve doğrulama sonuçları."""
+    timings, checks = [], []
+    df, wages, types = synthetic_roster(n, args.tohum, rules)
+    rng = np.random.default_rng(args.tohum + n)
+    valid = np.flatnonzero(wages != 0)
+    sample = valid if not args.ornek or len(valid) <= args.ornek else np.sort(rng.choice(valid, args.ornek, replace=False))
+    expected = np.stack([reference_payroll(wages[i], types[i], rules) for i in sample])
+
+    def log(text):
+        print(f"  {n:>9,} | {text}", file=sys.stderr)
+
+    # Okuma ve ayrıştırma
+    csv_data = df.to_csv(index=False, sep=";").encode("utf-8")
+    seconds, runs, roster = _time(lambda: read_roster(io.BytesIO(csv_data), file_name="liste.csv"), args.tekrar)
+    timings.append(_timing(n, "read_csv", seconds, runs))
+    seconds, runs, parsed = _time(lambda: parse_number_column(roster[COLUMNS["wage"]]), args.tekrar)
+    timings.append(_timing(n, "parse", seconds, runs))
+    checks.append(_check("parse", n, parsed.values, wages))
+    log(f"okuma {timings[-2]['seconds']:.3f} sn, ayrıştırma {seconds:.3f} sn")
+    del roster, csv_data
+
+    # Skaler motor (örnek satırlar; satır/sn örnek üzerinden)
+    scalar_rows = sample[:min(len(sample), 200)]
+    seconds, runs, _ = _time(lambda: [reference_payroll(wages[i], types[i], rules) for i in scalar_rows], 1)
+    timings.append(_timing(n, "engine_scalar", seconds, runs, rows=len(scalar_rows)))
+
+    # Motorun hızlı yolları
+    target = wages[valid]
+    sample_pos = np.searchsorted(valid, sample)
+    paths = {
+        "engine_batch": lambda: calculate_payroll_batch(target, types[valid], rules),
+        "engine_dedup": lambda: _employee_with_employer(target, types[valid], rules),
+    }
+    if args.paralel > 1:
+        executor = ParallelPayroll(rules, args.paralel, min_rows_per_worker=1_000)
+        paths["engine_parallel"] = lambda: _employee_with_employer(target, types[valid], rules, executor)
+    for name, fn in paths.items():
+        seconds, runs, payroll = _time(fn, args.tekrar)
+        timings.append(_timing(n, name, seconds, runs, rows=len(valid)))
+        checks.append(_check(name, n, _stacked(payroll, sample_pos), expected))
+        if name == "engine_batch":
+            checks.append(net_target_check(n, payroll, sample_pos, target, types[valid], rules))
+        log(f"{name} {seconds:.3f} sn ({len(valid) / seconds:,.0f} satır/sn)")
+        del payroll
+    if args.paralel > 1:
+        executor.close()
+
+    # Uçtan uca hat (aşama süreleri ölçüm modülünden)
+    profiler = Profiler()
+    token = profiling.activate(profiler)
+    try:
+        started = time.perf_counter()
+        with PayrollPipeline(workers=args.paralel) as pipeline:
+            results, block = pipeline.run(
+                df, None, COLUMNS["wage"], COLUMNS["name"], COLUMNS["dept"], 0.0, types[valid], rules, 0.25
+            )
+        timings.append(_timing(n, "pipeline", time.perf_counter() - started, 1))
+    finally:
+        profiling.deactivate(token)
+    checks.append(_check("pipeline", n, block.data[sample_pos], expected))
+    yearly = results[["Toplam_Yillik_Maliyet", "Yillik_Net_Ucret", "Yillik_Gelir_Vergisi"]].to_numpy()[sample_pos]
+    fields = [PAYROLL_FIELDS.index(field) for field in ("total_cost", "net_pay", "income_tax")]
+    checks.append(_check("pipeline_yearly", n, yearly, expected[:, :, fields].sum(axis=1)))
+    log(f"hat {timings[-1]['seconds']:.3f} sn")
+
+    # Dışa aktarım
+    formats = [".csv"] + ([".parquet"] if _has_pyarrow() else []) + ([".xlsx"] if n <= args.xlsx_en_fazla else [])
+    for suffix in formats:
+        seconds, runs, data = _time(lambda: export_bytes(iter_report_chunks(results, block), suffix), 1)
+        timings.append(_timing(n, f"export{suffix.replace('.', '_')}", seconds, runs))
+        log(f"dışa aktarım {suffix} {seconds:.3f} sn ({len(data) / 2**20:,.1f} MB)")
+
+    return timings, profiler.records(), checks
+
+def _employee_with_employer(wages, types, rules, executor=None):
+    payroll, _ = calculate_employee_payroll_dedup(wages, types, rules, executor=executor)
+    payroll.update(calculate_employer_cost_batch(payroll["gross_wage"], rules))
+    return payroll
+
+def _has_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+# --- RAPOR ---
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _package_version():
+    from importlib import metadata
+
+    try:
+        return metadata.version("maas")
+    except metadata.PackageNotFoundError:
+        return None
+
+def environment(args):
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "version": _package_version(),
+        "git": _git_revision(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": args.tohum,
+        "sample_rows": args.ornek,
+        "workers": args.paralel,
+        "tolerance": TOLERANCE
+    }
+
+def compare(previous, timings):
+    """Önceki sonuç dosyasına göre oranlar (yeni / eski süre) ve yavaşlama uyarıları."""
+    old = {(t["size"], t["path"]): t["seconds"] for t in previous.get("timings", [])}
+    print(f"\nÖnceki çalıştırmaya göre ({previous.get('environment', {}).get('git') or '?'}):")
+    slower = 0
+    for t in timings:
+        before = old.get((t["size"], t["path"]))
+        if not before:
+            continue
+        ratio = t["seconds"] / before
+        flag = "  <-- yavaşlama" if ratio > REGRESSION_RATIO else ""
+        slower += bool(flag)
+        print(f"  {t['path']:<16} {t['size']:>9,}  {before:9.3f} -> {t['seconds']:9.3f} sn  ({ratio:.2f}x){flag}")
+    return slower
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--boyutlar", default=",".join(map(str, DEFAULT_SIZES)),
+        help="Virgülle ayrılmış liste boyutları (varsayılan: 1000,10000,100000,1000000)"
+    )
+    parser.add_argument("--tohum", type=int, default=2026, help="Sentetik liste tohumu")
+    parser.add_argument("--tekrar", type=int, default=3, help="Ölçüm başına en fazla tekrar (en kısa süre raporlanır)")
+    parser.add_argument(
+        "--ornek", type=int, default=DEFAULT_SAMPLE_ROWS,
+        help="Referansla karşılaştırılan en fazla satır (0: tümü)"
+    )
+    parser.add_argument("--paralel", type=int, default=1, help="Süreç havuzu yolu için süreç sayısı (1: ölçülmez)")
+    parser.add_argument(
+        "--xlsx-en-fazla", type=int, default=DEFAULT_XLSX_MAX_ROWS, help="Excel çıktısının ölçüldüğü en büyük boyut"
+    )
+    parser.add_argument("--cikti", default="bench_payroll.json", help="Sonuç dosyası (JSON)")
+    parser.add_argument("--onceki", help="Karşılaştırılacak önceki sonuç dosyası (JSON)")
+    args = parser.parse_args()
+
+    report = {"environment": environment(args), "timings": [], "stages": {}, "checks": []}
+    for n in (int(size) for size in args.boyutlar.split(",")):
+        timings, stages, checks = bench_size(n, args)
+        report["timings"] += timings
+        report["stages"][str(n)] = stages
+        report["checks"] += checks
+
+    with open(args.cikti, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"\n{'Yol':<16} {'Boyut':>9} {'Süre (sn)':>10} {'Satır/sn':>14}")
+    for t in report["timings"]:
+        print(f"{t['path']:<16} {t['size']:>9,} {t['seconds']:>10.3f} {t['rows_per_sec'] or 0:>14,.0f}")
+    failed = [c for c in report["checks"] if not c["ok"]]
+    print(f"\nDoğrulama: {len(report['checks']) - len(failed)} / {len(report['checks'])} kontrol kuruşuna kadar eşit")
+    for c in failed:
+        print(f"  HATA {c['path']} ({c['size']:,}): en büyük fark {c['max_abs_diff']:.6f} TL")
+    if args.onceki:
+        with open(args.onceki, encoding="utf-8") as f:
+            compare(json.load(f), report["timings"])
+    print(f"-> {args.cikti}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Senaryo karşılaştırması ile ayrı ayrı hesaplamanın süre karşılaştırması.
+
+    python -m benchmarks.bench_scenarios --personel 20000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from bordro import SGK_TESVIK_SECENEKLERI, rules_for_incentive
+from bordro.pipeline import PayrollPipeline, extract_roster_columns
+from bordro.scenarios import run_scenarios
+
+def synthetic_roster(n, seed=2026):
+    """Asgari ücret ile 300.000 TL arası rastgele maaşlı personel listesi."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Personel": [f"Personel {i + 1}" for i in range(n)],
+        "Maaş": rng.uniform(28_000, 300_000, n).round(2)
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--personel", type=int, default=20_000)
+    args = parser.parse_args()
+
+    df = synthetic_roster(args.personel)
+    raise_rates = [rate / 100 for rate in range(20, 51, 5)]
+    incentives = list(SGK_TESVIK_SECENEKLERI)
+    calc_types = ["Brüt", "Net"]
+    scenario_count = len(raise_rates) * len(incentives) * len(calc_types)
+
+    started = time.perf_counter()
+    roster = extract_roster_columns(df, "Maaş", "Personel", "Seçiniz")
+    table = run_scenarios(roster["raw_wages"], raise_rates, incentives, calc_types, 0.25)
+    sweep_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    max_diff = 0.0
+    for row in table.itertuples(index=False):
+        results, _ = PayrollPipeline().run(
+            df, None, "Maaş", "Personel", "Seçiniz", row[0] / 100, row[2], rules_for_incentive(row[1]), 0.25,
+            detailed=False
+        )
+        max_diff = max(max_diff, abs(results["Toplam_Yillik_Maliyet"].sum() - row[3]))
+    separate_time = time.perf_counter() - started
+
+    print(f"{args.personel:,} personel x {scenario_count} senaryo")
+    print(f"  Senaryo karşılaştırması : {sweep_time:8.2f} sn")
+    print(f"  Ayrı ayrı hesaplama     : {separate_time:8.2f} sn  ({separate_time / sweep_time:.1f}x)")
+    print(f"  En büyük toplam maliyet farkı: {max_diff:.4f} TL")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+2026 maaş ve işveren maliyeti hesaplama motoru.
+
+Streamlit arayüzünden (maas.py) bağımsız olarak içe aktarılabilir. Çekirdek motor yalnızca NumPy
+kullanır; pandas / openpyxl gerektiren okuma, tablo ve dosya işlemleri ilk kullanımda yüklenir.
+"""
+from importlib import import_module
+
+from .rules import (
+    TaxRules, DEFAULT_RULES, SGK_TESVIK_SECENEKLERI, TESVIK_KISA_ADLARI, rules_for_incentive, TaxBracketTable,
+    compile_tax_table, tax_for_base, base_for_tax, calculate_income_tax, MinWageExemption, get_min_wage_exemptions
+)
+from .engine import (
+    MONTH_NAMES, PAYROLL_FIELDS, EMPLOYEE_FIELDS, EMPLOYER_FIELDS, calculate_payroll_month, calculate_deductions,
+    calculate_deductions_batch, find_gross_wage_bisection, solve_gross_for_net, solve_gross_for_net_batch,
+    calculate_employee_payroll_batch, calculate_employer_cost_batch, calculate_payroll_batch, yearly_total
+)
+from .cache import ResultCache, estimate_nbytes, file_digest
+from .dedup import DedupStats, ScheduleMemo, calculate_employee_payroll_dedup
+from .parallel import ParallelPayroll, default_workers
+from .profiling import Profiler
+
+# Ağır bağımlılık (pandas) gerektirenler: ilk erişimde içe aktarılır
+_LAZY_ATTRS = {
+    "parse_turkish_float": "parsing",
+    "parse_number_column": "parsing",
+    "ParsedNumbers": "parsing",
+    "read_roster": "parsing",
+    "iter_roster_chunks": "parsing",
+    "find_default_col": "parsing",
+    "WAGE_COLUMN_KEYWORDS": "parsing",
+    "NAME_COLUMN_KEYWORDS": "parsing",
+    "PayrollPipeline": "pipeline",
+    "extract_roster_columns": "pipeline",
+    "calculate_corporate_tax": "pipeline",
+    "build_results": "pipeline",
+    "build_results_table": "pipeline",
+    "with_monthly_columns": "pipeline",
+    "PayrollBlock": "pipeline",
+    "person_payroll_table": "pipeline",
+    "build_monthly_table": "pipeline",
+    "stream_payroll": "pipeline",
+    "DepartmentSummary": "departments",
+    "filter_sort_rows": "paging",
+    "results_page": "paging",
+    "ResultPage": "paging",
+    "run_scenarios": "scenarios",
+    "calculate_scenario_totals": "scenarios",
+    "BudgetSolution": "budget",
+    "solve_raise_for_budget": "budget",
+    "solve_department_budgets": "budget",
+    "write_table": "export",
+    "TableWriter": "export",
+    "export_bytes": "export",
+    "SlipArchiveWriter": "slips",
+    "slip_archive_bytes": "slips",
+    "slip_archive_file": "slips",
+    "PayrollService": "server",
+}
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(f".{module}", __name__), name)
+
+__all__ = [
+    "TaxRules", "DEFAULT_RULES", "SGK_TESVIK_SECENEKLERI", "TESVIK_KISA_ADLARI", "rules_for_incentive", "TaxBracketTable",
+    "compile_tax_table", "tax_for_base", "base_for_tax", "calculate_income_tax", "MinWageExemption",
+    "get_min_wage_exemptions", "MONTH_NAMES", "PAYROLL_FIELDS", "EMPLOYEE_FIELDS", "EMPLOYER_FIELDS",
+    "calculate_payroll_month", "calculate_deductions", "calculate_deductions_batch", "find_gross_wage_bisection",
+    "solve_gross_for_net", "solve_gross_for_net_batch", "calculate_employee_payroll_batch",
+    "calculate_employer_cost_batch", "calculate_payroll_batch", "yearly_total", "ResultCache", "estimate_nbytes",
+    "file_digest", "DedupStats", "ScheduleMemo", "calculate_employee_payroll_dedup",
+    "ParallelPayroll", "default_workers", "Profiler", *_LAZY_ATTRS
+]
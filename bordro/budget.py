@@ -0,0 +1,112 @@
+"""Bütçe çözücü: hedef toplam maliyete ulaşan tek tip maaş artış oranını bulur."""
+from typing import NamedTuple
+
+import numpy as np
+
+from .engine import calculate_employer_cost_batch, yearly_total
+from .scenarios import monthly_gross_wages
+
+# Hedeflenebilecek toplamlar
+BUDGET_METRICS = ("Toplam_Yillik_Maliyet", "Net_Isveren_Maliyeti")
+
+class BudgetSolution(NamedTuple):
+    raise_rate: float    # Bulunan artış oranı (0.30 = %30)
+    achieved: float      # Bu oranla ulaşılan hedef ölçüt toplamı
+    evaluations: int     # Tüm liste üzerinde yapılan hesap sayısı
+
+def yearly_cost_total(raw_wages, raise_rate, calc_type, rules):
+    """Verilen artış oranında listenin toplam yıllık işveren maliyeti."""
+    gross_wage = monthly_gross_wages(np.asarray(raw_wages, dtype=float) * (1 + raise_rate), calc_type, rules)
+    return float(np.sum(yearly_total(calculate_employer_cost_batch(gross_wage, rules)["total_cost"])))
+
+def solve_raise_for_budget(raw_wages, target, calc_type, rules, corporate_tax_rate=0.0,
+                           metric="Toplam_Yillik_Maliyet", tolerance=1.0, max_evaluations=40):
+    """
+    Hedef toplama (metric) ulaşan tek tip artış oranını bulur.
+    Toplam maliyet artış oranıyla monoton artar; kök Illinois (değiştirilmiş regula falsi) yöntemiyle,
+    [0, üst sınır] aralığı daraltılarak aranır. Maliyet artışa göre neredeyse doğrusal olduğundan
+    genellikle birkaç tam liste hesabında |fark| <= tolerance (TL) sağlanır.
+    Hedef artışsız maliyetin altındaysa veya ölçüt artışla değişmiyorsa ValueError verir.
+    """
+    if metric not in BUDGET_METRICS:
+        raise ValueError(f"Bilinmeyen hedef ölçüt: {metric} ({', '.join(BUDGET_METRICS)})")
+    # Net_Isveren_Maliyeti = Toplam_Yillik_Maliyet x (1 - kurumlar vergisi oranı)
+    scale = 1.0 - corporate_tax_rate if metric == "Net_Isveren_Maliyeti" else 1.0
+    if scale <= 0:
+        raise ValueError(
+            f"Kurumlar vergisi oranı %{corporate_tax_rate * 100:.0f} iken vergi sonrası net maliyet artış oranından "
+            "bağımsızdır; hedef bu ölçütle çözülemez (Toplam Yıllık İşveren Maliyeti hedefleyiniz)."
+        )
+    raw_wages = np.asarray(raw_wages, dtype=float)
+    evaluations = 0
+
+    def gap(rate):
+        nonlocal evaluations
+        evaluations += 1
+        return yearly_cost_total(raw_wages, rate, calc_type, rules) * scale - target
+
+    lo, f_lo = 0.0, gap(0.0)
+    if f_lo + target <= 0:
+        raise ValueError("Hesaplanacak personel yok (maaşı girilmiş satır bulunamadı).")
+    if f_lo > tolerance:
+        raise ValueError(
+            f"Hedef ({target:,.2f} TL), artışsız maliyetin ({f_lo + target:,.2f} TL) altında; artış ile ulaşılamaz."
+        )
+    if f_lo >= -tolerance:
+        return BudgetSolution(0.0, f_lo + target, evaluations)
+
+    # Üst sınır: hedefi aşan ilk oran (doğrusal tahminle başlar, gerekirse ikiye katlanır)
+    hi = max(target / (f_lo + target) - 1.0, 0.01) * 1.1
+    f_hi = gap(hi)
+    while f_hi < 0:
+        if evaluations >= max_evaluations:
+            raise ValueError(f"Hedef ({target:,.2f} TL) için artış oranı bulunamadı.")
+        lo, f_lo = hi, f_hi
+        hi *= 2
+        f_hi = gap(hi)
+
+    rate, f_rate = (hi, f_hi) if f_hi <= tolerance else (lo, f_lo)
+    side = 0
+    while abs(f_rate) > tolerance and evaluations < max_evaluations and hi - lo > 1e-12:
+        rate = (lo * f_hi - hi * f_lo) / (f_hi - f_lo)
+        f_rate = gap(rate)
+        if f_rate < 0:
+            lo, f_lo = rate, f_rate
+            if side == -1:
+                f_hi /= 2  # Illinois: aynı uç üst üste kalırsa karşı ucun ağırlığı yarılanır
+            side = -1
+        else:
+            hi, f_hi = rate, f_rate
+            if side == 1:
+                f_lo /= 2
+            side = 1
+
+    return BudgetSolution(rate, f_rate + target, evaluations)
+
+def solve_department_budgets(raw_wages, dept_vals, targets, calc_type, rules, corporate_tax_rate=0.0,
+                             metric="Toplam_Yillik_Maliyet", tolerance=1.0):
+    """
+    Departman bazında bütçe çözümü. targets: departman -> hedef toplam.
+    Dönüş: departman başına bulunan artış oranı tablosu (DataFrame); ulaşılamayan hedefler 'Durum' sütununda.
+    """
+    import pandas as pd
+
+    raw_wages = np.asarray(raw_wages, dtype=float)
+    # Departmanlar metin olarak eşleştirilir (Excel'den sayı olarak gelen departman kodları için)
+    dept_keys = np.asarray([str(dept) for dept in dept_vals], dtype=object)
+    rows = []
+    for dept, target in targets.items():
+        members = dept_keys == str(dept)
+        row = {"Departman": dept, "Personel": int(members.sum()), "Hedef": target}
+        try:
+            solution = solve_raise_for_budget(
+                raw_wages[members], target, calc_type, rules, corporate_tax_rate, metric, tolerance
+            )
+            row.update({
+                "Artış Oranı (%)": solution.raise_rate * 100, "Ulaşılan": solution.achieved,
+                "Hesap Sayısı": solution.evaluations, "Durum": "Tamam"
+            })
+        except ValueError as e:
+            row.update({"Artış Oranı (%)": np.nan, "Ulaşılan": np.nan, "Hesap Sayısı": 0, "Durum": str(e)})
+        rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,91 @@
+"""İçerik adresli, bellek bütçeli sonuç önbelleği."""
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+def estimate_nbytes(obj, sample=32):
+    """Önbellekteki bir değerin yaklaşık bellek boyutu (büyük listeler örneklenerek)."""
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if hasattr(obj, "memory_usage"):  # pandas DataFrame / Series
+        return int(np.sum(obj.memory_usage(deep=True)))
+    if hasattr(obj, "nbytes"):  # Boyutunu kendisi bildiren nesneler (PayrollBlock)
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        items = list(obj.items())
+        sampled = items[:sample]
+        per_item = sum(estimate_nbytes(k) + estimate_nbytes(v) for k, v in sampled) / max(len(sampled), 1)
+        return sys.getsizeof(obj) + int(per_item * len(items))
+    if isinstance(obj, (list, tuple)):
+        sampled = obj[:sample]
+        per_item = sum(estimate_nbytes(v) for v in sampled) / max(len(sampled), 1)
+        return sys.getsizeof(obj) + int(per_item * len(obj))
+    return sys.getsizeof(obj)
+
+class ResultCache:
+    """
+    İçerik adresli, bellek bütçeli LRU önbellek.
+    Anahtarlar (dosya özeti, sütun eşleştirme, artış oranı, kural seti, Brüt/Net ...) gibi
+    hashlenebilir değerlerdir. Bütçe aşılınca en uzun süre kullanılmayan kayıtlar atılır.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()  # anahtar -> (değer, boyut)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value, nbytes=None):
+        if nbytes is None:
+            nbytes = estimate_nbytes(value)
+        with self._lock:
+            if key in self._items:
+                self.current_bytes -= self._items.pop(key)[1]
+            # Bütçeden büyük tek kayıt saklanmaz
+            if nbytes > self.max_bytes:
+                return value
+            self._items[key] = (value, nbytes)
+            self.current_bytes += nbytes
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._items.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._items),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+def file_digest(data):
+    """Yüklenen dosya içeriğinin özeti (önbellek anahtarı)."""
+    return hashlib.sha256(data).hexdigest()
@@ -0,0 +1,362 @@
+"""
+Komut satırı arayüzü (Streamlit olmadan toplu hesaplama).
+
+    maas hesapla personel.xlsx -o sonuc.xlsx --artis 30 --tesvik imalat --tip brut
+    maas senaryo personel.xlsx --artislar 20:50:5 --tesvik imalat yok --tip brut net
+    maas butce personel.xlsx --hedef 150.000.000 --olcut toplam --tip brut
+    maas hesapla personel.csv -o sonuc.parquet --profil profil.json
+    maas sunucu --port 8765 --paralel 2
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from .rules import TESVIK_KISA_ADLARI, rules_for_incentive
+
+# Komut satırında kullanılan kısa adlar -> arayüzdeki teşvik seçenekleri
+UCRET_TIPLERI = {"brut": "Brüt", "net": "Net"}
+BUTCE_OLCUTLERI = {"toplam": "Toplam_Yillik_Maliyet", "net": "Net_Isveren_Maliyeti"}
+# Uyarılarda satır numarası listelenen en fazla okunamayan satır
+MAX_REPORTED_ROWS = 20
+
+def parse_rate_list(text):
+    """'20:50:5' (başlangıç:bitiş:adım, bitiş dahil) veya '20,25,40' biçimindeki yüzde listesini çözer."""
+    try:
+        if ":" in text:
+            start, stop, step = (float(part) for part in text.split(":"))
+            if step <= 0 or stop < start:
+                raise ValueError
+            count = int(round((stop - start) / step)) + 1
+            return [round(start + i * step, 6) for i in range(count) if start + i * step <= stop + 1e-9]
+        return [float(part) for part in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"geçersiz oran listesi: {text!r} (örn. 20:50:5 veya 20,25,40)")
+
+def parse_amount(text):
+    """TL tutarı: Türkçe (1.500.000,50) veya düz (1500000.50) biçim."""
+    from .parsing import parse_number_column
+
+    parsed = parse_number_column([text])
+    if parsed.invalid_rows or not parsed.values[0] > 0:
+        raise argparse.ArgumentTypeError(f"geçersiz tutar: {text!r}")
+    return float(parsed.values[0])
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="maas", description="2026 maaş ve işveren maliyeti simülasyonu (arayüzsüz toplu hesaplama)."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # Personel listesi okuyan komutların ortak seçenekleri
+    roster_options = argparse.ArgumentParser(add_help=False)
+    roster_options.add_argument("girdi", help="Personel listesi (.xlsx, .xls, .csv, .parquet)")
+    roster_options.add_argument("--kurumlar-vergisi", type=float, default=25.0, help="Kurumlar vergisi oranı %%")
+    roster_options.add_argument("--maas-sutunu", help="Maaş sütunu (varsayılan: addan tahmin edilir)")
+    roster_options.add_argument(
+        "--parca", type=int, default=None, metavar="SATIR",
+        help="Akışlı okumada parça başına satır sayısı; bellek kullanımı bununla orantılıdır (varsayılan: 50000)"
+    )
+    roster_options.add_argument(
+        "--profil", metavar="JSON",
+        help="Aşama süreleri, satır/sn ve motor sayaçlarını JSON olarak yazar (-: standart çıktı)"
+    )
+    roster_options.add_argument(
+        "--profil-bellek", action="store_true", help="--profil çıktısına aşama başına en yüksek belleği ekler (yavaş)"
+    )
+
+    hesapla = commands.add_parser(
+        "hesapla", parents=[roster_options], help="Personel listesi için yıllık maliyet hesaplar."
+    )
+    hesapla.add_argument("-o", "--cikti", required=True, help="Sonuç dosyası (.xlsx, .csv, .parquet)")
+    hesapla.add_argument("--aylik", help="Kişi x ay detaylı bordro dosyası (opsiyonel; .xlsx, .csv, .parquet)")
+    hesapla.add_argument("--artis", type=float, default=30.0, help="Maaş artış oranı %% (varsayılan: 30)")
+    hesapla.add_argument("--tesvik", choices=TESVIK_KISA_ADLARI, default="imalat", help="SGK teşvik durumu")
+    hesapla.add_argument("--tip", choices=UCRET_TIPLERI, default="brut", help="Ücretler brüt mü net mi")
+    hesapla.add_argument("--ad-sutunu", help="Personel adı sütunu (varsayılan: addan tahmin, yoksa otomatik)")
+    hesapla.add_argument("--departman-sutunu", help="Departman sütunu (opsiyonel)")
+    hesapla.add_argument("--bordrolar", metavar="ZIP", help="Tüm personelin aylık bordro pusulaları (.zip, opsiyonel)")
+    hesapla.add_argument(
+        "--bordro-duzeni", choices=("kisi", "sayfa"), default="kisi",
+        help="ZIP içi düzen: kişi başına bir dosya veya çok sayfalı çalışma kitapları (varsayılan: kisi)"
+    )
+    hesapla.add_argument(
+        "--paralel", type=int, default=None, metavar="SÜREÇ",
+        help="Bordro hesabı için süreç sayısı (0: tüm çekirdekler, varsayılan: MAAS_WORKERS veya 1 = seri)"
+    )
+    hesapla.set_defaults(handler=run_hesapla)
+
+    senaryo = commands.add_parser(
+        "senaryo", parents=[roster_options],
+        help="Artış oranı x SGK teşviki x Brüt/Net senaryolarını tek seferde karşılaştırır."
+    )
+    senaryo.add_argument(
+        "--artislar", type=parse_rate_list, default="20:50:5",
+        help="Artış oranları %%: başlangıç:bitiş:adım veya virgülle liste (varsayılan: 20:50:5)"
+    )
+    senaryo.add_argument(
+        "--tesvik", nargs="+", choices=TESVIK_KISA_ADLARI, default=list(TESVIK_KISA_ADLARI),
+        help="Karşılaştırılacak SGK teşvik durumları (varsayılan: hepsi)"
+    )
+    senaryo.add_argument(
+        "--tip", nargs="+", choices=UCRET_TIPLERI, default=list(UCRET_TIPLERI),
+        help="Ücret tipleri (varsayılan: brut net)"
+    )
+    senaryo.add_argument("-o", "--cikti", help="Karşılaştırma tablosu dosyası (opsiyonel; .xlsx, .csv, .parquet)")
+    senaryo.set_defaults(handler=run_senaryo)
+
+    butce = commands.add_parser(
+        "butce", parents=[roster_options], help="Hedef bütçeye ulaşan tek tip maaş artış oranını bulur."
+    )
+    butce.add_argument("--hedef", type=parse_amount, help="Listenin tamamı için hedef toplam (TL; 1.500.000 veya 1500000)")
+    butce.add_argument(
+        "--departman-hedefi", action="append", default=[], metavar="DEPARTMAN=TUTAR",
+        help="Departman bazında hedef (tekrarlanabilir; --departman-sutunu gerekir)"
+    )
+    butce.add_argument(
+        "--olcut", choices=BUTCE_OLCUTLERI, default="toplam",
+        help="Hedeflenen toplam: toplam yıllık maliyet veya kurumlar vergisi sonrası net maliyet"
+    )
+    butce.add_argument("--tesvik", choices=TESVIK_KISA_ADLARI, default="imalat", help="SGK teşvik durumu")
+    butce.add_argument("--tip", choices=UCRET_TIPLERI, default="brut", help="Ücretler brüt mü net mi")
+    butce.add_argument("--departman-sutunu", help="Departman sütunu (departman hedefleri için)")
+    butce.set_defaults(handler=run_butce)
+
+    sunucu = commands.add_parser(
+        "sunucu", help="Bordro hesabını yerel JSON/HTTP servisi olarak sunar (tekil ve toplu istekler)."
+    )
+    sunucu.add_argument("--host", default="127.0.0.1", help="Dinlenen adres (varsayılan: 127.0.0.1, sadece yerel)")
+    sunucu.add_argument("--port", type=int, default=8765, help="Dinlenen port (varsayılan: 8765)")
+    sunucu.add_argument(
+        "--paralel", type=int, default=None, metavar="SÜREÇ",
+        help="Hesap için süreç sayısı (0: tüm çekirdekler, varsayılan: MAAS_WORKERS veya 1 = tek iş parçacığı)"
+    )
+    sunucu.add_argument(
+        "--toplama-ms", type=float, default=2.0, metavar="MS",
+        help="Aynı kural setli isteklerin tek hesapta toplandığı süre (varsayılan: 2 ms; 0: sadece aynı anda gelenler)"
+    )
+    sunucu.set_defaults(handler=run_sunucu)
+
+    return parser
+
+def _resolve_columns(args, columns):
+    """Sütun eşleştirmesi: verilenler doğrulanır, verilmeyenler arayüzdeki gibi tahmin edilir."""
+    from .parsing import find_default_col, WAGE_COLUMN_KEYWORDS, NAME_COLUMN_KEYWORDS
+
+    col_name = getattr(args, "ad_sutunu", None)
+    col_dept = getattr(args, "departman_sutunu", None)
+    for given in (args.maas_sutunu, col_name, col_dept):
+        if given is not None and given not in columns:
+            raise SystemExit(f"Hata: '{given}' sütunu bulunamadı. Mevcut sütunlar: {', '.join(columns)}")
+
+    col_wage = args.maas_sutunu or find_default_col(columns, WAGE_COLUMN_KEYWORDS)
+    if args.maas_sutunu is None and not any(k in col_wage.lower() for k in WAGE_COLUMN_KEYWORDS):
+        raise SystemExit(f"Hata: maaş sütunu tahmin edilemedi, --maas-sutunu ile belirtin. Mevcut sütunlar: {', '.join(columns)}")
+    if col_name is None:
+        guessed = find_default_col(columns, NAME_COLUMN_KEYWORDS)
+        # Tahmin sadece anahtar kelime eşleşirse kullanılır (ilk sütuna düşmesin)
+        col_name = guessed if guessed and any(k in guessed.lower() for k in NAME_COLUMN_KEYWORDS) else "Otomatik İsimlendir"
+    col_dept = col_dept or "Seçiniz"
+    return col_wage, col_name, col_dept
+
+def _report_invalid_rows(invalid_rows):
+    if invalid_rows:
+        # Dosyadaki satır numarası: başlık 1. satır, veriler 2. satırdan başlar
+        shown = ", ".join(str(i + 2) for i in invalid_rows[:MAX_REPORTED_ROWS])
+        more = f" ve {len(invalid_rows) - MAX_REPORTED_ROWS} satır daha" if len(invalid_rows) > MAX_REPORTED_ROWS else ""
+        print(f"Uyarı: {len(invalid_rows)} satırda maaş okunamadı, hesaplamaya alınmadı (satır {shown}{more})",
+              file=sys.stderr)
+
+def run_hesapla(args):
+    from contextlib import nullcontext
+    from itertools import chain
+    from .export import TableWriter
+    from .parsing import iter_roster_chunks, DEFAULT_CHUNK_ROWS
+    from .dedup import DedupStats
+    from .parallel import default_workers
+    from .pipeline import build_monthly_table, stream_payroll
+    from .slips import SlipArchiveWriter
+
+    started = time.perf_counter()
+    # Liste parça parça okunur, hesaplanır ve yazılır; tamamı hiçbir zaman bellekte tutulmaz
+    chunks = iter_roster_chunks(args.girdi, chunk_rows=args.parca or DEFAULT_CHUNK_ROWS)
+    first = next(chunks, None)
+    if first is None:
+        raise SystemExit(f"Hata: {args.girdi} boş.")
+    col_wage, col_name, col_dept = _resolve_columns(args, first.columns.tolist())
+
+    rules = rules_for_incentive(TESVIK_KISA_ADLARI[args.tesvik])
+    workers = default_workers() if args.paralel is None else args.paralel or os.cpu_count() or 1
+    batches = stream_payroll(
+        chain([first], chunks), col_wage, col_name, col_dept, args.artis / 100.0, UCRET_TIPLERI[args.tip], rules,
+        args.kurumlar_vergisi / 100.0, detailed=bool(args.aylik or args.bordrolar), workers=workers
+    )
+
+    try:
+        writer = TableWriter(args.cikti)
+        monthly_writer = TableWriter(args.aylik, sheet_name="Aylik_Bordro") if args.aylik else None
+    except ValueError as e:
+        raise SystemExit(f"Hata: {e}")
+    if args.bordrolar and Path(args.bordrolar).suffix.lower() != ".zip":
+        raise SystemExit(f"Hata: Bordrolar .zip dosyasına yazılır: {args.bordrolar}")
+    slip_writer = SlipArchiveWriter(args.bordrolar, args.bordro_duzeni, workers) if args.bordrolar else None
+
+    calculated = 0
+    total_cost = 0.0
+    rows_read = 0
+    invalid_rows = []
+    dedup_stats = DedupStats(0, 0, 0)
+    with writer, monthly_writer or nullcontext(), slip_writer or nullcontext():
+        for results, block, rows_read, chunk_invalid, chunk_stats in batches:
+            invalid_rows.extend(chunk_invalid)
+            dedup_stats = dedup_stats.combine(chunk_stats)
+            writer.write(results)
+            if monthly_writer is not None:
+                monthly_writer.write(build_monthly_table(results["Personel"], block.payroll()))
+            if slip_writer is not None:
+                slip_writer.write(block)
+            calculated += len(results)
+            total_cost += results["Toplam_Yillik_Maliyet"].sum()
+            elapsed = time.perf_counter() - started
+            print(f"  {rows_read:,} satır okundu, {calculated:,} personel hesaplandı "
+                  f"({rows_read / elapsed:,.0f} satır/sn)", file=sys.stderr)
+
+    _report_invalid_rows(invalid_rows)
+    if dedup_stats.rows:
+        print(f"Tekilleştirme: {dedup_stats.rows:,} personel için {dedup_stats.computed:,} farklı ücret hesaplandı "
+              f"({dedup_stats.ratio:.1f}x)", file=sys.stderr)
+
+    skipped = rows_read - calculated - len(invalid_rows)
+    print(
+        f"{calculated} personel hesaplandı{f', {skipped} satır (maaş 0/boş) atlandı' if skipped else ''} "
+        f"({time.perf_counter() - started:.2f} sn). Toplam yıllık maliyet: {total_cost:,.2f} TL -> {args.cikti}",
+        file=sys.stderr
+    )
+    return 0
+
+def _read_wages(args):
+    """
+    Sadece maaş (ve varsa departman) sütununu parça parça okuyup biriktirir; okunamayan satırları bildirir.
+    Dönüş: (maaşlar, departmanlar)
+    """
+    import numpy as np
+    from .parsing import iter_roster_chunks, DEFAULT_CHUNK_ROWS
+    from .pipeline import extract_roster_columns
+
+    wages, depts = [], []
+    invalid_rows = []
+    rows_read = 0
+    columns = None
+    for chunk in iter_roster_chunks(args.girdi, chunk_rows=args.parca or DEFAULT_CHUNK_ROWS):
+        if columns is None:
+            columns = _resolve_columns(args, chunk.columns.tolist())
+        roster = extract_roster_columns(chunk, columns[0], "Otomatik İsimlendir", columns[2], row_offset=rows_read)
+        wages.append(roster["raw_wages"])
+        depts.append(roster["dept_vals"])
+        invalid_rows.extend(roster["invalid_rows"])
+        rows_read += len(chunk)
+    _report_invalid_rows(invalid_rows)
+    if not wages:
+        return np.zeros(0), np.zeros(0, dtype=object)
+    return np.concatenate(wages), np.concatenate(depts)
+
+def run_senaryo(args):
+    import pandas as pd
+    from .export import write_table, SUPPORTED_SUFFIXES
+    from .scenarios import run_scenarios
+
+    if args.cikti and Path(args.cikti).suffix.lower() not in SUPPORTED_SUFFIXES:
+        raise SystemExit(f"Hata: desteklenmeyen çıktı biçimi: {args.cikti} (.xlsx, .csv veya .parquet kullanın)")
+
+    started = time.perf_counter()
+    raw_wages, _ = _read_wages(args)
+
+    table = run_scenarios(
+        raw_wages, [rate / 100.0 for rate in args.artislar], [TESVIK_KISA_ADLARI[name] for name in args.tesvik],
+        [UCRET_TIPLERI[name] for name in args.tip], args.kurumlar_vergisi / 100.0
+    )
+    if args.cikti:
+        write_table(table, args.cikti, sheet_name="Senaryo_Karsilastirma")
+
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(table.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+    print(
+        f"{len(raw_wages)} personel x {len(table)} senaryo ({time.perf_counter() - started:.2f} sn)"
+        + (f" -> {args.cikti}" if args.cikti else ""),
+        file=sys.stderr
+    )
+    return 0
+
+def run_butce(args):
+    from .budget import solve_raise_for_budget, solve_department_budgets
+
+    if (args.hedef is None) == (not args.departman_hedefi):
+        raise SystemExit("Hata: --hedef veya --departman-hedefi seçeneklerinden biri verilmelidir.")
+    if args.departman_hedefi and not args.departman_sutunu:
+        raise SystemExit("Hata: departman hedefleri için --departman-sutunu gerekir.")
+    targets = {}
+    for item in args.departman_hedefi:
+        dept, sep, amount = item.rpartition("=")
+        if not sep or not dept:
+            raise SystemExit(f"Hata: departman hedefi DEPARTMAN=TUTAR biçiminde olmalı: {item!r}")
+        try:
+            targets[dept] = parse_amount(amount)
+        except argparse.ArgumentTypeError as e:
+            raise SystemExit(f"Hata: {e}")
+
+    started = time.perf_counter()
+    raw_wages, dept_vals = _read_wages(args)
+    rules = rules_for_incentive(TESVIK_KISA_ADLARI[args.tesvik])
+    metric = BUTCE_OLCUTLERI[args.olcut]
+    calc_type = UCRET_TIPLERI[args.tip]
+    corporate_tax_rate = args.kurumlar_vergisi / 100.0
+
+    if targets:
+        table = solve_department_budgets(raw_wages, dept_vals, targets, calc_type, rules, corporate_tax_rate, metric)
+        print(table.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+    else:
+        try:
+            solution = solve_raise_for_budget(raw_wages, args.hedef, calc_type, rules, corporate_tax_rate, metric)
+        except ValueError as e:
+            raise SystemExit(f"Hata: {e}")
+        print(f"Artış oranı: %{solution.raise_rate * 100:.4f}  ({metric}: {solution.achieved:,.2f} TL)")
+    print(f"{len(raw_wages)} personel ({time.perf_counter() - started:.2f} sn)", file=sys.stderr)
+    return 0
+
+def run_sunucu(args):
+    import asyncio
+    from .parallel import default_workers
+    from .server import serve
+
+    workers = default_workers() if args.paralel is None else args.paralel or os.cpu_count() or 1
+    try:
+        asyncio.run(serve(args.host, args.port, workers, window=args.toplama_ms / 1000))
+    except KeyboardInterrupt:
+        print("Bordro servisi durduruldu.", file=sys.stderr)
+    except OSError as e:
+        raise SystemExit(f"Hata: {args.host}:{args.port} dinlenemiyor: {e}")
+    return 0
+
+def _write_profile(profiler, target):
+    text = profiler.to_json(indent=2)
+    if target == "-":
+        print(text)
+    else:
+        Path(target).write_text(text + "\n", encoding="utf-8")
+        print(f"Ölçüm -> {target}", file=sys.stderr)
+
+def main(argv=None):
+    from . import profiling
+
+    args = build_parser().parse_args(argv)
+    if not getattr(args, "profil", None):
+        return args.handler(args)
+    profiler = profiling.Profiler(memory=args.profil_bellek)
+    token = profiling.activate(profiler)
+    try:
+        status = args.handler(args)
+    finally:
+        profiling.deactivate(token)
+    _write_profile(profiler, args.profil)
+    return status
@@ -0,0 +1,124 @@
+"""Aynı hedef ücretli personelin bordrosunu bir kez hesaplayıp tüm satırlara dağıtma."""
+import threading
+from typing import NamedTuple
+
+import numpy as np
+
+from .engine import EMPLOYEE_FIELDS, calculate_employee_payroll_batch
+from .rules import DEFAULT_RULES
+
+class DedupStats(NamedTuple):
+    """Tekilleştirme istatistikleri."""
+    rows: int        # Hesaplanması istenen satır
+    unique: int      # Farklı (hedef ücret, ücret tipi) sayısı
+    memo_hits: int   # Farklı ücretlerden önbellekte (ScheduleMemo) bulunanlar
+
+    @property
+    def computed(self):
+        """Motorla gerçekten hesaplanan satır sayısı."""
+        return self.unique - self.memo_hits
+
+    @property
+    def ratio(self):
+        """İstenen / hesaplanan satır oranı (10 ise iş 10'da birine inmiştir)."""
+        return self.rows / max(self.computed, 1)
+
+    def combine(self, other):
+        return DedupStats(self.rows + other.rows, self.unique + other.unique, self.memo_hits + other.memo_hits)
+
+# En fazla saklanan ücret sayısı (kural seti ve ücret tipi başına); kayıt başı ~1,2 KB
+DEFAULT_MEMO_ENTRIES = 20_000
+
+class ScheduleMemo:
+    """
+    Ücret başına 12 aylık çalışan bordrosu önbelleği. Anahtar: (çalışan kural özeti, Net mi);
+    her anahtar için sıralı ücret dizisi tutulur, arama np.searchsorted ile toplu yapılır.
+    Akışlı hesaplamada parçalar arasında (asgari ücret, standart kademeler) tekrar hesaplamayı önler.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MEMO_ENTRIES):
+        self.max_entries = max_entries
+        self._tables = {}  # anahtar -> (sıralı ücretler, (alan, m, 12) bordro)
+        self._lock = threading.Lock()
+
+    def lookup(self, key, wages):
+        """wages (sıralı, tekil) için (bulundu maskesi, bulunan satırların bordrosu) döner."""
+        with self._lock:
+            table = self._tables.get(key)
+        if table is None:
+            return np.zeros(len(wages), dtype=bool), None
+        keys, data = table
+        pos = np.minimum(np.searchsorted(keys, wages), len(keys) - 1)
+        found = keys[pos] == wages
+        return found, data[:, pos[found]]
+
+    def store(self, key, wages, data):
+        """Yeni ücretleri ekler; sınır dolduysa eklenmez (mevcut kayıtlar korunur)."""
+        with self._lock:
+            keys, old = self._tables.get(key, (np.empty(0), np.empty((data.shape[0], 0, 12))))
+            room = self.max_entries - len(keys)
+            if room <= 0:
+                return
+            wages, data = wages[:room], data[:, :room]
+            keys = np.concatenate([keys, wages])
+            order = np.argsort(keys, kind="stable")
+            self._tables[key] = (keys[order], np.concatenate([old, data], axis=1)[:, order])
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(keys) for keys, _ in self._tables.values())
+
+def calculate_employee_payroll_dedup(wages, calculation_type, rules=DEFAULT_RULES, memo=None, executor=None):
+    """
+    calculate_employee_payroll_batch ile aynı sonucu verir; her farklı (hedef ücret, ücret tipi) bir kez
+    hesaplanıp ilgili tüm satırlara dağıtılır. Brüt satırlarda asgari ücretin altındaki ücretler tek grup olur.
+    memo: satırlar arası / çağrılar arası ScheduleMemo (None ise sadece çağrı içinde tekilleştirilir).
+    executor: farklı ücretleri çok çekirdekte hesaplayan ParallelPayroll (kural seti hesapla birlikte verilir).
+    Dönüş: (bordro, DedupStats)
+    """
+    wages = np.asarray(wages, dtype=float)
+    n = wages.shape[0]
+    is_net = np.broadcast_to(np.asarray(calculation_type) == 'Net', (n,))
+
+    payroll = {field: np.empty((n, 12)) for field in EMPLOYEE_FIELDS}
+    unique_total = memo_hits = 0
+    for net in (False, True):
+        rows = np.flatnonzero(is_net == net)
+        if not rows.size:
+            continue
+        group_wages = wages[rows] if net else np.maximum(wages[rows], rules.asgari_ucret_brut)
+        unique_wages, inverse = np.unique(group_wages, return_inverse=True)
+        # Alan başına bitişik (alan, ücret, 12) düzen: dağıtım alan başına tek np.take olur
+        data = np.empty((len(EMPLOYEE_FIELDS), len(unique_wages), 12))
+
+        missing = np.ones(len(unique_wages), dtype=bool)
+        key = (rules.employee_digest, net)
+        if memo is not None:
+            found, cached = memo.lookup(key, unique_wages)
+            data[:, found] = cached
+            missing = ~found
+            memo_hits += int(found.sum())
+        if missing.any():
+            calc_type = 'Net' if net else 'Brüt'
+            if executor is not None:
+                computed = executor.employee_payroll(unique_wages[missing], calc_type, rules)
+            else:
+                computed = calculate_employee_payroll_batch(unique_wages[missing], calc_type, rules)
+                computed = np.stack([computed[field] for field in EMPLOYEE_FIELDS])
+            data[:, missing] = computed
+            if memo is not None:
+                memo.store(key, unique_wages[missing], computed)
+
+        unique_total += len(unique_wages)
+        inverse = inverse.ravel()
+        for i, field in enumerate(EMPLOYEE_FIELDS):
+            if rows.size == n:
+                np.take(data[i], inverse, axis=0, out=payroll[field])
+            else:
+                payroll[field][rows] = data[i][inverse]
+
+    return payroll, DedupStats(n, unique_total, memo_hits)
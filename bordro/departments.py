@@ -0,0 +1,95 @@
+"""Departman bazında aylık / yıllık maliyet özetleri (sonuç dizileri üzerinden tek gruplu toplama)."""
+import numpy as np
+
+from .engine import MONTH_NAMES, PAYROLL_FIELDS
+
+# Yıllık özet tablosundaki alanlar (alan -> sütun adı; sonuç tablosundaki adlarla aynı)
+DEPARTMENT_FIELDS = {
+    "total_cost": "Toplam_Yillik_Maliyet",
+    "gross_wage": "Yillik_Brut_Ucret",
+    "net_pay": "Yillik_Net_Ucret",
+    "sgk_employer": "Yillik_SGK_Isveren",
+    "unemp_employer": "Yillik_Issizlik_Isveren",
+    "income_tax": "Yillik_Gelir_Vergisi",
+    "stamp_tax": "Yillik_Damga_Vergisi"
+}
+# Departman aylık tablosundaki başlıklar
+DEPARTMENT_MONTH_COLUMNS = {
+    "gross_wage": "Brüt Ücret",
+    "net_pay": "Net Ele Geçen",
+    "sgk_employer": "SGK İşveren",
+    "unemp_employer": "İşsizlik İşveren",
+    "income_tax": "Ödenecek GV",
+    "stamp_tax": "Ödenecek DV",
+    "total_cost": "Toplam Maliyet"
+}
+
+# Gruplu toplamada bir seferde sıralanan satır; geçici bellek bununla sınırlıdır
+SUMMARY_CHUNK_ROWS = 20_000
+
+class DepartmentSummary:
+    """
+    Departman x ay x alan toplamları. Bloktaki tüm alanlar ve aylar, satır dilimleri üzerinde tek gruplu toplamayla
+    (departmana göre sıralama + np.add.reduceat) bulunur. Tablolar ve departman detayları bu küçük diziden
+    oluşturulur, personel satırlarına tekrar inilmez.
+    """
+
+    def __init__(self, results, block, chunk_rows=SUMMARY_CHUNK_ROWS):
+        codes, departments = results["Departman"].astype(str).factorize(sort=True)
+        self.departments = np.asarray(departments, dtype=object)
+        k = len(self.departments)
+        self.headcount = np.bincount(codes, minlength=k)
+        self.corporate_saving = np.bincount(
+            codes, weights=results["Kurumlar_Vergisi_Tasarrufu"].to_numpy(dtype=float), minlength=k
+        )
+
+        sums = np.zeros((k, 12 * len(PAYROLL_FIELDS)))
+        for start in range(0, len(block), chunk_rows):
+            chunk_codes = codes[start:start + chunk_rows]
+            values = block.data[start:start + chunk_rows].reshape(len(chunk_codes), -1)  # Kopyasız (kişi, ay x alan)
+            counts = np.bincount(chunk_codes, minlength=k)
+            present = np.flatnonzero(counts)
+            starts = np.concatenate([[0], np.cumsum(counts[present])[:-1]])
+            sums[present] += np.add.reduceat(values[np.argsort(chunk_codes, kind="stable")], starts, axis=0)
+        self.monthly = sums.reshape(k, 12, len(PAYROLL_FIELDS))  # (departman, ay, PAYROLL_FIELDS)
+
+    def __len__(self):
+        return len(self.departments)
+
+    @property
+    def nbytes(self):
+        return self.monthly.nbytes + self.corporate_saving.nbytes + self.headcount.nbytes + self.departments.nbytes
+
+    def yearly_table(self):
+        """Departman başına personel sayısı ve yıllık toplamlar (maliyete göre azalan)."""
+        import pandas as pd
+
+        table = {"Departman": self.departments, "Personel": self.headcount}
+        yearly = self.monthly.sum(axis=1)
+        for field, column in DEPARTMENT_FIELDS.items():
+            table[column] = yearly[:, PAYROLL_FIELDS.index(field)]
+        table["Kurumlar_Vergisi_Tasarrufu"] = self.corporate_saving
+        table["Net_Isveren_Maliyeti"] = table["Toplam_Yillik_Maliyet"] - self.corporate_saving
+        table["Kisi_Basi_Maliyet"] = table["Toplam_Yillik_Maliyet"] / np.maximum(self.headcount, 1)
+        return pd.DataFrame(table).sort_values("Toplam_Yillik_Maliyet", ascending=False, ignore_index=True)
+
+    def month_table(self, field="total_cost"):
+        """Bir alanın ay x departman tablosu (grafik için; satırlar ay adları)."""
+        import pandas as pd
+
+        return pd.DataFrame(
+            self.monthly[:, :, PAYROLL_FIELDS.index(field)].T, index=MONTH_NAMES, columns=self.departments
+        )
+
+    def department_table(self, department):
+        """Bir departmanın aylık tablosu (12 ay + TOPLAM satırı)."""
+        import pandas as pd
+
+        row = int(np.searchsorted(self.departments, str(department)))
+        columns = [PAYROLL_FIELDS.index(field) for field in DEPARTMENT_MONTH_COLUMNS]
+        values = self.monthly[row][:, columns]
+        table = pd.DataFrame(
+            np.vstack([values, values.sum(axis=0)]), columns=list(DEPARTMENT_MONTH_COLUMNS.values())
+        )
+        table.insert(0, "Ay", MONTH_NAMES + ["TOPLAM"])
+        return table
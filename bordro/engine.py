@@ -0,0 +1,300 @@
+"""Bordro hesaplama motoru: tek ay/tek kişi (skaler) ve tüm liste x 12 ay (vektörel) hesaplar."""
+import numpy as np
+
+from . import profiling
+from .rules import DEFAULT_RULES, tax_for_base, base_for_tax, calculate_income_tax
+
+def calculate_payroll_month(wage, calculation_type, month_idx, cumulative_tax_base, rules=DEFAULT_RULES):
+    """
+    Belirli bir ay için bordro hesabı yapar.
+    calculation_type: 'Brüt' (Sabit Brüt) veya 'Net' (Sabit Net)
+    """
+    
+    gross_wage = 0.0
+    
+    # Eğer hesaplama NET üzerinden ise, Brüt net/brüt ilişkisinin tersinden bulunur
+    if calculation_type == 'Net':
+        gross_wage = solve_gross_for_net(wage, month_idx, cumulative_tax_base, rules)
+    else:
+        gross_wage = wage
+
+    # Hesaplamayı yap
+    return calculate_deductions(gross_wage, month_idx, cumulative_tax_base, rules)
+
+def calculate_deductions(gross_wage, month_idx, cumulative_tax_base, rules=DEFAULT_RULES):
+    profiling.count(profiling.DEDUCTIONS)
+    # Asgari Ücret Kontrolü
+    if gross_wage < rules.asgari_ucret_brut:
+        gross_wage = rules.asgari_ucret_brut
+
+    # SGK Matrahı (Tavan/Taban)
+    sgk_base = min(max(gross_wage, rules.sgk_taban), rules.sgk_tavan)
+    
+    # İşçi Kesintileri
+    sgk_worker = sgk_base * rules.sgk_isci_orani
+    unemp_worker = sgk_base * rules.issizlik_isci_orani
+    
+    # GV Matrahı
+    income_tax_base = gross_wage - (sgk_worker + unemp_worker)
+    
+    # Gelir Vergisi
+    raw_income_tax = calculate_income_tax(cumulative_tax_base, income_tax_base, rules)
+    
+    # İstisnalar
+    exemption = rules.min_wage_exemptions[month_idx]
+    payable_income_tax = max(0, raw_income_tax - exemption.gv)
+    
+    # Damga Vergisi
+    raw_stamp_tax = gross_wage * rules.damga_vergisi_orani
+    payable_stamp_tax = max(0, raw_stamp_tax - exemption.dv)
+    
+    # Net Ele Geçen
+    net_pay = gross_wage - (sgk_worker + unemp_worker + payable_income_tax + payable_stamp_tax)
+    
+    # İşveren Maliyeti
+    sgk_employer = sgk_base * rules.sgk_isveren_orani
+    unemp_employer = sgk_base * rules.issizlik_isveren_orani
+    
+    total_employer_cost = gross_wage + sgk_employer + unemp_employer
+    
+    return {
+        "gross_wage": gross_wage,
+        "net_pay": net_pay,
+        "sgk_worker": sgk_worker,
+        "unemp_worker": unemp_worker,
+        "income_tax_base": income_tax_base,
+        "cumulative_tax_base": cumulative_tax_base, # Kümülatif Matrah
+        "raw_income_tax": raw_income_tax, # Hesaplanan GV
+        "income_tax": payable_income_tax, # Ödenecek GV
+        "gv_exemption": exemption.gv,  # GV İstisnası
+        "raw_stamp_tax": raw_stamp_tax,   # Hesaplanan DV
+        "stamp_tax": payable_stamp_tax,   # Ödenecek DV
+        "dv_exemption": exemption.dv,   # DV İstisnası
+        "sgk_employer": sgk_employer,
+        "unemp_employer": unemp_employer,
+        "total_cost": total_employer_cost
+    }
+
+# --- TOPLU (VEKTÖREL) HESAPLAMA MOTORU ---
+
+MONTH_NAMES = ["Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran", "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"]
+
+# calculate_deductions sözlüğündeki alanlar (aynı sırayla)
+PAYROLL_FIELDS = [
+    "gross_wage", "net_pay", "sgk_worker", "unemp_worker", "income_tax_base",
+    "cumulative_tax_base", "raw_income_tax", "income_tax", "gv_exemption",
+    "raw_stamp_tax", "stamp_tax", "dv_exemption", "sgk_employer",
+    "unemp_employer", "total_cost"
+]
+EMPLOYER_FIELDS = ["sgk_employer", "unemp_employer", "total_cost"]
+EMPLOYEE_FIELDS = [field for field in PAYROLL_FIELDS if field not in EMPLOYER_FIELDS]
+
+def calculate_deductions_batch(gross_wage, month_idx, cumulative_tax_base, rules=DEFAULT_RULES):
+    """calculate_deductions'ın dizi karşılığı; her alan için (n,) dizi döner."""
+    # Asgari Ücret Kontrolü
+    gross_wage = np.maximum(gross_wage, rules.asgari_ucret_brut)
+    profiling.count(profiling.DEDUCTIONS, gross_wage.shape[0])
+
+    # SGK Matrahı (Tavan/Taban)
+    sgk_base = np.minimum(np.maximum(gross_wage, rules.sgk_taban), rules.sgk_tavan)
+
+    # İşçi Kesintileri
+    sgk_worker = sgk_base * rules.sgk_isci_orani
+    unemp_worker = sgk_base * rules.issizlik_isci_orani
+
+    # GV Matrahı
+    income_tax_base = gross_wage - (sgk_worker + unemp_worker)
+
+    # Gelir Vergisi
+    raw_income_tax = calculate_income_tax(cumulative_tax_base, income_tax_base, rules)
+
+    # İstisnalar
+    exemption = rules.min_wage_exemptions[month_idx]
+    payable_income_tax = np.maximum(0, raw_income_tax - exemption.gv)
+
+    # Damga Vergisi
+    raw_stamp_tax = gross_wage * rules.damga_vergisi_orani
+    payable_stamp_tax = np.maximum(0, raw_stamp_tax - exemption.dv)
+
+    # Net Ele Geçen
+    net_pay = gross_wage - (sgk_worker + unemp_worker + payable_income_tax + payable_stamp_tax)
+
+    # İşveren Maliyeti
+    sgk_employer = sgk_base * rules.sgk_isveren_orani
+    unemp_employer = sgk_base * rules.issizlik_isveren_orani
+
+    total_employer_cost = gross_wage + sgk_employer + unemp_employer
+
+    n = gross_wage.shape[0]
+    return {
+        "gross_wage": gross_wage,
+        "net_pay": net_pay,
+        "sgk_worker": sgk_worker,
+        "unemp_worker": unemp_worker,
+        "income_tax_base": income_tax_base,
+        "cumulative_tax_base": np.broadcast_to(cumulative_tax_base, (n,)),
+        "raw_income_tax": raw_income_tax,
+        "income_tax": payable_income_tax,
+        "gv_exemption": np.full(n, exemption.gv),
+        "raw_stamp_tax": raw_stamp_tax,
+        "stamp_tax": payable_stamp_tax,
+        "dv_exemption": np.full(n, exemption.dv),
+        "sgk_employer": sgk_employer,
+        "unemp_employer": unemp_employer,
+        "total_cost": total_employer_cost
+    }
+
+def find_gross_wage_bisection(target_net, month_idx, cumulative_tax_base, rules=DEFAULT_RULES):
+    """Eski ikili arama (20 adım). Sadece karşılaştırma / doğrulama için tutulur."""
+    low = target_net
+    high = target_net * 2.0
+    for _ in range(20):
+        mid = (low + high) / 2
+        res = calculate_deductions(mid, month_idx, cumulative_tax_base, rules)
+        if abs(res['net_pay'] - target_net) < 0.01:
+            break
+        elif res['net_pay'] < target_net:
+            low = mid
+        else:
+            high = mid
+    return mid
+
+def _gross_for_tax_base_batch(tax_base, rules):
+    """GV matrahını veren brüt ücret (SGK taban/tavan bölgelerine göre)."""
+    worker_rate = rules.sgk_isci_orani + rules.issizlik_isci_orani
+    taban = rules.sgk_taban
+    tavan = rules.sgk_tavan
+    return np.where(
+        tax_base < taban * (1 - worker_rate), tax_base + taban * worker_rate,
+        np.where(tax_base <= tavan * (1 - worker_rate), tax_base / (1 - worker_rate), tax_base + tavan * worker_rate)
+    )
+
+def solve_gross_for_net_batch(target_net, month_idx, cumulative_tax_base, rules=DEFAULT_RULES):
+    """
+    Net hedeflerden Brüt ücreti kapalı formda bulur.
+    Net ücret brüte göre parçalı doğrusaldır; kırılma noktaları asgari ücret, SGK taban/tavanı,
+    GV dilim sınırları ve istisna eşikleridir. Hedefin düştüğü parçada doğrusal çözüm yapılır.
+    """
+    target_net = np.asarray(target_net, dtype=float)
+    profiling.count(profiling.NET_TO_GROSS, target_net.shape[0])
+    cumulative_tax_base = np.broadcast_to(np.asarray(cumulative_tax_base, dtype=float), target_net.shape)
+    exemption = rules.min_wage_exemptions[month_idx]
+    mw = rules.asgari_ucret_brut
+
+    # Kırılma noktaları (her satır için); DV istisnası eşiği damga vergisi oranı sıfırsa yoktur
+    dv_point = exemption.dv / rules.damga_vergisi_orani if rules.damga_vergisi_orani else mw
+    points = [
+        np.full(target_net.shape, mw),
+        np.full(target_net.shape, rules.sgk_taban),
+        np.full(target_net.shape, rules.sgk_tavan),
+        np.full(target_net.shape, dv_point)
+    ]
+    for limit, _ in rules.gelir_vergisi_dilimleri[:-1]:
+        points.append(_gross_for_tax_base_batch(limit - cumulative_tax_base, rules))
+    # Hesaplanan GV'nin istisnayı aştığı nokta
+    table = rules.tax_table
+    tax_before = tax_for_base(cumulative_tax_base, table)
+    exempt_base = base_for_tax(tax_before + exemption.gv, table) - cumulative_tax_base
+    points.append(_gross_for_tax_base_batch(exempt_base, rules))
+
+    points = np.sort(np.maximum(np.stack(points, axis=1), mw), axis=1)
+    # Son kırılmadan sonrası tek doğrusal parça
+    points = np.concatenate([points, points[:, -1:] * 2 + mw], axis=1)
+
+    n, k = points.shape
+    nets = calculate_deductions_batch(points.ravel(), month_idx, np.repeat(cumulative_tax_base, k), rules)['net_pay'].reshape(n, k)
+
+    # Hedefin düştüğü parça: nets[j0] < hedef <= nets[j1] (son parça dışa doğru uzatılır)
+    above = np.count_nonzero(nets < target_net[:, None], axis=1)
+    j0 = np.clip(above - 1, 0, k - 2)
+    rows = np.arange(n)
+    g0, g1 = points[rows, j0], points[rows, j0 + 1]
+    n0, n1 = nets[rows, j0], nets[rows, j0 + 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        gross_wage = g0 + (target_net - n0) * (g1 - g0) / (n1 - n0)
+
+    # Asgari ücretin netinden düşük hedefler asgari ücrete sabitlenir
+    return np.where(above == 0, mw, gross_wage)
+
+def solve_gross_for_net(target_net, month_idx, cumulative_tax_base, rules=DEFAULT_RULES):
+    """solve_gross_for_net_batch'in tek değerlik karşılığı; kırılma noktaları sırayla gezilir."""
+    profiling.count(profiling.NET_TO_GROSS)
+    exemption = rules.min_wage_exemptions[month_idx]
+    mw = rules.asgari_ucret_brut
+
+    dv_point = exemption.dv / rules.damga_vergisi_orani if rules.damga_vergisi_orani else mw
+    points = [rules.sgk_taban, rules.sgk_tavan, dv_point]
+    for limit, _ in rules.gelir_vergisi_dilimleri[:-1]:
+        points.append(float(_gross_for_tax_base_batch(limit - cumulative_tax_base, rules)))
+    table = rules.tax_table
+    tax_before = tax_for_base(cumulative_tax_base, table)
+    exempt_base = float(base_for_tax(tax_before + exemption.gv, table)) - cumulative_tax_base
+    points.append(float(_gross_for_tax_base_batch(exempt_base, rules)))
+    points = sorted(p for p in points if p > mw)
+    points.append(points[-1] * 2 + mw if points else mw * 2)
+
+    g0 = mw
+    n0 = calculate_deductions(g0, month_idx, cumulative_tax_base, rules)['net_pay']
+    if target_net <= n0:
+        return mw
+    for g1 in points:
+        n1 = calculate_deductions(g1, month_idx, cumulative_tax_base, rules)['net_pay']
+        if target_net <= n1 or g1 == points[-1]:
+            break
+        g0, n0 = g1, n1
+    return g0 + (target_net - n0) * (g1 - g0) / (n1 - n0)
+
+def calculate_employee_payroll_batch(wages, calculation_type, rules=DEFAULT_RULES):
+    """
+    Tüm personel listesi için 12 aylık bordronun çalışan tarafını tek geçişte hesaplar.
+    wages: (n,) hedef ücretler, calculation_type: 'Brüt' / 'Net' (veya satır bazlı dizi)
+    Dönüş: EMPLOYEE_FIELDS alanları için (n, 12) diziler. İşveren oranları sonucu etkilemez.
+    """
+    wages = np.asarray(wages, dtype=float)
+    n = wages.shape[0]
+    is_net = np.broadcast_to(np.asarray(calculation_type) == 'Net', (n,))
+    net_idx = np.flatnonzero(is_net)
+
+    payroll = {field: np.empty((n, 12)) for field in EMPLOYEE_FIELDS}
+    cum_tax_base = np.zeros(n)
+
+    for month in range(12):
+        gross_wage = wages.copy()
+        if net_idx.size:
+            gross_wage[net_idx] = solve_gross_for_net_batch(wages[net_idx], month, cum_tax_base[net_idx], rules)
+
+        res = calculate_deductions_batch(gross_wage, month, cum_tax_base, rules)
+        for field in EMPLOYEE_FIELDS:
+            payroll[field][:, month] = res[field]
+
+        # Kümülatifi güncelle
+        cum_tax_base = cum_tax_base + res['income_tax_base']
+
+    return payroll
+
+def calculate_employer_cost_batch(gross_wage, rules=DEFAULT_RULES):
+    """Brüt ücretlerden (n, 12) işveren primleri ve toplam maliyeti hesaplar."""
+    # SGK Matrahı (Tavan/Taban)
+    sgk_base = np.minimum(np.maximum(gross_wage, rules.sgk_taban), rules.sgk_tavan)
+
+    sgk_employer = sgk_base * rules.sgk_isveren_orani
+    unemp_employer = sgk_base * rules.issizlik_isveren_orani
+
+    return {
+        "sgk_employer": sgk_employer,
+        "unemp_employer": unemp_employer,
+        "total_cost": gross_wage + sgk_employer + unemp_employer
+    }
+
+def calculate_payroll_batch(wages, calculation_type, rules=DEFAULT_RULES):
+    """
+    Tüm personel listesi için 12 aylık bordroyu tek geçişte hesaplar.
+    Dönüş: PAYROLL_FIELDS alanları için (n, 12) diziler.
+    """
+    payroll = calculate_employee_payroll_batch(wages, calculation_type, rules)
+    payroll.update(calculate_employer_cost_batch(payroll['gross_wage'], rules))
+    return {field: payroll[field] for field in PAYROLL_FIELDS}
+
+def yearly_total(monthly):
+    """(n, 12) aylık değerlerin yıllık toplamı (aylar sırayla toplanır)."""
+    return np.cumsum(monthly, axis=1)[:, -1]
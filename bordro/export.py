@@ -0,0 +1,123 @@
+"""Sonuç tablolarını dosyaya yazma (xlsx / csv / parquet)."""
+import io
+from pathlib import Path
+
+from . import profiling
+
+SUPPORTED_SUFFIXES = (".xlsx", ".xlsm", ".csv", ".parquet")
+
+# İndirme biçimleri: uzantı -> MIME türü
+EXPORT_FORMATS = {
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ".csv": "text/csv",
+    ".parquet": "application/vnd.apache.parquet"
+}
+
+# Ölçüm paneli / --profil çıktısındaki aşama adı
+EXPORT_STAGE = "Dışa Aktarım"
+
+# Excel sayfa sınırı (başlık satırı dahil)
+XLSX_MAX_ROWS = 1_048_576
+
+def write_table(df, path, sheet_name='2026_Maliyet_Simulasyonu'):
+    """DataFrame'i uzantıya göre .xlsx, .csv veya .parquet olarak yazar."""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        # Excel'in Türkçe karakterleri doğru açması için BOM'lu UTF-8
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+    elif suffix == ".parquet":
+        df.to_parquet(path, index=False)
+    elif suffix in (".xlsx", ".xlsm"):
+        df.to_excel(path, index=False, sheet_name=sheet_name, engine='openpyxl')
+    else:
+        raise ValueError(f"Desteklenmeyen çıktı biçimi: {suffix or path} (.xlsx, .csv veya .parquet kullanın)")
+
+class TableWriter:
+    """
+    Tabloyu parça parça aynı dosyaya yazar (.csv, .parquet, .xlsx); bellekte sadece yazılan parça tutulur.
+    path bir ikili dosya nesnesi (io.BytesIO) de olabilir; bu durumda biçim suffix ile verilir ve nesne kapatılmaz.
+    Kullanım: with TableWriter(path) as writer: writer.write(df) ...
+    """
+
+    def __init__(self, path, sheet_name='2026_Maliyet_Simulasyonu', suffix=None):
+        self.path = path
+        self.sheet_name = sheet_name
+        self.suffix = (suffix or Path(path).suffix).lower()
+        if self.suffix not in SUPPORTED_SUFFIXES:
+            raise ValueError(f"Desteklenmeyen çıktı biçimi: {self.suffix or path} (.xlsx, .csv veya .parquet kullanın)")
+        self.rows_written = 0
+        self._handle = None
+
+    def write(self, df):
+        with profiling.stage(EXPORT_STAGE, rows=len(df)):
+            self._write(df)
+
+    def _write(self, df):
+        if self.suffix == ".csv":
+            if self._handle is None:
+                # BOM'lu UTF-8: BOM sadece dosya başına bir kez yazılır
+                if hasattr(self.path, "write"):
+                    self._handle = io.TextIOWrapper(self.path, encoding="utf-8-sig", newline="")
+                else:
+                    self._handle = open(self.path, "w", encoding="utf-8-sig", newline="")
+            df.to_csv(self._handle, index=False, header=self.rows_written == 0)
+        elif self.suffix == ".parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._handle is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                self._handle = pq.ParquetWriter(self.path, table.schema)
+            else:
+                table = pa.Table.from_pandas(df, schema=self._handle.schema, preserve_index=False)
+            self._handle.write_table(table)
+        else:
+            if self.rows_written + len(df) + 1 > XLSX_MAX_ROWS:
+                raise ValueError(
+                    f"Excel sayfa sınırı ({XLSX_MAX_ROWS:,} satır) aşıldı: {self.path} (.csv veya .parquet kullanın)"
+                )
+            if self._handle is None:
+                import openpyxl
+
+                # write_only: satırlar diske akıtılır, hücre nesneleri bellekte birikmez
+                self._handle = openpyxl.Workbook(write_only=True)
+                self._sheet = self._handle.create_sheet(self.sheet_name)
+                self._sheet.append(df.columns.tolist())
+            for row in df.itertuples(index=False, name=None):
+                self._sheet.append(row)
+        self.rows_written += len(df)
+
+    def close(self):
+        if self._handle is None:
+            return
+        # Excel dosyası kapanışta birleştirilip kaydedilir
+        with profiling.stage(EXPORT_STAGE):
+            self._close()
+
+    def _close(self):
+        if self.suffix in (".xlsx", ".xlsm"):
+            self._handle.save(self.path)
+        elif isinstance(self._handle, io.TextIOWrapper) and self._handle.buffer is self.path:
+            # Çağıranın dosya nesnesi açık kalır
+            self._handle.flush()
+            self._handle.detach()
+        else:
+            self._handle.close()
+        self._handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def export_bytes(chunks, suffix, sheet_name='2026_Maliyet_Simulasyonu'):
+    """
+    DataFrame parçalarını bellekte tek dosyaya (.xlsx / .csv / .parquet) yazıp baytlarını döner.
+    Excel write_only modda yazılır; hücre nesneleri birikmez, bellekte sadece o anki parça ve çıktı tutulur.
+    """
+    buffer = io.BytesIO()
+    with TableWriter(buffer, sheet_name, suffix=suffix) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return buffer.getvalue()
@@ -0,0 +1,49 @@
+"""Sonuç tablosunun sunucu tarafında filtrelenmesi, sıralanması ve sayfalanması."""
+from typing import NamedTuple
+
+import numpy as np
+
+PAGE_SIZES = (25, 50, 100, 250)
+
+class ResultPage(NamedTuple):
+    table: object   # Sadece görünen sayfanın satırları (DataFrame)
+    rows: int       # Filtre sonrası toplam satır
+    page: int       # Gösterilen sayfa (0 tabanlı, geçerli aralığa çekilmiş)
+    pages: int      # Toplam sayfa
+
+def _tr_lower(values):
+    """Türkçe büyük/küçük harf duyarsız arama için (İ -> i, I -> ı) küçük harfe çevirir."""
+    return values.str.replace("İ", "i", regex=False).str.replace("I", "ı", regex=False).str.lower()
+
+def _tr_lower_text(text):
+    return text.replace("İ", "i").replace("I", "ı").lower()
+
+def filter_sort_rows(results, name_query="", departments=(), sort_by=None, descending=False):
+    """
+    Filtre (isimde geçen metin, departman listesi) ve sıralama sonrası satır sırası: results'taki konumlar (np.ndarray).
+    Tüm işlemler sütunlar üzerinde vektörel yapılır; sayfa tablosu bu sıradan results_page ile alınır.
+    """
+    mask = np.ones(len(results), dtype=bool)
+    name_query = name_query.strip()
+    if name_query:
+        names = _tr_lower(results["Personel"].astype(str))
+        mask &= names.str.contains(_tr_lower_text(name_query), regex=False).to_numpy()
+    if departments:
+        mask &= results["Departman"].astype(str).isin([str(dept) for dept in departments]).to_numpy()
+    rows = np.flatnonzero(mask)
+
+    if sort_by:
+        column = results[sort_by].iloc[rows]
+        if column.dtype.kind not in "biuf":  # Metin sütunları Türkçe harf duyarsız sıralanır
+            column = _tr_lower(column.astype(str))
+        # Kararlı sıralama: eşit değerlerde liste sırası korunur
+        order = column.reset_index(drop=True).sort_values(ascending=not descending, kind="stable").index
+        rows = rows[order.to_numpy()]
+    return rows
+
+def results_page(results, rows, page, page_size):
+    """rows sırasından page. sayfanın satırlarını alır; sadece bu dilim biçimlendirilip gösterilir."""
+    pages = max(-(-len(rows) // page_size), 1)
+    page = min(max(int(page), 0), pages - 1)
+    visible = rows[page * page_size:(page + 1) * page_size]
+    return ResultPage(results.iloc[visible], len(rows), page, pages)
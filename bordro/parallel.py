@@ -0,0 +1,149 @@
+"""Çalışan bordrosunun süreç havuzunda (çok çekirdekte) hesaplanması."""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from . import profiling
+from .engine import EMPLOYEE_FIELDS, calculate_employee_payroll_batch
+from .rules import DEFAULT_RULES
+
+# Bir işçiye verilecek en küçük blok; daha küçük işlerde süreç maliyeti kazancı aşar
+MIN_ROWS_PER_WORKER = 5_000
+
+def default_workers():
+    """MAAS_WORKERS ortam değişkeni (0: tüm çekirdekler), yoksa 1 (seri)."""
+    workers = int(os.environ.get("MAAS_WORKERS", 1))
+    return workers if workers > 0 else os.cpu_count() or 1
+
+def mp_context():
+    """
+    Çok iş parçacıklı süreçlerde (Streamlit sunucusu) fork güvenli olmadığından forkserver, yoksa spawn kullanılır.
+    forkserver işçileri motoru önceden yüklemiş sunucudan çatallanır; havuz kurulumu hızlıdır.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["bordro.engine"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+# İşçi süreçteki kural seti: havuz kurulurken bir kez gönderilir, görevlerle taşınmaz
+_worker_rules = None
+
+def _init_worker(rules):
+    global _worker_rules
+    _worker_rules = rules
+
+def _compute_block(shm_name, shape, start, wages, calculation_type, rules=None):
+    """
+    Bir bloğun bordrosunu hesaplayıp ortak bellekteki (alan, satır, 12) dizinin [start:] dilimine yazar.
+    rules None ise havuz kurulurken gönderilen kural seti kullanılır. Motor sayaçlarını döner (ana süreçteki ölçüme eklenir).
+    """
+    shm = SharedMemory(name=shm_name)
+    token = profiling.activate(profiling.Profiler())
+    try:
+        out = np.ndarray(shape, dtype=float, buffer=shm.buf)
+        payroll = calculate_employee_payroll_batch(wages, calculation_type, _worker_rules if rules is None else rules)
+        for i, field in enumerate(EMPLOYEE_FIELDS):
+            out[i, start:start + len(wages)] = payroll[field]
+        del out
+        return dict(profiling.active().counters)
+    finally:
+        profiling.deactivate(token)
+        shm.close()
+
+def _stacked_payroll(wages, calculation_type, rules):
+    payroll = calculate_employee_payroll_batch(wages, calculation_type, rules)
+    return np.stack([payroll[field] for field in EMPLOYEE_FIELDS])
+
+class ParallelPayroll:
+    """
+    Çalışan bordrosunu ardışık bloklara bölüp süreç havuzunda hesaplar; sonuçlar ortak bellekte
+    satır sırasıyla birleşir. Satırlar birbirinden bağımsız hesaplandığından sonuç seri hesapla bayt bayt aynıdır.
+    Havuz ilk büyük işte kurulur ve kapatılana kadar (with bloğu) tekrar kullanılır; kural seti işçilere kurulumda
+    bir kez gönderilir; çalışan tarafı farklı (employee_digest) bir kural setiyle yapılan hesapta görevle birlikte taşınır. İş parçacıkları arasında
+    paylaşılabilir (Streamlit oturumları tek havuzu kullanır).
+    workers <= 1, küçük işler veya havuz kurulamazsa (kısıtlı ortam) hesap seri yapılır.
+    """
+
+    def __init__(self, rules=DEFAULT_RULES, workers=None, min_rows_per_worker=MIN_ROWS_PER_WORKER):
+        self.rules = rules
+        self.workers = default_workers() if workers is None else max(int(workers), 1)
+        self.min_rows_per_worker = min_rows_per_worker
+        self.parallel_runs = 0
+        self._pool = None
+        self._broken = False
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def _blocks(self, n):
+        if self._broken:
+            return 1
+        return max(min(self.workers, n // self.min_rows_per_worker), 1)
+
+    def employee_payroll(self, wages, calculation_type, rules=None):
+        """
+        EMPLOYEE_FIELDS sırasıyla (alan, n, 12) dizi (calculate_employee_payroll_batch'in yığılmış hali).
+        rules: hesaplamanın kural seti (None: havuzun kural seti).
+        """
+        rules = self.rules if rules is None else rules
+        wages = np.asarray(wages, dtype=float)
+        n = wages.shape[0]
+        blocks = self._blocks(n)
+        if blocks <= 1:
+            return _stacked_payroll(wages, calculation_type, rules)
+
+        per_row = np.ndim(calculation_type) > 0
+        shape = (len(EMPLOYEE_FIELDS), n, 12)
+        bounds = np.linspace(0, n, blocks + 1).astype(int)
+        # Çalışan tarafı aynı kural setleri (sadece işveren teşviki farklı) görevle taşınmaz
+        task_rules = None if rules.employee_digest == self.rules.employee_digest else rules
+        try:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(
+                        self.workers, mp_context=mp_context(), initializer=_init_worker, initargs=(self.rules,)
+                    )
+                pool = self._pool
+            shm = SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+        except OSError:
+            # Süreç / ortak bellek açılamayan ortamlar
+            self._broken = True
+            return _stacked_payroll(wages, calculation_type, rules)
+
+        try:
+            futures = [
+                pool.submit(
+                    _compute_block, shm.name, shape, start, wages[start:stop],
+                    calculation_type[start:stop] if per_row else calculation_type, task_rules
+                )
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+            for future in futures:
+                for name, count in future.result().items():
+                    profiling.count(name, count)
+            result = np.ndarray(shape, dtype=float, buffer=shm.buf).copy()
+        except BrokenProcessPool:
+            self._broken = True
+            self.close()
+            return _stacked_payroll(wages, calculation_type, rules)
+        finally:
+            shm.close()
+            shm.unlink()
+        self.parallel_runs += 1
+        return result
@@ -0,0 +1,230 @@
+"""Personel listesi okuma ve Türkçe sayı biçimi ayrıştırma."""
+import re
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from . import profiling
+
+# Türkçe biçim: binlik ayracı nokta, ondalık virgül (22.104,67 / 22104,67 / 22.104)
+_TR_NUMBER = r"[-+]?(?:\d{1,3}(?:\.\d{3})+|\d+)(?:,\d+)?"
+# Düz biçim: ondalık nokta (22104.67)
+_PLAIN_NUMBER = r"[-+]?(?:\d+(?:\.\d*)?|\.\d+)"
+_TR_NUMBER_RE = re.compile(_TR_NUMBER)
+_PLAIN_NUMBER_RE = re.compile(_PLAIN_NUMBER)
+
+def parse_turkish_float(value):
+    """
+    Excel'den gelen Türkçe formatlı sayıları (22.104,67) float'a çevirir.
+    Sadece düz biçime uyan değerler (22104.67) ondalık nokta ile okunur; iki biçime de uymayan değerler
+    (1e5, inf gibi) parse_number_column'daki gibi ayrıştırılamaz sayılır ve 0 döner.
+    """
+    if pd.isna(value) or value == '':
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    
+    val_str = str(value).strip()
+    if _TR_NUMBER_RE.fullmatch(val_str):
+        # Noktaları sil (binlik ayracı), virgülleri noktaya çevir (ondalık)
+        return float(val_str.replace('.', '').replace(',', '.'))
+    if _PLAIN_NUMBER_RE.fullmatch(val_str):
+        return float(val_str)
+    return 0.0
+
+class ParsedNumbers(NamedTuple):
+    """Sütun bazında ayrıştırma sonucu."""
+    values: np.ndarray   # Boş hücreler 0, ayrıştırılamayanlar NaN
+    number_format: str   # 'numeric' (hücreler zaten sayı), 'tr', 'plain' veya 'mixed'
+    invalid_rows: list   # Ayrıştırılamayan hücrelerin sütundaki sırası (0 tabanlı)
+
+def parse_number_column(column):
+    """
+    Bir sütunu tek seferde (vektörel) float dizisine çevirir. Biçim sütun başına bir kez belirlenir:
+    hem Türkçe hem düz biçime uyan belirsiz metinler (22.104) sütundaki belirgin hücrelerin çoğunluğuna göre,
+    çoğunluk yoksa Türkçe biçimde okunur.
+    """
+    column = pd.Series(column).reset_index(drop=True)
+    if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+        values = column.to_numpy(dtype=float, na_value=np.nan)
+        return ParsedNumbers(np.nan_to_num(values, nan=0.0), "numeric", [])
+
+    values = np.zeros(len(column))
+    non_text = np.zeros(len(column), dtype=bool)
+    if column.dtype == object and pd.api.types.infer_dtype(column, skipna=True) != "string":
+        # Excel'den gelen sayı hücreleri metin ayrıştırmasına girmez
+        non_text = column.notna().to_numpy() & (column.map(type) != str).to_numpy()
+        if non_text.any():
+            values[non_text] = pd.to_numeric(column[non_text], errors="coerce").to_numpy(dtype=float)
+            column = column.mask(non_text)
+
+    text = column.astype("string").str.strip()
+    present = text.str.len().to_numpy(dtype=float, na_value=0) > 0
+    is_tr = text.str.fullmatch(_TR_NUMBER).to_numpy(dtype=bool, na_value=False)
+    is_plain = text.str.fullmatch(_PLAIN_NUMBER).to_numpy(dtype=bool, na_value=False)
+    has_dot = text.str.contains(".", regex=False).to_numpy(dtype=bool, na_value=False)
+
+    # Ayraç içermeyen tam sayılar iki biçimde de aynıdır; sadece noktalı ortak metinler belirsizdir
+    ambiguous = is_tr & is_plain & has_dot
+    tr_only = is_tr & ~is_plain
+    plain_only = is_plain & ~is_tr
+    n_tr, n_plain = int(tr_only.sum()), int(plain_only.sum())
+    use_tr = tr_only | ambiguous if n_tr >= n_plain else tr_only
+    if n_tr and n_plain:
+        number_format = "mixed"
+    elif n_tr or (ambiguous.any() and not n_plain):
+        number_format = "tr"
+    elif present.any():
+        number_format = "plain"
+    else:
+        number_format = "numeric"
+
+    valid = is_tr | is_plain
+    if use_tr.any():
+        tr_text = text.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+        text = tr_text if use_tr.all() else text.where(~use_tr, tr_text)
+    # Doğrulanmış metinler katı dönüşümle çevrilir (pyarrow varsa onun üzerinden, pd.to_numeric'ten çok hızlı)
+    text = text.where(valid, "0")
+    float_dtype = "float64[pyarrow]" if getattr(text.dtype, "storage", None) == "pyarrow" else "float64"
+    parsed = text.astype(float_dtype).to_numpy(dtype=float)
+    values[valid] = parsed[valid]
+    invalid = (present & ~valid) | (non_text & np.isnan(values))
+    values[present & ~valid] = np.nan
+    return ParsedNumbers(values, number_format, np.flatnonzero(invalid).tolist())
+
+# Akışlı okumada bir parçadaki en fazla satır (bellek kullanımı bu sayıyla orantılıdır)
+DEFAULT_CHUNK_ROWS = 50_000
+
+def _sniff_csv_separator(first_line):
+    """Türkçe CSV'lerde yaygın ';' ayracını ',' ayracından ayırır."""
+    return ';' if first_line.count(';') > first_line.count(',') else ','
+
+def _read_first_line(source):
+    """Ayraç tahmini için ilk satırı okur; dosya benzeri nesne başa sarılır."""
+    if hasattr(source, "read"):
+        first_line = source.readline()
+        source.seek(0)
+    else:
+        with open(source, "rb") as f:
+            first_line = f.readline()
+    if isinstance(first_line, bytes):
+        first_line = first_line.decode("utf-8", errors="ignore")
+    return first_line
+
+def _roster_format(source, file_name):
+    name = str(file_name or getattr(source, "name", None) or source).lower()
+    for suffix in ("csv", "parquet", "xls"):
+        if name.endswith("." + suffix):
+            return suffix
+    return "xlsx"
+
+def _dedup_columns(columns):
+    """
+    Tekrarlanan başlıkları pd.read_excel / pd.read_csv gibi adlandırır: 'Maaş', 'Maaş.1', 'Maaş.2'.
+    Başlıkta zaten bulunan adlar atlanır (Maaş, Maaş, Maaş.1 -> Maaş, Maaş.2, Maaş.1).
+    """
+    columns = list(columns)
+    counts = {}
+    for i, name in enumerate(columns):
+        original = name
+        count = counts.get(name, 0)
+        while count > 0:
+            counts[original] = count + 1
+            name = f"{original}.{count}"
+            count = count + 1 if name in columns else counts.get(name, 0)
+        columns[i] = name
+        counts[name] = count + 1
+    return columns
+
+def _iter_xlsx_chunks(source, chunk_rows):
+    """openpyxl salt-okunur modda satır satır okur; çalışma kitabının tamamı belleğe alınmaz."""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        # Boş ve tekrarlanan başlıklar pd.read_excel'deki gibi adlandırılır
+        columns = _dedup_columns(f"Unnamed: {i}" if h is None else h for i, h in enumerate(header))
+        width = len(columns)
+        buffer = []
+        for row in rows:
+            if all(v is None for v in row):
+                continue
+            buffer.append(row[:width] + (None,) * (width - len(row)))
+            if len(buffer) == chunk_rows:
+                yield pd.DataFrame.from_records(buffer, columns=columns)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame.from_records(buffer, columns=columns)
+    finally:
+        wb.close()
+
+def _iter_parquet_chunks(source, chunk_rows):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet dosyaları için pyarrow gerekli (pip install pyarrow)") from e
+    for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows):
+        yield batch.to_pandas()
+
+def iter_roster_chunks(source, file_name=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """
+    Personel listesini (csv/parquet/xlsx/xls) en fazla chunk_rows satırlık DataFrame parçaları halinde okur.
+    Bellek kullanımı dosya boyutuyla değil parça boyutuyla sınırlıdır (.xls biçimi akışlı okunamaz, tek parça gelir).
+    """
+    fmt = _roster_format(source, file_name)
+    if fmt == "csv":
+        # Sayılar metin olarak okunur; Türkçe biçim parse_number_column ile çözülür
+        chunks = pd.read_csv(source, sep=_sniff_csv_separator(_read_first_line(source)), dtype=str,
+                             chunksize=chunk_rows)
+    elif fmt == "parquet":
+        chunks = _iter_parquet_chunks(source, chunk_rows)
+    elif fmt == "xls":
+        chunks = [pd.read_excel(source)]
+    else:
+        chunks = _iter_xlsx_chunks(source, chunk_rows)
+
+    chunks = iter(chunks)
+    while True:
+        # Ölçüm sadece dosyadan okumayı kapsar; parçanın işlenmesi çağıranın aşamasına yazılır
+        with profiling.stage("Dosya Okuma") as record:
+            chunk = next(chunks, None)
+            if chunk is None:
+                break
+            # Sütun İsimlerini Temizle (Boşlukları kırp)
+            chunk.columns = chunk.columns.astype(str).str.strip()
+            record["rows"] = len(chunk)
+        yield chunk
+
+def read_roster(source, file_name=None, on_progress=None):
+    """
+    Personel listesini (xlsx/xls/csv/parquet) tek DataFrame olarak okur; sütun adlarındaki boşlukları kırpar.
+    source: dosya yolu veya dosya benzeri nesne; uzantı file_name veya source.name'den alınır.
+    on_progress(okunan_satır) her parçadan sonra çağrılır.
+    """
+    chunks = []
+    rows_read = 0
+    for chunk in iter_roster_chunks(source, file_name):
+        chunks.append(chunk)
+        rows_read += len(chunk)
+        if on_progress is not None:
+            on_progress(rows_read)
+    if not chunks:
+        return pd.DataFrame()
+    return chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+
+# Sütun tahmini için anahtar kelimeler
+WAGE_COLUMN_KEYWORDS = ['ücret', 'maas', 'maaş', 'tutar', 'net', 'brut', 'brüt']
+NAME_COLUMN_KEYWORDS = ['ad', 'isim', 'personel', 'calisan']
+
+def find_default_col(options, keywords):
+    """Anahtar kelimelerden birini içeren ilk sütun; bulunamazsa ilk sütun."""
+    for col in options:
+        for key in keywords:
+            if key.lower() in col.lower():
+                return col
+    return options[0] if options else None
@@ -0,0 +1,373 @@
+"""Aşamalı hesaplama hattı: okuma -> hedef ücret -> çalışan -> işveren -> kurumlar vergisi -> sonuçlar."""
+import numpy as np
+
+from . import profiling
+from .engine import MONTH_NAMES, PAYROLL_FIELDS, calculate_employer_cost_batch, yearly_total
+from .cache import estimate_nbytes
+from .dedup import ScheduleMemo, calculate_employee_payroll_dedup
+from .parallel import ParallelPayroll
+from .parsing import parse_number_column
+
+def extract_roster_columns(df, col_wage, col_name, col_dept, row_offset=0):
+    """
+    Eşleştirilen sütunlardan maaş, ad ve departman dizilerini çıkarır. Maaşı 0/boş olan satırlar atlanır;
+    okunamayan maaşlar sıfırlanmaz, invalid_rows (listedeki sıra, 0 tabanlı) ve invalid_values ile bildirilir.
+    row_offset: parça parça okumada df'in ilk satırının listedeki sırası.
+    """
+    parsed = parse_number_column(df[col_wage])
+    raw_wages = parsed.values
+    rows = np.flatnonzero((raw_wages != 0) & ~np.isnan(raw_wages))
+
+    if col_dept != "Seçiniz":
+        dept_vals = df[col_dept].to_numpy()[rows]
+    else:
+        dept_vals = np.full(len(rows), '-', dtype=object)
+
+    if col_name == "Otomatik İsimlendir":
+        person_names = [f"Personel {row_offset + i + 1}" for i in rows]
+    else:
+        person_names = df[col_name].to_numpy()[rows].tolist()
+
+    return {
+        "rows": rows, "raw_wages": raw_wages[rows], "person_names": person_names, "dept_vals": dept_vals,
+        "number_format": parsed.number_format,
+        "invalid_rows": [row_offset + i for i in parsed.invalid_rows],
+        "invalid_values": df[col_wage].to_numpy()[parsed.invalid_rows].tolist()
+    }
+
+def calculate_corporate_tax(yearly_total_cost, corporate_tax_rate):
+    """Yıllık maliyet üzerinden Kurumlar Vergisi tasarrufu ve vergi sonrası net maliyet."""
+    saving = yearly_total_cost * corporate_tax_rate
+    return {"Kurumlar_Vergisi_Tasarrufu": saving, "Net_Isveren_Maliyeti": yearly_total_cost - saving}
+
+def monthly_columns(payroll):
+    """Rapordaki Ay_{n}_Maliyet / Ay_{n}_Net / Ay_{n}_Brut sütunları."""
+    columns = {}
+    for month in range(12):
+        columns[f"Ay_{month+1}_Maliyet"] = payroll['total_cost'][:, month]
+        columns[f"Ay_{month+1}_Net"] = payroll['net_pay'][:, month]
+        columns[f"Ay_{month+1}_Brut"] = payroll['gross_wage'][:, month]
+    return columns
+
+def build_results_table(roster, target_wages, calc_type, payroll, corporate, include_months=True):
+    """
+    Personel bazlı sonuç tablosunu (DataFrame) oluşturur.
+    include_months=False ise aylık Ay_* sütunları eklenmez (aylık değerler PayrollBlock'ta tutulduğunda).
+    """
+    import pandas as pd
+
+    emp_results = {
+        "Personel": roster["person_names"],
+        "Departman": roster["dept_vals"],
+        "Mevcut Ücret": roster["raw_wages"],
+        "2026 Hedef Ücret": target_wages,
+        "Ücret Tipi": calc_type
+    }
+    
+    # Aylık verileri kaydet
+    if include_months:
+        emp_results.update(monthly_columns(payroll))
+    
+    emp_results["Toplam_Yillik_Maliyet"] = yearly_total(payroll['total_cost'])
+    emp_results["Yillik_Net_Ucret"] = yearly_total(payroll['net_pay'])
+    emp_results["Yillik_SGK_Isci"] = yearly_total(payroll['sgk_worker'])
+    emp_results["Yillik_SGK_Isveren"] = yearly_total(payroll['sgk_employer'])
+    emp_results["Yillik_Gelir_Vergisi"] = yearly_total(payroll['income_tax'])
+    emp_results["Yillik_Damga_Vergisi"] = yearly_total(payroll['stamp_tax'])
+    emp_results.update(corporate)
+    
+    return pd.DataFrame(emp_results)
+
+def with_monthly_columns(results, block, start=0):
+    """
+    Ay_* sütunları olmadan saklanan sonuç tablosuna rapor için aylık sütunları bloktan geri ekler.
+    results tablonun bir dilimi ise start, dilimin bloktaki ilk satırıdır.
+    """
+    import pandas as pd
+
+    position = results.columns.get_loc("Ücret Tipi") + 1
+    payroll = {field: values[start:start + len(results)] for field, values in block.payroll().items()}
+    months = pd.DataFrame(monthly_columns(payroll), index=results.index)
+    return pd.concat([results.iloc[:, :position], months, results.iloc[:, position:]], axis=1)
+
+# Rapor dışa aktarımında bir seferde oluşturulan satır (aylık sütunlar bu dilim için eklenir)
+REPORT_CHUNK_ROWS = 10_000
+
+def iter_report_chunks(results, block, chunk_rows=REPORT_CHUNK_ROWS):
+    """Detaylı raporu (aylık sütunlarla) chunk_rows'luk dilimler halinde üretir; tam tablo hiç oluşturulmaz."""
+    for start in range(0, len(results), chunk_rows):
+        yield with_monthly_columns(results.iloc[start:start + chunk_rows], block, start)
+
+# Kişi bordrosu tablosundaki sütunlar (alan -> başlık)
+PERSON_PAYROLL_COLUMNS = {
+    "gross_wage": "Brüt Ücret",
+    "sgk_worker": "SGK İşçi",
+    "unemp_worker": "İşsizlik İşçi",
+    "income_tax_base": "GV Matrahı",
+    "cumulative_tax_base": "Kümülatif GV Matrahı",  # Bunun toplamı olmaz
+    "raw_income_tax": "Hesaplanan GV",
+    "gv_exemption": "GV İstisnası",
+    "income_tax": "Ödenecek GV",
+    "raw_stamp_tax": "Hesaplanan DV",
+    "dv_exemption": "DV İstisnası",
+    "stamp_tax": "Ödenecek DV",
+    "net_pay": "Net Ele Geçen",
+    "sgk_employer": "SGK İşveren",
+    "unemp_employer": "İşsizlik İşveren",
+    "total_cost": "Toplam Maliyet"
+}
+
+class PayrollBlock:
+    """
+    Detaylı aylık bordro: kişi x ay x alan (n, 12, len(PAYROLL_FIELDS)) tek float64 blok.
+    Satırlar sonuç tablosuyla aynı sıradadır. Aynı isimli personeller ayrı satır olarak kalır;
+    seçim için benzersiz etiketler (labels) ve etiket -> satır sözlüğü (index) tutulur.
+    """
+
+    def __init__(self, person_names, payroll):
+        self.data = np.empty((len(person_names), 12, len(PAYROLL_FIELDS)))
+        for k, field in enumerate(PAYROLL_FIELDS):
+            self.data[:, :, k] = payroll[field]
+        self.labels = unique_labels(person_names)
+        self.index = {label: row for row, label in enumerate(self.labels)}
+
+    def __len__(self):
+        return len(self.labels)
+
+    @property
+    def nbytes(self):
+        """Önbellek bütçesi için yaklaşık bellek boyutu."""
+        return self.data.nbytes + estimate_nbytes(self.labels) + estimate_nbytes(self.index)
+
+    def field(self, name):
+        """Bir alanın (n, 12) görünümü (kopya değil)."""
+        return self.data[:, :, PAYROLL_FIELDS.index(name)]
+
+    def payroll(self):
+        """PAYROLL_FIELDS -> (n, 12) görünümler."""
+        return {field: self.data[:, :, k] for k, field in enumerate(PAYROLL_FIELDS)}
+
+    def person_table(self, row):
+        """Bir personelin aylık bordro tablosu (12 ay + TOPLAM satırı); sadece seçildiğinde oluşturulur."""
+        return person_payroll_table(self.data[row])
+
+def person_payroll_values(data):
+    """
+    (..., 12, len(PAYROLL_FIELDS)) aylık bordro dizisinden kişi bordro tablosunun değerleri:
+    (..., 13, len(PERSON_PAYROLL_COLUMNS)), 12 ay + TOPLAM satırı. Birden çok kişi tek seferde işlenebilir.
+    """
+    values = data[..., [PAYROLL_FIELDS.index(field) for field in PERSON_PAYROLL_COLUMNS]]
+    totals = np.cumsum(values, axis=-2)[..., -1:, :]
+    totals[..., list(PERSON_PAYROLL_COLUMNS).index("cumulative_tax_base")] = 0  # Anlamsız
+    return np.concatenate([values, totals], axis=-2)
+
+def person_payroll_table(months):
+    """(12, len(PAYROLL_FIELDS)) aylık bordro dizisinden kişi bordro tablosu (12 ay + TOPLAM satırı)."""
+    import pandas as pd
+
+    table = pd.DataFrame(person_payroll_values(months), columns=list(PERSON_PAYROLL_COLUMNS.values()))
+    table.insert(0, "Ay", MONTH_NAMES + ["TOPLAM"])
+    return table
+
+def unique_labels(person_names):
+    """Aynı isimleri 'Ad (2)', 'Ad (3)' ... biçiminde ayırır."""
+    labels = []
+    seen = {}
+    for name in person_names:
+        label = str(name)
+        count = seen.get(label, 0) + 1
+        seen[label] = count
+        labels.append(label if count == 1 else f"{label} ({count})")
+    return labels
+
+def build_monthly_table(person_names, payroll):
+    """Kişi x ay satırlı (uzun biçim) detaylı bordro tablosu."""
+    import pandas as pd
+
+    n = len(person_names)
+    monthly = {
+        "Personel": np.repeat(np.asarray(person_names, dtype=object), 12),
+        "Ay": np.tile(np.asarray(MONTH_NAMES, dtype=object), n)
+    }
+    for field in PAYROLL_FIELDS:
+        monthly[field] = payroll[field].reshape(-1)
+    return pd.DataFrame(monthly)
+
+def build_results(roster, target_wages, calc_type, payroll, corporate):
+    """Personel bazlı sonuç tablosu (Ay_* sütunları olmadan) ve detaylı aylık bordro bloğunu oluşturur."""
+    results = build_results_table(roster, target_wages, calc_type, payroll, corporate, include_months=False)
+    return results, PayrollBlock(roster["person_names"], payroll)
+
+def stream_payroll(chunks, col_wage, col_name, col_dept, raise_rate, calc_type, rules, corporate_tax_rate,
+                   detailed=False, memo=None, workers=1):
+    """
+    Personel listesini parça parça hesaplar; her parça için (sonuç tablosu, parçanın PayrollBlock'u veya None,
+    okunan satır, okunamayan maaş satırları, DedupStats) üretir. Blok sadece detailed=True ise oluşturulur. Bellekte sadece o anki parça tutulur; sonuçlar bir TableWriter ile diske yazılarak birleştirilir.
+    Aynı ücretler parçalar arasında memo (verilmezse bu akışa özel bir ScheduleMemo) ile bir kez hesaplanır.
+    workers > 1 ise parçalar süreç havuzunda hesaplanır (havuz akış boyunca tek, kural seti işçilere bir kez gönderilir).
+    """
+    labels = PayrollPipeline.STAGE_LABELS
+    memo = ScheduleMemo() if memo is None else memo
+    rows_read = 0
+    with ParallelPayroll(rules, workers) as executor:
+        for chunk in chunks:
+            with profiling.stage(labels["parse"], rows=len(chunk)):
+                roster = extract_roster_columns(chunk, col_wage, col_name, col_dept, row_offset=rows_read)
+            rows_read += len(chunk)
+            n = len(roster["raw_wages"])
+            target_wages = roster["raw_wages"] * (1 + raise_rate)
+            with profiling.stage(labels["employee"], rows=n):
+                payroll, dedup_stats = calculate_employee_payroll_dedup(target_wages, calc_type, rules, memo, executor)
+            with profiling.stage(labels["employer"], rows=n):
+                payroll.update(calculate_employer_cost_batch(payroll["gross_wage"], rules))
+                corporate = calculate_corporate_tax(yearly_total(payroll["total_cost"]), corporate_tax_rate)
+            with profiling.stage(labels["aggregate"], rows=n):
+                results = build_results_table(roster, target_wages, calc_type, payroll, corporate)
+                block = PayrollBlock(roster["person_names"], payroll) if detailed else None
+            yield results, block, rows_read, roster["invalid_rows"], dedup_stats
+
+class PayrollPipeline:
+    """
+    Hesaplamayı bağımlılık sırasına göre aşamalara böler:
+    okuma -> hedef ücret -> çalışan bordrosu -> işveren maliyeti -> kurumlar vergisi -> sonuçlar.
+    Her aşamanın anahtarı kendi parametreleri ile önceki aşamanın anahtarından oluşur; bir parametre
+    değiştiğinde sadece ondan etkilenen aşamalar yeniden hesaplanır, diğerleri önbellekten gelir.
+    Süreç havuzu (workers > 1) çalıştırmalar arasında korunur; kapatmak için close() veya with bloğu.
+    """
+
+    STAGES = ("parse", "target", "employee", "employer", "corporate", "aggregate")
+    STAGE_LABELS = {
+        "parse": "Okuma",
+        "target": "Hedef Ücret",
+        "employee": "Çalışan Bordrosu",
+        "employer": "İşveren Maliyeti",
+        "corporate": "Kurumlar Vergisi",
+        "aggregate": "Sonuç Tablosu"
+    }
+
+    def __init__(self, cache=None, memo=None, workers=1, executor=None):
+        self.cache = cache      # None: önbelleksiz (tek seferlik toplu işler)
+        self.memo = memo        # Çalıştırmalar arası ücret bordrosu önbelleği (ScheduleMemo), None: sadece tekilleştirme
+        self.workers = workers  # Çalışan bordrosu için süreç sayısı (1: seri)
+        self.executor = executor  # Paylaşılan ParallelPayroll (verilirse workers yerine kullanılır, burada kapatılmaz)
+        self._own_executor = None
+        self.status = {}
+        self._keys = {}
+        self._compute = {}
+        self._values = {}
+        self._input_rows = None
+        self._summary = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Hattın kendi kurduğu süreç havuzunu kapatır."""
+        if self._own_executor is not None:
+            self._own_executor.close()
+            self._own_executor = None
+
+    def _executor(self, rules):
+        if self.executor is not None:
+            return self.executor
+        if self.workers <= 1:
+            return None
+        if self._own_executor is None:
+            self._own_executor = ParallelPayroll(rules, self.workers)
+        return self._own_executor
+
+    def stage(self, name):
+        """Son run() parametreleriyle bir aşamanın değerini bu çalıştırmadan, önbellekten veya hesaplayarak getirir."""
+        if name not in self._values:
+            key = ("stage", name, self._keys[name])
+            value = self.cache.get(key) if self.cache is not None else None
+            if value is None:
+                with profiling.stage(self.STAGE_LABELS[name]) as record:
+                    value = self._compute[name]()
+                    record["rows"] = self._rows(name, value)
+                if self.cache is not None:
+                    self.cache.put(key, value)
+                self.status[name] = "computed"
+            self._values[name] = value
+        return self._values[name]
+
+    def _rows(self, name, value):
+        """Ölçüm için aşamanın satır sayısı: okumada listedeki satır, diğerlerinde hesaplanan personel."""
+        if name == "parse":
+            return self._input_rows
+        parse = self._values.get("parse")
+        return len(parse["raw_wages"]) if parse is not None else None
+
+    def payroll(self):
+        """Son çalıştırmanın (n, 12) aylık bordro dizileri (PAYROLL_FIELDS)."""
+        return {**self.stage("employee")[0], **self.stage("employer")}
+
+    @property
+    def result_key(self):
+        """Son çalıştırmanın sonuç kümesini tanımlayan anahtar (dışa aktarım önbelleği için)."""
+        return self._keys["aggregate"]
+
+    def dedup_stats(self):
+        """Son çalıştırmanın çalışan bordrosu aşamasındaki tekilleştirme istatistikleri (DedupStats)."""
+        return self._summary["dedup_stats"]
+
+    def invalid_wage_rows(self):
+        """Son çalıştırmada maaşı okunamayan satırlar: [(listedeki sıra, hücre değeri)]."""
+        return list(zip(self._summary["invalid_rows"], self._summary["invalid_values"]))
+
+    def run(self, df, roster_digest, col_wage, col_name, col_dept, raise_rate, calc_type, rules, corporate_tax_rate,
+            detailed=True):
+        """
+        Sonuç tablosu ve detaylı bordroyu (PayrollBlock) döner; self.status hangi aşamaların hesaplandığını gösterir.
+        Tekilleştirme istatistikleri ve okunamayan satırlar sonuçla birlikte saklanır (dedup_stats, invalid_wage_rows):
+        sonuç önbellekten gelince önceki aşamalara inilmez.
+        detailed=True ise aylık değerler sadece blokta tutulur (tabloda Ay_* sütunları olmaz, rapor için
+        with_monthly_columns); detailed=False ise blok oluşturulmaz (None döner) ve Ay_* sütunları tabloda kalır.
+        """
+        self.status = {name: "reused" for name in self.STAGES}
+        self._values = {}
+        self._input_rows = len(df)
+        keys = {"parse": (roster_digest, col_wage, col_name, col_dept)}
+        keys["target"] = keys["parse"] + (raise_rate,)
+        keys["employee"] = keys["target"] + (calc_type, rules.employee_digest)
+        keys["employer"] = keys["employee"] + rules.employer_key
+        keys["corporate"] = keys["employer"] + (corporate_tax_rate,)
+        keys["aggregate"] = keys["corporate"] + (detailed,)
+        self._keys = keys
+
+        def employee():
+            return calculate_employee_payroll_dedup(
+                self.stage("target"), calc_type, rules, self.memo, self._executor(rules)
+            )
+
+        def aggregate():
+            payroll = self.payroll()
+            roster = self.stage("parse")
+            if detailed:
+                results, block = build_results(roster, self.stage("target"), calc_type, payroll, self.stage("corporate"))
+            else:
+                results = build_results_table(roster, self.stage("target"), calc_type, payroll, self.stage("corporate"))
+                block = None
+            summary = {
+                "dedup_stats": self.stage("employee")[1],
+                "invalid_rows": roster["invalid_rows"],
+                "invalid_values": roster["invalid_values"]
+            }
+            return results, block, summary
+
+        # Aşamalar sonuçtan geriye doğru istenir; sonuç önbellekteyse önceki aşamalara hiç inilmez
+        self._compute = {
+            "parse": lambda: extract_roster_columns(df, col_wage, col_name, col_dept),
+            "target": lambda: self.stage("parse")["raw_wages"] * (1 + raise_rate),
+            "employee": employee,
+            "employer": lambda: calculate_employer_cost_batch(self.stage("employee")[0]["gross_wage"], rules),
+            "corporate": lambda: calculate_corporate_tax(
+                yearly_total(self.stage("employer")["total_cost"]), corporate_tax_rate
+            ),
+            "aggregate": aggregate
+        }
+        results, block, self._summary = self.stage("aggregate")
+        return results, block
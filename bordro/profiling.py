@@ -0,0 +1,165 @@
+"""
+Aşama bazlı süre / bellek ölçümü ve motor sayaçları.
+
+Ölçüm sadece bir Profiler etkinleştirildiğinde (activate) yapılır; kapalıyken stage() hazır bir boş bağlam,
+count() tek bir ContextVar okuması maliyetindedir. Etkin profiler iş parçacığı / bağlam başınadır
+(her Streamlit oturumu kendi ölçümünü görür); süreç havuzundaki işçilerin sayaçları ana sürece döndürülür.
+"""
+import contextvars
+import json
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+_active = contextvars.ContextVar("maas_profiler", default=None)
+
+# Sayaç adları
+DEDUCTIONS = "calculate_deductions"      # Kesinti hesabı yapılan (kişi, ay) sayısı (tekil + toplu)
+NET_TO_GROSS = "net_brut_cozum"          # Netten brüte çözülen (kişi, ay) sayısı
+
+class _NullStage:
+    """Ölçüm kapalıyken kullanılan boş bağlam (kayıt sözlüğü atılır)."""
+
+    def __enter__(self):
+        return {}
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class Profiler:
+    """
+    Aşama kayıtları: süre, satır / sn, (memory=True ise tracemalloc ile) aşama başına göre en yüksek ek bellek
+    ve aşama içindeki sayaç artışları. Aynı adlı aşamalar (parça parça hesaplama) tek satırda toplanır.
+    memory=True tracemalloc'u en dıştaki aşama boyunca açar; bu ölçüm hesaplamayı belirgin yavaşlatır.
+    """
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.counters = Counter()
+        self.stages = {}         # ad -> kayıt (ilk çalışma sırasıyla)
+        self._open = []          # Açık (iç içe) aşamalar: iç aşama süresi, sayaçlar, iç aşamalardan önceki tepe bellek
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """
+        Bir aşamayı ölçer; dönen sözlüğe sonradan 'rows' yazılabilir (satır sayısı aşama içinde belli olunca).
+        İç içe aşamalarda süre ve sayaçlar sadece en içteki aşamaya yazılır (üst aşamanın süresinden iç aşamalar
+        düşülür); en yüksek bellek iç aşamaları da kapsar.
+        """
+        record = {"rows": rows}
+        frame = {"child_seconds": 0.0, "counters": Counter(), "peak": 0, "start_bytes": 0}
+        started_tracing = self.memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.memory:
+            # tracemalloc'un tek tepe değeri var: sıfırlamadan önce üst aşamanın o ana kadarki tepesi saklanır
+            if self._open:
+                self._open[-1]["peak"] = max(self._open[-1]["peak"], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            frame["start_bytes"] = tracemalloc.get_traced_memory()[0]
+        self._open.append(frame)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            seconds = time.perf_counter() - start
+            self._open.pop()
+            peak = None
+            if self.memory:
+                peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+            if started_tracing:
+                tracemalloc.stop()
+            if self._open:
+                self._open[-1]["child_seconds"] += seconds
+                if peak is not None:
+                    self._open[-1]["peak"] = max(self._open[-1]["peak"], peak)
+            self._add(name, seconds - frame["child_seconds"], record["rows"],
+                      None if peak is None else peak - frame["start_bytes"], frame["counters"])
+
+    def _add(self, name, seconds, rows, peak, counters):
+        entry = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0, "rows": None, "peak_bytes": None,
+                                              "counters": Counter()})
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        if rows is not None:
+            entry["rows"] = (entry["rows"] or 0) + rows
+        if peak is not None:
+            entry["peak_bytes"] = max(entry["peak_bytes"] or 0, peak)
+        entry["counters"].update(counters)
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+        if self._open:
+            self._open[-1]["counters"][name] += n
+
+    def records(self):
+        """Aşama kayıtları (JSON'a uygun sözlükler)."""
+        records = []
+        for name, entry in self.stages.items():
+            seconds, rows = entry["seconds"], entry["rows"]
+            records.append({
+                "stage": name,
+                "calls": entry["calls"],
+                "seconds": round(seconds, 6),
+                "rows": rows,
+                "rows_per_sec": round(rows / seconds, 1) if rows and seconds > 0 else None,
+                "peak_mb": round(entry["peak_bytes"] / 2**20, 3) if entry["peak_bytes"] is not None else None,
+                **{name: count for name, count in entry["counters"].items()}
+            })
+        return records
+
+    def to_dict(self):
+        return {
+            "total_seconds": round(time.perf_counter() - self.started, 6),
+            "max_rss_mb": max_rss_mb(),
+            "counters": dict(self.counters),
+            "stages": self.records()
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), ensure_ascii=False, **kwargs)
+
+    def table(self):
+        """Panel için aşama tablosu (DataFrame)."""
+        import pandas as pd
+
+        return pd.DataFrame(self.records())
+
+def max_rss_mb():
+    """Sürecin şimdiye kadarki en yüksek bellek kullanımı (MB; desteklenmeyen sistemlerde None)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    import sys
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS bayt döner
+    return round(rss / 2**20 if sys.platform == "darwin" else rss / 2**10, 1)
+
+def activate(profiler):
+    """Bu bağlamda (iş parçacığı) profiler'ı etkinleştirir; None ölçümü kapatır. Önceki duruma dönmek için token döner."""
+    return _active.set(profiler)
+
+def deactivate(token):
+    _active.reset(token)
+
+def active():
+    return _active.get()
+
+def stage(name, rows=None):
+    """Etkin profiler varsa aşamayı ölçen bağlam, yoksa boş bağlam: with stage("Okuma", rows=n) as record: ..."""
+    profiler = _active.get()
+    if profiler is None:
+        return _NULL_STAGE
+    return profiler.stage(name, rows)
+
+def count(name, n=1):
+    """Etkin profiler varsa sayacı artırır."""
+    profiler = _active.get()
+    if profiler is not None:
+        profiler.count(name, n)
@@ -0,0 +1,176 @@
+"""Vergi ve SGK kural setleri (2026 projeksiyonu), derlenmiş vergi tarifesi ve asgari ücret istisnaları."""
+import hashlib
+from bisect import bisect_left
+from dataclasses import dataclass, astuple, replace
+from functools import lru_cache, cached_property
+from typing import NamedTuple
+
+import numpy as np
+
+# --- SABİTLER VE PARAMETRELER (2026 PROJEKSİYONU) ---
+
+@dataclass(frozen=True)
+class TaxRules:
+    """
+    Bir hesaplamada kullanılan vergi ve SGK parametreleri.
+    Değiştirilemez ve hashlenebilir; oturumlar arasında paylaşılabilir, derlenmiş tablolar ve
+    sonuçlar kural setine göre önbelleğe alınabilir. Değişiklik için dataclasses.replace kullanılır.
+    """
+    asgari_ucret_brut: float
+    asgari_ucret_net: float
+    sgk_taban: float
+    sgk_tavan: float
+    sgk_isci_orani: float
+    issizlik_isci_orani: float
+    sgk_isveren_orani: float
+    issizlik_isveren_orani: float
+    damga_vergisi_orani: float
+    gelir_vergisi_dilimleri: tuple  # ((limit, oran), ...)
+
+    def __post_init__(self):
+        # Dilimler liste/sözlük olarak verilse de hashlenebilir tuple'a çevrilir
+        brackets = tuple(
+            (float(d["limit"]), float(d["oran"])) if isinstance(d, dict) else (float(d[0]), float(d[1]))
+            for d in self.gelir_vergisi_dilimleri
+        )
+        object.__setattr__(self, "gelir_vergisi_dilimleri", brackets)
+
+    @property
+    def tax_table(self):
+        """Derlenmiş gelir vergisi tarifesi."""
+        return compile_tax_table(self.gelir_vergisi_dilimleri)
+
+    @property
+    def min_wage_exemptions(self):
+        """12 aylık asgari ücret GV/DV istisna tablosu."""
+        return get_min_wage_exemptions(self)
+
+    @cached_property
+    def digest(self):
+        """Süreçler arasında da sabit kalan kısa özet (önbellek anahtarları için)."""
+        return hashlib.sha256(repr(astuple(self)).encode()).hexdigest()[:16]
+
+    @property
+    def employee_digest(self):
+        """Sadece çalışan tarafını (brüt, kesintiler, net) etkileyen parametrelerin özeti."""
+        return replace(self, sgk_isveren_orani=0.0, issizlik_isveren_orani=0.0).digest
+
+    @property
+    def employer_key(self):
+        """İşveren primlerini etkileyen parametreler."""
+        return (self.sgk_taban, self.sgk_tavan, self.sgk_isveren_orani, self.issizlik_isveren_orani)
+
+DEFAULT_RULES = TaxRules(
+    asgari_ucret_brut=33030.00,
+    asgari_ucret_net=28075.50,
+    sgk_taban=33030.00,
+    sgk_tavan=297270.00,
+    sgk_isci_orani=0.14,
+    issizlik_isci_orani=0.01,
+    sgk_isveren_orani=0.2175,  # %21.75 SGK (KVSK Dahil) + %2 İşsizlik = %23.75 Toplam
+    issizlik_isveren_orani=0.02,
+    damga_vergisi_orani=0.00759,
+    gelir_vergisi_dilimleri=(
+        (190000, 0.15),
+        (400000, 0.20),
+        (1500000, 0.27),
+        (5300000, 0.35),
+        (float('inf'), 0.40)
+    )
+)
+
+# 2026 GÜNCELLEMESİ: İşveren Taban Oranı = %23.75 (KVSK Dahil)
+# İşsizlik (%2) Sabit -> İndirimler sadece SGK Payı üzerinden
+SGK_TESVIK_SECENEKLERI = {
+    "5510 - İmalat Sektörü (%5 İndirim)": 0.1675,           # Toplam: 18.75% -> SGK Part: 16.75%
+    "5510 - İmalat Dışı Sektörler (%2 İndirim)": 0.1975,    # Toplam: 21.75% -> SGK Part: 19.75%
+    "Teşviksiz / Standart (%0)": 0.2175                     # Toplam: 23.75% -> SGK Part: 21.75%
+}
+# Komut satırı ve HTTP servisinde kullanılan kısa adlar
+TESVIK_KISA_ADLARI = dict(zip(("imalat", "imalat-disi", "yok"), SGK_TESVIK_SECENEKLERI))
+
+def rules_for_incentive(incentive_choice, base=DEFAULT_RULES):
+    """Seçilen SGK teşvik seçeneğine göre işveren oranı ayarlanmış kural seti."""
+    return replace(base, sgk_isveren_orani=SGK_TESVIK_SECENEKLERI[incentive_choice])
+
+# --- GELİR VERGİSİ TARİFESİ VE İSTİSNALAR ---
+
+class TaxBracketTable(NamedTuple):
+    """Derlenmiş gelir vergisi tarifesi: dilim alt/üst sınırları, oranlar ve dilim başına kadarki vergi."""
+    limits: np.ndarray
+    lowers: np.ndarray
+    rates: np.ndarray
+    base_tax: np.ndarray
+    bounds: tuple  # Skaler arama için üst sınırlar
+    rows: tuple    # Skaler hesap için (alt sınır, oran, önceki vergi) üçlüleri
+
+@lru_cache(maxsize=32)
+def compile_tax_table(brackets):
+    """((limit, oran), ...) dilimlerini bir kez derler; aynı tarife için önbellekten döner."""
+    limits, lowers, rates, base_tax = [], [], [], []
+    prev_limit = 0
+    t = 0.0
+    for limit, oran in brackets:
+        limits.append(float(limit))
+        lowers.append(float(prev_limit))
+        rates.append(float(oran))
+        base_tax.append(t)
+        # Dilimin tamamının vergisi (kümülatif toplam, dilim sırasıyla)
+        t += (limit - prev_limit) * oran
+        prev_limit = limit
+
+    arrays = [np.array(values) for values in (limits, lowers, rates, base_tax)]
+    for arr in arrays:
+        arr.setflags(write=False)
+    return TaxBracketTable(*arrays, bounds=tuple(limits), rows=tuple(zip(lowers, rates, base_tax)))
+
+def tax_for_base(value, table):
+    """Kümülatif matrahın toplam vergisi; skaler veya NumPy dizisi alır (O(log k) dilim araması)."""
+    if np.ndim(value) == 0:
+        if value <= 0:
+            return 0.0
+        lower, rate, base = table.rows[bisect_left(table.bounds, value)]
+        return base + (value - lower) * rate
+
+    value = np.asarray(value, dtype=float)
+    i = np.minimum(np.searchsorted(table.limits, value), len(table.bounds) - 1)
+    return np.where(value > 0, table.base_tax[i] + (value - table.lowers[i]) * table.rates[i], 0.0)
+
+def base_for_tax(tax, table):
+    """tax_for_base'in tersi: verilen toplam vergiyi doğuran kümülatif matrah."""
+    tax = np.asarray(tax, dtype=float)
+    i = np.maximum(np.searchsorted(table.base_tax, tax) - 1, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):  # Sıfır oranlı dilimde bölme sadece atılan (tax <= 0) satırlarda olur
+        return np.where(tax > 0, table.lowers[i] + (tax - table.base_tax[i]) / table.rates[i], 0.0)
+
+def calculate_income_tax(cumulative_base, current_base, rules=DEFAULT_RULES):
+    """Kümülatif matraha göre gelir vergisini hesaplar (skaler veya dizi)."""
+    # Önceki kümülatif vergi toplamını bul, sonra (kümülatif + matrah)'ın vergisini bul ve çıkar.
+    table = rules.tax_table
+    tax_before = tax_for_base(cumulative_base, table)
+    tax_after = tax_for_base(cumulative_base + current_base, table)
+    
+    return tax_after - tax_before
+
+class MinWageExemption(NamedTuple):
+    gv: float
+    dv: float
+
+@lru_cache(maxsize=32)
+def get_min_wage_exemptions(rules):
+    """12 ay için Asgari Ücret GV ve DV istisnalarını hesaplar (kural seti başına bir kez)."""
+    exemptions = []
+    cum_base = 0
+    
+    gross_mw = rules.asgari_ucret_brut
+    worker_sgk = gross_mw * rules.sgk_isci_orani
+    worker_unemp = gross_mw * rules.issizlik_isci_orani
+    tax_base_mw = gross_mw - (worker_sgk + worker_unemp)
+    
+    for _ in range(12):
+        gv_istisna = calculate_income_tax(cum_base, tax_base_mw, rules)
+        dv_istisna = gross_mw * rules.damga_vergisi_orani
+        exemptions.append(MinWageExemption(gv=gv_istisna, dv=dv_istisna))
+        cum_base += tax_base_mw
+        
+    return tuple(exemptions)
@@ -0,0 +1,83 @@
+"""Senaryo karşılaştırması: artış oranı x SGK teşviki x Brüt/Net kombinasyonlarının toplu hesabı."""
+import numpy as np
+
+from .dedup import calculate_employee_payroll_dedup
+from .engine import calculate_employer_cost_batch, yearly_total
+from .rules import DEFAULT_RULES, rules_for_incentive
+
+# Tek geçişte hesaplanan en fazla (senaryo, personel) satırı; bellek kullanımı bununla orantılıdır
+SCENARIO_BATCH_ROWS = 100_000
+
+SCENARIO_COLUMNS = [
+    "Artış Oranı (%)", "Teşvik", "Ücret Tipi", "Toplam_Yillik_Maliyet", "Kurumlar_Vergisi_Tasarrufu",
+    "Net_Isveren_Maliyeti"
+]
+
+def monthly_gross_wages(wages, calc_types, rules):
+    """
+    (satır, 12) aylık brüt ücretler: Brüt satırlarda vergi motoruna girmeden (asgari ücrete tamamlanmış hedef),
+    Net satırlarda motorla (her farklı ücret bir kez) bulunur. calc_types: 'Brüt' / 'Net' veya satır bazlı dizi.
+    """
+    wages = np.asarray(wages, dtype=float)
+    calc_types = np.broadcast_to(np.asarray(calc_types, dtype=object), wages.shape)
+    gross_wage = np.repeat(np.maximum(wages, rules.asgari_ucret_brut)[:, None], 12, axis=1)
+    net_rows = np.flatnonzero(calc_types == "Net")
+    if net_rows.size:
+        gross_wage[net_rows] = calculate_employee_payroll_dedup(wages[net_rows], "Net", rules)[0]["gross_wage"]
+    return gross_wage
+
+def calculate_scenario_totals(raw_wages, raise_rates, incentives, calc_types, base_rules=DEFAULT_RULES,
+                              batch_rows=SCENARIO_BATCH_ROWS):
+    """
+    Tüm senaryoların yıllık toplam işveren maliyetini hesaplar.
+    Brüt ücret çalışan kesintilerinden bağımsız olduğu için her (ücret tipi, artış) çifti için bir kez bulunur
+    ve tüm teşvik seçenekleri aynı brüt ücretleri paylaşır. (senaryo, personel) satırları batch_rows'luk
+    dilimler halinde tek motor çağrısına verilir.
+    Dönüş: (employee_scenarios [(ücret tipi, artış)], yıllık maliyet (teşvik, senaryo))
+    """
+    raw_wages = np.asarray(raw_wages, dtype=float)
+    n = len(raw_wages)
+    employee_scenarios = [(calc_type, rate) for calc_type in calc_types for rate in raise_rates]
+    scenario_types = np.array([calc_type for calc_type, _ in employee_scenarios], dtype=object)
+    scenario_rates = np.array([rate for _, rate in employee_scenarios], dtype=float)
+    rules_by_incentive = [rules_for_incentive(incentive, base_rules) for incentive in incentives]
+
+    m = len(employee_scenarios)
+    yearly_cost = np.zeros((len(incentives), m))
+    total_rows = n * m
+    for start in range(0, total_rows, batch_rows):
+        scenario, person = np.divmod(np.arange(start, min(start + batch_rows, total_rows)), n)
+        wages = raw_wages[person] * (1 + scenario_rates[scenario])
+        gross_wage = monthly_gross_wages(wages, scenario_types[scenario], base_rules)
+
+        for k, rules in enumerate(rules_by_incentive):
+            cost = calculate_employer_cost_batch(gross_wage, rules)["total_cost"]
+            yearly_cost[k] += np.bincount(scenario, weights=yearly_total(cost), minlength=m)
+
+    return employee_scenarios, yearly_cost
+
+def run_scenarios(raw_wages, raise_rates, incentives, calc_types, corporate_tax_rate, base_rules=DEFAULT_RULES,
+                  batch_rows=SCENARIO_BATCH_ROWS):
+    """
+    Senaryo karşılaştırma tablosu: her satır bir (artış oranı, teşvik, ücret tipi) kombinasyonu.
+    raw_wages: mevcut ücretler (extract_roster_columns()["raw_wages"]), raise_rates: 0.20 gibi oranlar.
+    """
+    import pandas as pd
+
+    employee_scenarios, yearly_cost = calculate_scenario_totals(
+        raw_wages, raise_rates, incentives, calc_types, base_rules, batch_rows
+    )
+    rows = []
+    for k, incentive in enumerate(incentives):
+        for j, (calc_type, rate) in enumerate(employee_scenarios):
+            total_cost = yearly_cost[k, j]
+            saving = total_cost * corporate_tax_rate
+            rows.append({
+                "Artış Oranı (%)": round(rate * 100, 6),
+                "Teşvik": incentive,
+                "Ücret Tipi": calc_type,
+                "Toplam_Yillik_Maliyet": total_cost,
+                "Kurumlar_Vergisi_Tasarrufu": saving,
+                "Net_Isveren_Maliyeti": total_cost - saving
+            })
+    return pd.DataFrame(rows, columns=SCENARIO_COLUMNS)
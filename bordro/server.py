@@ -0,0 +1,465 @@
+"""
+Yerel JSON/HTTP bordro servisi (asyncio; sadece standart kütüphane ve NumPy).
+
+    maas sunucu --port 8765 --paralel 2
+
+    POST /v1/bordro        {"wage": 50000, "type": "Brüt", "incentive": "imalat"}
+    POST /v1/bordro/toplu  {"incentive": "imalat", "employees": [{"wage": 50000, "type": "Net"}, ...]}
+    GET  /v1/durum         İstek, toplu hesap ve gecikme (p50 / p99) istatistikleri
+
+Kural seti istek başına "incentive" (imalat / imalat-disi / yok) ve isteğe bağlı "rules" ile (TaxRules
+alanları, örn. {"sgk_tavan": 300000}) verilir; toplu istekte personel bazında da verilebilir. Yanıt, her
+personel için calculate_deductions'ın 12 aylık dökümü (PAYROLL_FIELDS) ve yıllık toplamlardır; tutarlar
+kuruşa yuvarlanır ("round": false ile tam hassasiyet).
+Aynı kural setli eşzamanlı istekler kısa bir pencerede (varsayılan 2 ms) toplanıp tek vektörel motor
+çağrısıyla işçi havuzunda hesaplanır; olay döngüsü hesap sürerken yeni istekleri kabul etmeye devam eder.
+"""
+import asyncio
+import json
+import math
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import fields, replace
+
+import numpy as np
+
+from .dedup import calculate_employee_payroll_dedup
+from .engine import MONTH_NAMES, PAYROLL_FIELDS, calculate_employer_cost_batch
+from .parallel import default_workers, mp_context
+from .rules import SGK_TESVIK_SECENEKLERI, TESVIK_KISA_ADLARI as INCENTIVES, TaxRules, rules_for_incentive
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Aynı kural setli isteklerin tek hesapta toplandığı süre (sn) ve bir toplu hesaptaki en fazla personel
+BATCH_WINDOW = 0.002
+MAX_BATCH_ROWS = 50_000
+# İstek sınırları
+MAX_BODY_BYTES = 32 * 2**20
+MAX_EMPLOYEES = 100_000
+MAX_HEADERS = 100
+# Ücret ve kural tutarlarının üst sınırı: motor bu aralıkta taşmadan (sonlu sonuçla) hesaplar
+MAX_AMOUNT = 1e12
+# Gecikme yüzdelikleri için tutulan son istek sayısı
+LATENCY_WINDOW = 10_000
+# Yanıttaki yıllık toplamlara girmeyen alanlar (toplamı anlamsız)
+NON_SUMMABLE_FIELDS = ("cumulative_tax_base",)
+
+WAGE_TYPES = {"brüt": "Brüt", "brut": "Brüt", "net": "Net"}
+_RULE_FIELDS = {field.name for field in fields(TaxRules)}
+# [0, 1) aralığında olması gereken oranlar
+_RATE_FIELDS = (
+    "sgk_isci_orani", "issizlik_isci_orani", "sgk_isveren_orani", "issizlik_isveren_orani", "damga_vergisi_orani"
+)
+
+class RequestError(ValueError):
+    """İstemci hatası: HTTP durum kodu ve mesaj."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+# --- İSTEK AYRIŞTIRMA ---
+
+def parse_rules(spec, base=None):
+    """İstekteki "incentive" / "rules" alanlarından kural seti (verilmeyenler base'den veya varsayılandan)."""
+    rules = base or rules_for_incentive(INCENTIVES["imalat"])
+    if "incentive" in spec:
+        incentive = spec["incentive"]
+        choice = INCENTIVES.get(incentive, incentive)
+        if choice not in SGK_TESVIK_SECENEKLERI:
+            raise RequestError(f"Bilinmeyen teşvik: {incentive!r} ({', '.join(INCENTIVES)})")
+        rules = rules_for_incentive(choice, rules)
+    overrides = spec.get("rules") or {}
+    if not isinstance(overrides, dict):
+        raise RequestError('"rules" bir nesne olmalı')
+    unknown = set(overrides) - _RULE_FIELDS
+    if unknown:
+        raise RequestError(f"Bilinmeyen kural alanları: {', '.join(sorted(unknown))}")
+    values = {}
+    for name, value in overrides.items():
+        if name == "gelir_vergisi_dilimleri":
+            try:
+                values[name] = tuple((float(limit), float(rate)) for limit, rate in value)
+            except (TypeError, ValueError):
+                raise RequestError('"gelir_vergisi_dilimleri" [[limit, oran], ...] biçiminde olmalı') from None
+        else:
+            values[name] = _number(value, name)
+    if not values:
+        return rules
+    rules = replace(rules, **values)
+    _check_rules(rules)
+    return rules
+
+def _check_rules(rules):
+    """Motorun tanımlı olduğu kural setleri: geçersiz değerler hesapta değil burada 400 ile reddedilir."""
+    brackets = rules.gelir_vergisi_dilimleri
+    if not brackets:
+        raise RequestError('"gelir_vergisi_dilimleri" en az bir dilim içermeli')
+    previous = 0.0
+    for i, (limit, rate) in enumerate(brackets):
+        if not limit > previous:
+            raise RequestError('"gelir_vergisi_dilimleri" sınırları pozitif ve kesin artan olmalı')
+        if i < len(brackets) - 1 and limit > MAX_AMOUNT:
+            raise RequestError(f'"gelir_vergisi_dilimleri" sınırları en fazla {MAX_AMOUNT:g} olabilir (son dilim hariç)')
+        if not 0 <= rate < 1:
+            raise RequestError('"gelir_vergisi_dilimleri" oranları [0, 1) aralığında olmalı')
+        previous = limit
+    if previous != math.inf:
+        raise RequestError('"gelir_vergisi_dilimleri" son dilim sınırı "inf" olmalı')
+    for name in _RATE_FIELDS:
+        if not 0 <= getattr(rules, name) < 1:
+            raise RequestError(f'"{name}" [0, 1) aralığında olmalı')
+    if rules.sgk_isci_orani + rules.issizlik_isci_orani >= 1:
+        raise RequestError('"sgk_isci_orani" ve "issizlik_isci_orani" toplamı 1\'den küçük olmalı')
+    if rules.sgk_taban > rules.sgk_tavan:
+        raise RequestError('"sgk_taban", "sgk_tavan"dan büyük olamaz')
+
+def _number(value, name):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+        raise RequestError(f'"{name}" negatif olmayan bir sayı olmalı')
+    if value > MAX_AMOUNT:
+        raise RequestError(f'"{name}" en fazla {MAX_AMOUNT:g} olabilir')
+    return float(value)
+
+def parse_employee(item):
+    """{"wage": ..., "type": "Brüt"/"Net"} -> (ücret, ücret tipi)."""
+    if not isinstance(item, dict):
+        raise RequestError("Personel kaydı bir nesne olmalı")
+    if "wage" not in item:
+        raise RequestError('"wage" alanı gerekli')
+    wage = _number(item["wage"], "wage")
+    if wage == 0:
+        raise RequestError('"wage" sıfırdan büyük olmalı')
+    wage_type = WAGE_TYPES.get(str(item.get("type", "Brüt")).lower())
+    if wage_type is None:
+        raise RequestError(f'"type" Brüt veya Net olmalı: {item.get("type")!r}')
+    return wage, wage_type
+
+def _employee_result(wage, wage_type, months, decimals=2):
+    """Bir personelin yanıtı: (12, PAYROLL_FIELDS) dizisinden aylık döküm ve yıllık toplamlar (decimals=None: tam)."""
+    totals = np.cumsum(months, axis=0)[-1]  # Aylar sırayla toplanır (sonuç tablosuyla aynı)
+    if decimals is not None:
+        # Kısa sayılar JSON'a da çok daha hızlı yazılır
+        months, totals = np.round(months, decimals), np.round(totals, decimals)
+    return {
+        "wage": wage,
+        "type": wage_type,
+        "months": [
+            {"month": MONTH_NAMES[m], **dict(zip(PAYROLL_FIELDS, row))} for m, row in enumerate(months.tolist())
+        ],
+        "yearly": {
+            field: total for field, total in zip(PAYROLL_FIELDS, totals.tolist()) if field not in NON_SUMMABLE_FIELDS
+        }
+    }
+
+def _decimals(request):
+    return 2 if request.get("round", True) else None
+
+# --- HESAP (İŞÇİ) ---
+
+def _compute_payroll(rules, wages, types):
+    """
+    Bir toplu hesabın (n, 12, PAYROLL_FIELDS) bordrosu; işçi süreçte veya iş parçacığında çalışır.
+    Aynı ücretler toplu hesap içinde bir kez hesaplanır (ScheduleMemo kullanılmaz: her eklemede tablosunu
+    yeniden sıraladığından sürekli akan küçük toplu hesaplarda gecikmeyi artırır).
+    """
+    payroll, _ = calculate_employee_payroll_dedup(wages, types, rules)
+    payroll.update(calculate_employer_cost_batch(payroll["gross_wage"], rules))
+    return np.stack([payroll[field] for field in PAYROLL_FIELDS], axis=-1)
+
+class MicroBatcher:
+    """
+    Aynı kural setli istekleri biriktirip tek _compute_payroll çağrısıyla hesaplar. Bir kural setinin ilk isteğinden
+    window saniye sonra (veya biriken personel max_rows'a ulaşınca) toplu hesap başlar; işçilerin hepsi meşgulse
+    istekler bir işçi boşalana kadar birikmeye devam eder. Böylece yük arttıkça toplu hesaplar büyür, kuyrukta
+    bekleyen küçük hesaplar gecikmeyi uzatmaz.
+    """
+
+    def __init__(self, executor, capacity=1, window=BATCH_WINDOW, max_rows=MAX_BATCH_ROWS):
+        self.executor = executor
+        self.capacity = capacity    # Aynı anda hesaplanan en fazla toplu hesap (işçi sayısı)
+        self.window = window
+        self.max_rows = max_rows
+        self.batches = 0
+        self.batched_requests = 0
+        self.rows = 0
+        self._pending = {}          # kural seti -> [(ücretler, tipler, future)]
+        self._pending_rows = {}
+        self._timers = {}
+        self._ready = deque()       # Penceresi dolmuş, boş işçi bekleyen kural setleri
+        self._in_flight = 0
+        self._tasks = set()
+
+    async def submit(self, rules, wages, types):
+        """(len(wages), 12, PAYROLL_FIELDS) bordro dizisini döner."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(rules, []).append((wages, types, future))
+        self._pending_rows[rules] = self._pending_rows.get(rules, 0) + len(wages)
+        if self._pending_rows[rules] >= self.max_rows:
+            self._flush(rules)
+        elif rules not in self._timers and rules not in self._ready:
+            self._timers[rules] = loop.call_later(self.window, self._flush, rules)
+        return await future
+
+    def _flush(self, rules):
+        timer = self._timers.pop(rules, None)
+        if timer is not None:
+            timer.cancel()
+        if rules not in self._pending:
+            return
+        if self._in_flight >= self.capacity:
+            if rules not in self._ready:
+                self._ready.append(rules)
+            return
+        items = self._pending.pop(rules)
+        self._pending_rows.pop(rules, None)
+        self._in_flight += 1
+        task = asyncio.ensure_future(self._run(rules, items))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _next(self):
+        while self._ready and self._in_flight < self.capacity:
+            self._flush(self._ready.popleft())
+
+    async def _run(self, rules, items):
+        wages = np.concatenate([item[0] for item in items])
+        types = np.concatenate([item[1] for item in items])
+        try:
+            data = await asyncio.get_running_loop().run_in_executor(
+                self.executor, _compute_payroll, rules, wages, types
+            )
+        except Exception as e:
+            for _, _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._in_flight -= 1
+            self._next()
+        self.batches += 1
+        self.batched_requests += len(items)
+        self.rows += len(wages)
+        start = 0
+        for item_wages, _, future in items:
+            if not future.done():  # İstemci bağlantıyı kapatmış olabilir
+                future.set_result(data[start:start + len(item_wages)])
+            start += len(item_wages)
+
+# --- HTTP ---
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 411: "Length Required",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+async def _read_request(reader):
+    """Bir HTTP/1.1 isteği: (yöntem, yol, başlıklar, gövde); bağlantı kapandıysa None."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, _ = line.decode("latin-1").split()
+    except ValueError:
+        raise RequestError("Geçersiz istek satırı") from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise RequestError("Çok fazla başlık")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise RequestError("Content-Length gerekli", 411)
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise RequestError("Geçersiz Content-Length") from None
+    if length > MAX_BODY_BYTES:
+        raise RequestError(f"İstek gövdesi en fazla {MAX_BODY_BYTES // 2**20} MB olabilir", 413)
+    body = await reader.readexactly(length) if length > 0 else b""
+    return method.upper(), path.split("?", 1)[0], headers, body
+
+def _encode(payload):
+    """Yanıt gövdesi; sonlu olmayan sayılar (Infinity / NaN) geçerli JSON olmadığından 400 ile reddedilir."""
+    try:
+        return json.dumps(payload, ensure_ascii=False, allow_nan=False).encode("utf-8")
+    except ValueError:
+        raise RequestError("Sonuç sonlu olmayan sayılar içeriyor; girdi tutarlarını küçültün") from None
+
+def _response(status, payload, keep_alive):
+    body = payload if isinstance(payload, bytes) else _encode(payload)
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+class PayrollService:
+    """
+    HTTP isteklerini ayrıştırıp MicroBatcher'a veren asyncio servisi.
+    workers > 1 ise hesap süreç havuzunda, değilse tek bir iş parçacığında yapılır (olay döngüsü bloklanmaz).
+    Kullanım: async with PayrollService(workers=2) as service: server = await service.start(host, port) ...
+    """
+
+    def __init__(self, workers=None, window=BATCH_WINDOW, max_batch_rows=MAX_BATCH_ROWS):
+        self.workers = default_workers() if workers is None else max(int(workers), 1)
+        if self.workers > 1:
+            self.executor = ProcessPoolExecutor(self.workers, mp_context=mp_context())
+        else:
+            self.executor = ThreadPoolExecutor(1, thread_name_prefix="bordro")
+        self.batcher = MicroBatcher(self.executor, self.workers, window, max_batch_rows)
+        self.requests = 0
+        self.errors = 0
+        self.started = time.monotonic()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._rule_sets = {}
+        self._routes = {
+            ("POST", "/v1/bordro"): self.single,
+            ("POST", "/v1/bordro/toplu"): self.batch,
+            ("GET", "/v1/durum"): self.status
+        }
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        return await asyncio.start_server(self.handle, host, port)
+
+    def _rules(self, spec, base=None):
+        """İstek kural setini, aynı değerli önceki kural setiyle aynı nesneye çevirir (özetler bir kez hesaplanır)."""
+        rules = parse_rules(spec, base)
+        if len(self._rule_sets) > 256:
+            self._rule_sets.clear()
+        return self._rule_sets.setdefault(rules, rules)
+
+    async def single(self, request):
+        rules = self._rules(request)
+        wage, wage_type = parse_employee(request)
+        data = await self.batcher.submit(rules, np.array([wage]), np.array([wage_type], dtype=object))
+        return _employee_result(wage, wage_type, data[0], _decimals(request))
+
+    async def batch(self, request):
+        employees = request.get("employees")
+        if not isinstance(employees, list) or not employees:
+            raise RequestError('"employees" boş olmayan bir liste olmalı')
+        if len(employees) > MAX_EMPLOYEES:
+            raise RequestError(f"Bir istekte en fazla {MAX_EMPLOYEES:,} personel olabilir", 413)
+        base = self._rules(request)
+        # Personel bazında kural seti verilebilir; her kural seti ayrı toplu hesaba gider
+        groups = {}
+        for i, item in enumerate(employees):
+            own_rules = isinstance(item, dict) and ("incentive" in item or "rules" in item)
+            rules = self._rules(item, base) if own_rules else base
+            groups.setdefault(rules, []).append((i,) + parse_employee(item))
+        results = [None] * len(employees)
+        decimals = _decimals(request)
+
+        async def run(rules, rows):
+            wages = np.array([row[1] for row in rows])
+            types = np.array([row[2] for row in rows], dtype=object)
+            data = await self.batcher.submit(rules, wages, types)
+            # Büyük yanıtların sözlüğe çevrilmesi olay döngüsünü bekletmesin
+            encoded = await asyncio.to_thread(
+                lambda: [_employee_result(wage, wage_type, months, decimals)
+                         for (_, wage, wage_type), months in zip(rows, data)]
+            )
+            for (i, _, _), result in zip(rows, encoded):
+                results[i] = result
+
+        await asyncio.gather(*(run(rules, rows) for rules, rows in groups.items()))
+        return {"employees": results}
+
+    async def status(self, request):
+        latencies = np.array(self._latencies) * 1000
+        batcher = self.batcher
+        return {
+            "uptime_seconds": round(time.monotonic() - self.started, 1),
+            "workers": self.workers,
+            "requests": self.requests,
+            "errors": self.errors,
+            "batches": batcher.batches,
+            "rows": batcher.rows,
+            "requests_per_batch": round(batcher.batched_requests / batcher.batches, 2) if batcher.batches else None,
+            "latency_ms": {
+                "p50": round(float(np.percentile(latencies, 50)), 3),
+                "p99": round(float(np.percentile(latencies, 99)), 3)
+            } if len(latencies) else None
+        }
+
+    async def dispatch(self, method, path, body):
+        """(durum kodu, yanıt) döner; istemci hataları RequestError ile gelir."""
+        handler = self._routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self._routes):
+                raise RequestError(f"{method} desteklenmiyor: {path}", 405)
+            raise RequestError(f"Bulunamadı: {path}", 404)
+        request = {}
+        if method == "POST":
+            try:
+                request = json.loads(body or b"{}")
+            except ValueError:
+                raise RequestError("Geçersiz JSON") from None
+            if not isinstance(request, dict):
+                raise RequestError("İstek gövdesi bir JSON nesnesi olmalı")
+        return 200, await handler(request)
+
+    async def handle(self, reader, writer):
+        """Bir bağlantıdaki istekleri sırayla yanıtlar (HTTP/1.1 keep-alive)."""
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except RequestError as e:
+                    self.errors += 1
+                    writer.write(_response(e.status, {"error": str(e)}, keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                started = time.perf_counter()
+                try:
+                    status, payload = await self.dispatch(method, path, body)
+                    payload = _encode(payload)
+                except RequestError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    print(f"Hata: {method} {path}: {e!r}", file=sys.stderr)
+                    status, payload = 500, {"error": "Sunucu hatası"}
+                self.requests += 1
+                if status == 200:
+                    self._latencies.append(time.perf_counter() - started)
+                else:
+                    self.errors += 1
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, window=BATCH_WINDOW,
+                max_batch_rows=MAX_BATCH_ROWS):
+    """Servisi başlatır ve durdurulana kadar çalıştırır."""
+    async with PayrollService(workers, window, max_batch_rows) as service:
+        server = await service.start(host, port)
+        address = server.sockets[0].getsockname()
+        print(f"Bordro servisi: http://{address[0]}:{address[1]} ({service.workers} işçi, "
+              f"toplama penceresi {window * 1000:g} ms)", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
@@ -0,0 +1,165 @@
+"""Tüm personelin aylık bordro pusulalarının toplu dışa aktarımı (ZIP)."""
+import io
+import re
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from . import profiling
+from .engine import MONTH_NAMES
+from .parallel import default_workers, mp_context
+
+# ZIP içi düzen: kişi başına bir çalışma kitabı veya her kitapta en fazla SHEETS_PER_WORKBOOK kişilik sayfa
+SLIP_LAYOUTS = ("kisi", "sayfa")
+SHEETS_PER_WORKBOOK = 100
+# Kişi başına dosya düzeninde bir işçi görevine verilen kişi sayısı
+PERSONS_PER_TASK = 100
+# Geçici arşiv dosyasının bellekte tutulduğu en büyük boyut; aşılınca diske taşınır
+SPOOL_BYTES = 16 * 2**20
+
+_ROW_LABELS = MONTH_NAMES + ["TOPLAM"]
+
+# Excel sayfa adında ve dosya adlarında kullanılamayan karakterler
+_UNSAFE_CHARS = re.compile(r'[\[\]:*?/\\<>|"]')
+
+def _unique(name, used, limit=None):
+    """name'i (gerekirse kırpıp) used içinde benzersiz yapar: 'Ad', 'Ad (2)', ..."""
+    base = name[:limit] if limit else name
+    candidate, count = base, 1
+    while candidate.lower() in used:
+        count += 1
+        suffix = f" ({count})"
+        candidate = (name[:limit - len(suffix)] if limit else name) + suffix
+    used.add(candidate.lower())
+    return candidate
+
+def _write_person_sheet(workbook, title, header, rows):
+    """Kişi bordro tablosunu (person_payroll_table ile aynı sütunlar) satır satır yazar; rows: 13 değer listesi."""
+    sheet = workbook.create_sheet(title)
+    sheet.append(header)
+    for month, row in zip(_ROW_LABELS, rows):
+        sheet.append([month, *row])
+
+def _slip_task(data, names, titles, layout):
+    """
+    İşçi süreçte (veya seri) çalışır: data (k, 12, alan) kişilerin bordrosu.
+    Dönüş: [(ZIP içi dosya adı, xlsx baytları)]; 'kisi' düzeninde kişi başına, 'sayfa' düzeninde tek dosya.
+    """
+    import openpyxl
+    from .pipeline import PERSON_PAYROLL_COLUMNS, person_payroll_values
+
+    # Tüm kişilerin tablo değerleri tek seferde; DataFrame kurulmaz, hücreler Python float olarak yazılır
+    values = person_payroll_values(data).tolist()
+    header = ["Ay", *PERSON_PAYROLL_COLUMNS.values()]
+
+    def workbook_bytes(rows):
+        workbook = openpyxl.Workbook(write_only=True)
+        for i in rows:
+            _write_person_sheet(workbook, titles[i], header, values[i])
+        buffer = io.BytesIO()
+        workbook.save(buffer)
+        return buffer.getvalue()
+
+    if layout == "kisi":
+        return [(names[i], workbook_bytes([i])) for i in range(len(names))]
+    return [(names[0], workbook_bytes(range(len(titles))))]
+
+class SlipArchiveWriter:
+    """
+    PayrollBlock'lardaki tüm personelin 12 aylık bordro tablosunu (TOPLAM satırı dahil) bir ZIP'e yazar.
+    layout='kisi': kişi başına Bordro_<ad>.xlsx; layout='sayfa': her biri en fazla SHEETS_PER_WORKBOOK kişilik,
+    kişi başına bir sayfalı çalışma kitapları. Dosyalar workers > 1 ise süreç havuzunda üretilir; ZIP'e liste
+    sırasıyla ve üretildikçe yazılır, aynı anda en fazla 2 x workers görev bellekte bekler.
+    executor: workers > 1 iken kullanılacak, dışarıda tutulan (paylaşılan) süreç havuzu; verilirse yeni havuz
+    kurulmaz ve close() onu kapatmaz.
+    Akışlı kullanım: with SlipArchiveWriter(path) as writer: writer.write(block) (parça başına bir blok).
+    """
+
+    def __init__(self, target, layout="kisi", workers=None, executor=None):
+        if layout not in SLIP_LAYOUTS:
+            raise ValueError(f"Bilinmeyen bordro düzeni: {layout} ({', '.join(SLIP_LAYOUTS)})")
+        self.layout = layout
+        self.workers = default_workers() if workers is None else max(int(workers), 1)
+        self.persons_written = 0
+        self.files_written = 0
+        # xlsx zaten sıkıştırılmış olduğundan ZIP'te tekrar sıkıştırılmaz
+        self._zip = zipfile.ZipFile(target, "w", compression=zipfile.ZIP_STORED)
+        self._pool = executor
+        self._owns_pool = executor is None
+        self._used_names = set()
+
+    def _tasks(self, block):
+        """Bloğu görevlere böler: (veri dilimi, dosya adları, sayfa adları, düzen)."""
+        per_task = PERSONS_PER_TASK if self.layout == "kisi" else SHEETS_PER_WORKBOOK
+        for start in range(0, len(block), per_task):
+            labels = [_UNSAFE_CHARS.sub("_", label) for label in block.labels[start:start + per_task]]
+            first = self.persons_written + start + 1
+            if self.layout == "kisi":
+                names = [_unique(f"Bordro_{label}", self._used_names) + ".xlsx" for label in labels]
+                titles = [label[:31] or "Bordro" for label in labels]
+            else:
+                names = [f"Bordrolar_{first:06d}-{first + len(labels) - 1:06d}.xlsx"]
+                used_titles = set()
+                titles = [_unique(label or "Bordro", used_titles, limit=31) for label in labels]
+            yield block.data[start:start + per_task], names, titles, self.layout
+
+    def write(self, block):
+        with profiling.stage("Bordro Arşivi", rows=len(block)):
+            self._write(block)
+
+    def _write(self, block):
+        if self.workers <= 1:
+            for task in self._tasks(block):
+                self._store(_slip_task(*task))
+        else:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=mp_context())
+            pending = deque()
+            for task in self._tasks(block):
+                pending.append(self._pool.submit(_slip_task, *task))
+                if len(pending) >= 2 * self.workers:
+                    self._store(pending.popleft().result())
+            while pending:
+                self._store(pending.popleft().result())
+        self.persons_written += len(block)
+
+    def _store(self, files):
+        for name, data in files:
+            self._zip.writestr(name, data)
+            self.files_written += 1
+
+    def close(self):
+        if self._pool is not None and self._owns_pool:
+            self._pool.shutdown()
+        self._pool = None
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def slip_archive_bytes(block, layout="kisi", workers=None, executor=None):
+    """Bir PayrollBlock'taki tüm personelin bordrolarını ZIP baytları olarak döner."""
+    buffer = io.BytesIO()
+    with SlipArchiveWriter(buffer, layout, workers, executor) as writer:
+        writer.write(block)
+    return buffer.getvalue()
+
+def slip_archive_file(block, layout="kisi", workers=None, executor=None, max_memory=SPOOL_BYTES):
+    """
+    Bir PayrollBlock'taki tüm personelin bordrolarını geçici bir ZIP dosyasına yazar (max_memory'e kadar bellekte,
+    sonrası diskte) ve başa sarılmış dosyayı döner; dosya kapatılınca (with bloğu) silinir.
+    Arşiv üretilirken bellekte sadece bekleyen görevler tutulur; okuyan taraf tamamını okursa arşiv boyutu kadar yer tutar.
+    """
+    archive = tempfile.SpooledTemporaryFile(max_size=max_memory, suffix=".zip")
+    try:
+        with SlipArchiveWriter(archive, layout, workers, executor) as writer:
+            writer.write(block)
+    except BaseException:
+        archive.close()
+        raise
+    archive.seek(0)
+    return archive
@@ -1,178 +1,104 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import io
-
-# --- SABİTLER VE PARAMETRELER (2026 PROJEKSİYONU) ---
-CONSTANTS = {
-    "ASGARI_UCRET_BRUT": 33030.00,
-    "ASGARI_UCRET_NET": 28075.50,
-    "SGK_TABAN": 33030.00,
-    "SGK_TAVAN": 297270.00,
-    "SGK_ISCI_ORANI": 0.14,
-    "ISSIZLIK_ISCI_ORANI": 0.01,
-    "SGK_ISVEREN_ORANI": 0.2175,  # %21.75 SGK (KVSK Dahil) + %2 İşsizlik = %23.75 Toplam
-    "ISSIZLIK_ISVEREN_ORANI": 0.02,
-    "DAMGA_VERGISI_ORANI": 0.00759,
-    "GELIR_VERGISI_DILIMLERI": [
-        {"limit": 190000, "oran": 0.15},
-        {"limit": 400000, "oran": 0.20},
-        {"limit": 1500000, "oran": 0.27},
-        {"limit": 5300000, "oran": 0.35},
-        {"limit": float('inf'), "oran": 0.40}
-    ]
-}
-
-# --- YARDIMCI FONKSİYONLAR ---
-
-def parse_turkish_float(value):
-    """Excel'den gelen Türkçe formatlı sayıları (22.104,67) float'a çevirir."""
-    if pd.isna(value) or value == '':
-        return 0.0
-    if isinstance(value, (int, float)):
-        return float(value)
-    
-    val_str = str(value).strip()
-    # Noktaları sil (binlik ayracı), virgülleri noktaya çevir (ondalık)
-    val_str = val_str.replace('.', '').replace(',', '.')
-    try:
-        return float(val_str)
-    except ValueError:
-        return 0.0
-
-def calculate_income_tax(cumulative_base, current_base):
-    """Kümülatif matraha göre gelir vergisini hesaplar."""
-    tax = 0.0
-    remaining_base = current_base
-    current_cum = cumulative_base
-
-    # Dilim mantığı (Basitleştirilmiş kümülatif hesaplama)
-    # Önceki kümülatif vergi toplamını bul, sonra (kümülatif + matrah)'ın vergisini bul ve çıkar.
-    
-    def get_tax_for_value(val):
-        t = 0
-        prev_limit = 0
-        for dilim in CONSTANTS["GELIR_VERGISI_DILIMLERI"]:
-            if val > prev_limit:
-                taxable_part = min(val, dilim["limit"]) - prev_limit
-                t += taxable_part * dilim["oran"]
-                prev_limit = dilim["limit"]
-            else:
-                break
-        return t
+import os
+from concurrent.futures import ProcessPoolExecutor
 
-    tax_before = get_tax_for_value(current_cum)
-    tax_after = get_tax_for_value(current_cum + current_base)
-    
-    return tax_after - tax_before
+from bordro import SGK_TESVIK_SECENEKLERI, rules_for_incentive, ResultCache, ScheduleMemo, file_digest, profiling
+from bordro.parsing import read_roster as read_roster_file, find_default_col, WAGE_COLUMN_KEYWORDS, NAME_COLUMN_KEYWORDS
+from bordro.pipeline import PayrollPipeline, extract_roster_columns, iter_report_chunks
+from bordro.export import EXPORT_FORMATS, export_bytes
+from bordro.scenarios import run_scenarios
+from bordro.budget import BudgetSolution, solve_raise_for_budget, solve_department_budgets
+from bordro.parallel import ParallelPayroll, default_workers, mp_context
+from bordro.slips import slip_archive_file
+from bordro.paging import PAGE_SIZES, filter_sort_rows, results_page
+from bordro.departments import DepartmentSummary
 
-def get_min_wage_exemption_2026():
-    """12 ay için Asgari Ücret GV ve DV istisnalarını hesaplar."""
-    exemptions = []
-    cum_base = 0
-    
-    gross_mw = CONSTANTS["ASGARI_UCRET_BRUT"]
-    worker_sgk = gross_mw * CONSTANTS["SGK_ISCI_ORANI"]
-    worker_unemp = gross_mw * CONSTANTS["ISSIZLIK_ISCI_ORANI"]
-    tax_base_mw = gross_mw - (worker_sgk + worker_unemp)
-    
-    for _ in range(12):
-        gv_istisna = calculate_income_tax(cum_base, tax_base_mw)
-        dv_istisna = gross_mw * CONSTANTS["DAMGA_VERGISI_ORANI"]
-        exemptions.append({"gv": gv_istisna, "dv": dv_istisna})
-        cum_base += tax_base_mw
-        
-    return exemptions
+# --- STREAMLIT ARAYÜZÜ ---
+
+st.set_page_config(page_title="2026 Maaş Maliyet Simülasyonu", layout="wide")
+
+@st.cache_resource
+def get_result_cache():
+    """Sunucu sürecindeki tüm oturumların paylaştığı önbellek (bütçe: MAAS_CACHE_MB, varsayılan 512 MB)."""
+    return ResultCache(max_bytes=int(float(os.environ.get("MAAS_CACHE_MB", 512)) * 2**20))
+
+@st.cache_resource
+def get_schedule_memo():
+    """Oturumlar arası ücret bordrosu önbelleği: aynı hedef ücret (asgari ücret, standart kademeler) bir kez hesaplanır."""
+    return ScheduleMemo()
+
+@st.cache_resource
+def get_parallel_payroll(workers):
+    """Oturumlar arası süreç havuzu (süreç sayısı başına bir tane): havuz kurulumu her hesaplamada tekrarlanmaz."""
+    return ParallelPayroll(workers=workers)
 
-MIN_WAGE_EXEMPTIONS = get_min_wage_exemption_2026()
+@st.cache_resource
+def get_slip_pool(workers):
+    """Toplu bordro arşivi için oturumlar arası süreç havuzu: her indirmede yeni süreçler başlatılmaz."""
+    return ProcessPoolExecutor(workers, mp_context=mp_context())
 
-def calculate_payroll_month(wage, calculation_type, month_idx, cumulative_tax_base):
+# Detaylı rapor indirme biçimleri (Parquet sadece pyarrow kuruluysa)
+REPORT_FORMATS = {"Excel (.xlsx)": ".xlsx", "CSV": ".csv"}
+try:
+    import pyarrow  # noqa: F401
+    REPORT_FORMATS["Parquet"] = ".parquet"
+except ImportError:
+    pass
+
+def export_cached(key, build):
+    """Dışa aktarım dosyasını (build()) bir kez oluşturur; aynı sonuç kümesi ve biçim için baytlar önbellekten döner."""
+    data = result_cache.get(key)
+    if data is None:
+        data = result_cache.put(key, build())
+    return data
+
+def profiled(build):
     """
-    Belirli bir ay için bordro hesabı yapar.
-    calculation_type: 'Brüt' (Sabit Brüt) veya 'Net' (Sabit Net)
+    İndirme dosyası üreten çağrıyı (build) ölçüm açıksa oturumun indirme profiline kaydeden çağrıya sarar.
+    İndirmeler betik bittikten sonra ayrı iş parçacığında üretildiğinden bu çalıştırmanın ölçümüne giremez.
     """
-    
-    gross_wage = 0.0
-    
-    # Eğer hesaplama NET üzerinden ise, Brüt'ü bulmak için iterasyon gerekir
-    if calculation_type == 'Net':
-        target_net = wage
-        # Basit Binary Search / Iteration ile Brüt bulma
-        low = target_net
-        high = target_net * 2.0
-        for _ in range(20): # 20 iterasyon yeterli hassasiyet sağlar
-            mid = (low + high) / 2
-            res = calculate_deductions(mid, month_idx, cumulative_tax_base)
-            if abs(res['net_pay'] - target_net) < 0.01:
-                gross_wage = mid
-                break
-            elif res['net_pay'] < target_net:
-                low = mid
-            else:
-                high = mid
-        gross_wage = mid
-    else:
-        gross_wage = wage
-
-    # Hesaplamayı yap
-    return calculate_deductions(gross_wage, month_idx, cumulative_tax_base)
+    download_profiler = st.session_state.get('download_profiler')
+    if download_profiler is None:
+        return build
 
-def calculate_deductions(gross_wage, month_idx, cumulative_tax_base):
-    # Asgari Ücret Kontrolü
-    if gross_wage < CONSTANTS["ASGARI_UCRET_BRUT"]:
-        gross_wage = CONSTANTS["ASGARI_UCRET_BRUT"]
+    def run():
+        token = profiling.activate(download_profiler)
+        try:
+            return build()
+        finally:
+            profiling.deactivate(token)
+    return run
 
-    # SGK Matrahı (Tavan/Taban)
-    sgk_base = min(max(gross_wage, CONSTANTS["SGK_TABAN"]), CONSTANTS["SGK_TAVAN"])
-    
-    # İşçi Kesintileri
-    sgk_worker = sgk_base * CONSTANTS["SGK_ISCI_ORANI"]
-    unemp_worker = sgk_base * CONSTANTS["ISSIZLIK_ISCI_ORANI"]
-    
-    # GV Matrahı
-    income_tax_base = gross_wage - (sgk_worker + unemp_worker)
-    
-    # Gelir Vergisi
-    raw_income_tax = calculate_income_tax(cumulative_tax_base, income_tax_base)
-    
-    # İstisnalar
-    exemption = MIN_WAGE_EXEMPTIONS[month_idx]
-    payable_income_tax = max(0, raw_income_tax - exemption["gv"])
-    
-    # Damga Vergisi
-    raw_stamp_tax = gross_wage * CONSTANTS["DAMGA_VERGISI_ORANI"]
-    payable_stamp_tax = max(0, raw_stamp_tax - exemption["dv"])
-    
-    # Net Ele Geçen
-    net_pay = gross_wage - (sgk_worker + unemp_worker + payable_income_tax + payable_stamp_tax)
-    
-    # İşveren Maliyeti
-    sgk_employer = sgk_base * CONSTANTS["SGK_ISVEREN_ORANI"]
-    unemp_employer = sgk_base * CONSTANTS["ISSIZLIK_ISVEREN_ORANI"]
-    
-    total_employer_cost = gross_wage + sgk_employer + unemp_employer
-    
-    return {
-        "gross_wage": gross_wage,
-        "net_pay": net_pay,
-        "sgk_worker": sgk_worker,
-        "unemp_worker": unemp_worker,
-        "income_tax_base": income_tax_base,
-        "cumulative_tax_base": cumulative_tax_base, # Kümülatif Matrah
-        "raw_income_tax": raw_income_tax, # Hesaplanan GV
-        "income_tax": payable_income_tax, # Ödenecek GV
-        "gv_exemption": exemption["gv"],  # GV İstisnası
-        "raw_stamp_tax": raw_stamp_tax,   # Hesaplanan DV
-        "stamp_tax": payable_stamp_tax,   # Ödenecek DV
-        "dv_exemption": exemption["dv"],   # DV İstisnası
-        "sgk_employer": sgk_employer,
-        "unemp_employer": unemp_employer,
-        "total_cost": total_employer_cost
-    }
+def slip_archive(block, layout, workers):
+    """Toplu bordro ZIP'ini geçici dosyaya üretip baytlarını döner; geçici dosya okununca kapatılır (silinir)."""
+    executor = get_slip_pool(workers) if workers > 1 else None
+    with slip_archive_file(block, layout, workers, executor) as archive:
+        return archive.read()
 
-# --- STREAMLIT ARAYÜZÜ ---
+def read_roster(uploaded_file):
+    """
+    Personel listesini parça parça okur (ilerleme gösterilir); aynı içerik için önbellekteki tabloyu döner.
+    İçerik özeti yükleme kimliğine (file_id) göre oturumda saklanır: dosya değişmedikçe yeniden özetlenmez.
+    """
+    upload_id, digest = st.session_state.get('roster_upload', (None, None))
+    if upload_id != uploaded_file.file_id:
+        digest = file_digest(uploaded_file.getbuffer())  # Kopyasız
+        st.session_state['roster_upload'] = (uploaded_file.file_id, digest)
+    key = ("roster", digest)
+    df = result_cache.get(key)
+    if df is None:
+        progress = st.empty()
+        uploaded_file.seek(0)
+        df = read_roster_file(
+            uploaded_file, file_name=uploaded_file.name,
+            on_progress=lambda rows: progress.caption(f"📥 {rows:,} satır okundu...")
+        )
+        progress.empty()
+        result_cache.put(key, df)
+    return df, digest
 
-st.set_page_config(page_title="2026 Maaş Maliyet Simülasyonu", layout="wide")
+result_cache = get_result_cache()
 
 st.title("📊 2026 Yılı Ücret ve İşveren Maliyeti Simülasyonu")
 st.markdown("""
@@ -191,28 +117,12 @@ with st.sidebar:
     st.subheader("SGK Teşvik Oranı")
     incentive_choice = st.radio(
         "İşveren SGK ve Teşvik Durumu Seçiniz:",
-        ("5510 - İmalat Sektörü (%5 İndirim)", "5510 - İmalat Dışı Sektörler (%2 İndirim)", "Teşviksiz / Standart (%0)")
+        tuple(SGK_TESVIK_SECENEKLERI.keys())
     )
     
-    # 2026 GÜNCELLEMESİ: İşveren Taban Oranı = %23.75 (KVSK Dahil)
-    # İşsizlik (%2) Sabit -> SGK Payı = %21.75
-    # Çarpanlar sadece SGK Payı üzerinden
-    
-    if "İmalat Sektörü" in incentive_choice:
-        # %5 Puan İndirim
-        # Toplam: 18.75% -> SGK Part: 16.75%
-        CONSTANTS["SGK_ISVEREN_ORANI"] = 0.1675 
-        current_total_rate = 18.75
-    elif "İmalat Dışı" in incentive_choice:
-        # %2 Puan İndirim (Eski %4 düştü)
-        # Toplam: 21.75% -> SGK Part: 19.75%
-        CONSTANTS["SGK_ISVEREN_ORANI"] = 0.1975
-        current_total_rate = 21.75
-    else:
-        # Teşviksiz
-        # Toplam: 23.75% -> SGK Part: 21.75%
-        CONSTANTS["SGK_ISVEREN_ORANI"] = 0.2175
-        current_total_rate = 23.75
+    # Oturuma özel kural seti (global parametreler değiştirilmez)
+    rules = rules_for_incentive(incentive_choice)
+    current_total_rate = (rules.sgk_isveren_orani + rules.issizlik_isveren_orani) * 100
     
     st.caption(f"Kullanılan Toplam İşveren Prim Oranı (SGK+İşsizlik): **%{current_total_rate:.2f}**")
     
@@ -224,6 +134,22 @@ with st.sidebar:
     calc_type_key = 'Brüt' if 'Brüt' in calc_method else 'Net'
 
     st.info(f"**Bilgi:** Mevcut maaşlara **%{raise_rate*100:.0f}** oranında artış uygulanarak 2026 maliyetleri hesaplanacaktır.")
+
+    # Sonuç süreç sayısından bağımsızdır (önbellek anahtarına girmez)
+    cpu_count = os.cpu_count() or 1
+    workers = st.number_input(
+        "Paralel Süreç Sayısı", min_value=1, max_value=cpu_count, value=min(default_workers(), cpu_count),
+        help="Büyük listelerde bordro hesabı bu kadar çekirdeğe bölünür (1: seri). Sonuçlar seri hesapla birebir aynıdır."
+    )
+
+    with st.expander("🩺 Performans Tanılama"):
+        profile_enabled = st.checkbox(
+            "Aşama sürelerini ölç", help="Her çalıştırmada aşama süreleri, satır/sn ve motor sayaçları bu menünün sonunda gösterilir."
+        )
+        profile_memory = st.checkbox(
+            "Bellek ölçümü (tracemalloc)", disabled=not profile_enabled,
+            help="Aşama başına en yüksek bellek; hesaplamayı belirgin yavaşlatır."
+        )
     
     
     
@@ -234,315 +160,433 @@ with st.sidebar:
     st.markdown("✉️ serdartasdoken@gmail.com")
     st.markdown("[LinkedIn Profili](https://www.linkedin.com/in/serdar-tasdoken/)")
 
-# --- GİRİŞ YÖNTEMİ SEÇİMİ ---
-st.divider()
-input_method = st.radio("Hesaplama Yöntemini Seçiniz:", ("📁 Excel Listesi Yükle", "✍️ Manuel Hesaplama"), horizontal=True)
-st.divider()
-
-df = None
-col_wage = "Maaş"
-col_name = "Personel"
-col_dept = "Departman"
+# Ölçüm kapalıyken aşamalar boş bağlamla geçer; açıkken bu çalıştırmanın (rerun) aşamaları kaydedilir
+profiler = profiling.Profiler(memory=profile_memory) if profile_enabled else None
+# İndirme ölçümleri oturum boyunca birikir (ölçüm kapatılınca atılır)
+if not profile_enabled:
+    st.session_state.pop('download_profiler', None)
+elif getattr(st.session_state.get('download_profiler'), "memory", None) != profile_memory:
+    st.session_state['download_profiler'] = profiling.Profiler(memory=profile_memory)
+token = profiling.activate(profiler)
+try:
+    # --- GİRİŞ YÖNTEMİ SEÇİMİ ---
+    st.divider()
+    input_method = st.radio("Hesaplama Yöntemini Seçiniz:", ("📁 Excel Listesi Yükle", "✍️ Manuel Hesaplama"), horizontal=True)
+    st.divider()
 
-if input_method == "📁 Excel Listesi Yükle":
-    # Dosya Yükleme
-    uploaded_file = st.file_uploader("Personel Listesini Yükleyiniz (Excel .xls/.xlsx)", type=["xls", "xlsx"])
+    df = None
+    roster_digest = None
+    col_wage = "Maaş"
+    col_name = "Personel"
+    col_dept = "Departman"
 
-    if uploaded_file is not None:
-        try:
-            df = pd.read_excel(uploaded_file)
+    if input_method == "📁 Excel Listesi Yükle":
+        # Dosya Yükleme
+        uploaded_file = st.file_uploader(
+            "Personel Listesini Yükleyiniz (Excel .xls/.xlsx, .csv, .parquet)", type=["xls", "xlsx", "csv", "parquet"]
+        )
 
-            # Sütun İsimlerini Temizle (Boşlukları kırp)
-            df.columns = df.columns.str.strip()
+        if uploaded_file is not None:
+            try:
+                df, roster_digest = read_roster(uploaded_file)
             
-            st.subheader("📋 Sütun Eşleştirme")
-            st.info("Lütfen Excel dosyanızdaki sütunları aşağıdaki alanlarla eşleştiriniz.")
+                st.subheader("📋 Sütun Eşleştirme")
+                st.info("Lütfen Excel dosyanızdaki sütunları aşağıdaki alanlarla eşleştiriniz.")
             
-            # Sütun Seçimi
-            all_columns = df.columns.tolist()
+                # Sütun Seçimi
+                all_columns = df.columns.tolist()
             
-            # Tahmin algoritması (default value için)
-            def find_default_col(options, keywords):
-                for col in options:
-                    for key in keywords:
-                        if key.lower() in col.lower():
-                            return col
-                return options[0] if options else None
-
-            col_wage = st.selectbox(
-                "Maaş/Ücret Sütunu (Zorunlu)", 
-                all_columns, 
-                index=all_columns.index(find_default_col(all_columns, ['ücret', 'maas', 'tutar', 'net', 'brut'])) if find_default_col(all_columns, ['ücret', 'maas', 'tutar', 'net', 'brut']) in all_columns else 0
-            )
+                # Tahmin algoritması (default value için): find_default_col
+                col_wage = st.selectbox(
+                    "Maaş/Ücret Sütunu (Zorunlu)", 
+                    all_columns, 
+                    index=all_columns.index(find_default_col(all_columns, WAGE_COLUMN_KEYWORDS)) if find_default_col(all_columns, WAGE_COLUMN_KEYWORDS) in all_columns else 0
+                )
             
-            col_name = st.selectbox(
-                "Personel Adı Sütunu (Opsiyonel)", 
-                ["Otomatik İsimlendir"] + all_columns, 
-                index=all_columns.index(find_default_col(all_columns, ['ad', 'isim', 'personel', 'calisan'])) + 1 if find_default_col(all_columns, ['ad', 'isim', 'personel', 'calisan']) in all_columns else 0
-            )
+                col_name = st.selectbox(
+                    "Personel Adı Sütunu (Opsiyonel)", 
+                    ["Otomatik İsimlendir"] + all_columns, 
+                    index=all_columns.index(find_default_col(all_columns, NAME_COLUMN_KEYWORDS)) + 1 if find_default_col(all_columns, NAME_COLUMN_KEYWORDS) in all_columns else 0
+                )
             
-            col_dept = st.selectbox(
-                "Departman Sütunu (Opsiyonel)", 
-                ["Seçiniz"] + all_columns, 
-                index=0
-            )
-        except Exception as e:
-            st.error(f"Dosya okunurken hata oluştu: {e}")
-
-else: # Manuel Giriş
-    st.subheader("✍️ Personel Bilgileri")
-    col1, col2 = st.columns(2)
-    with col1:
-        manual_wage = st.number_input("Güncel Aylık Maaş (TL)", min_value=0.0, value=30000.0, step=1000.0)
-    with col2:
-        manual_name = st.text_input("Personel Adı (Opsiyonel)", value="Yeni Personel")
-    
-    # DataFrame Oluştur
-    df = pd.DataFrame({
-        "Maaş": [manual_wage],
-        "Personel": [manual_name if manual_name else "Personel 1"],
-        "Departman": ["Genel"]
-    })
-    col_wage = "Maaş"
-    col_name = "Personel"
-    col_dept = "Departman"
+                col_dept = st.selectbox(
+                    "Departman Sütunu (Opsiyonel)", 
+                    ["Seçiniz"] + all_columns, 
+                    index=0
+                )
+            except Exception as e:
+                st.error(f"Dosya okunurken hata oluştu: {e}")
 
-if df is not None:
-    if st.button("Hesaplamayı Başlat", type="primary"):
-        st.success(f"{len(df)} personel kaydı için hesaplama başlıyor...")
+    else: # Manuel Giriş
+        st.subheader("✍️ Personel Bilgileri")
+        col1, col2 = st.columns(2)
+        with col1:
+            manual_wage = st.number_input("Güncel Aylık Maaş (TL)", min_value=0.0, value=30000.0, step=1000.0)
+        with col2:
+            manual_name = st.text_input("Personel Adı (Opsiyonel)", value="Yeni Personel")
+    
+        # DataFrame Oluştur
+        df = pd.DataFrame({
+            "Maaş": [manual_wage],
+            "Personel": [manual_name if manual_name else "Personel 1"],
+            "Departman": ["Genel"]
+        })
+        col_wage = "Maaş"
+        col_name = "Personel"
+        col_dept = "Departman"
+        roster_digest = file_digest(repr((manual_wage, manual_name)).encode())
+
+    if df is not None:
+        if st.button("Hesaplamayı Başlat", type="primary"):
+            st.success(f"{len(df)} personel kaydı için hesaplama başlıyor...")
         
-        try:
+            try:
             
-            # --- HESAPLAMA MOTORU ---
+                # --- HESAPLAMA MOTORU ---
             
-            results = []
-            detailed_payroll_data = {} # Personel Adı -> [Ay1, Ay2...] listesi
+                # Manuel modda artış uygulanmaz, direkt girilen tutar (örn: 500.000 net) hedef alınır.
+                effective_raise = 0.0 if input_method == "✍️ Manuel Hesaplama" else raise_rate
             
-            progress_bar = st.progress(0)
+                # Sadece değişen parametreden etkilenen aşamalar yeniden hesaplanır
+                pipeline = PayrollPipeline(result_cache, get_schedule_memo(), executor=get_parallel_payroll(workers))
+                results, payroll_block = pipeline.run(
+                    df, roster_digest, col_wage, col_name, col_dept,
+                    effective_raise, calc_type_key, rules, corporate_tax_rate
+                )
             
-            for index, row in df.iterrows():
-                # İlerleme çubuğu
-                progress_bar.progress((index + 1) / len(df))
-                
-                # 1. Mevcut Maaşı Al
-                raw_wage = parse_turkish_float(row.get(col_wage, 0))
-                
-                # Maaş 0 ise atla veya işlem yapma
-                if raw_wage == 0:
-                    continue
-                
-                # 2. 2026 Hedef Maaşı Belirle
-                
-                if input_method == "✍️ Manuel Hesaplama":
-                    # Manuel modda artış uygulanmaz, direkt girilen tutar (örn: 500.000 net) hedef alınır.
-                    target_wage_2026 = raw_wage
-                else:
-                    multiplier = (1 + raise_rate)
-                    target_wage_2026 = raw_wage * multiplier
-                
-                # Departman
-                dept_val = row.get(col_dept, '-') if col_dept != "Seçiniz" else '-'
-                
-                if col_name == "Otomatik İsimlendir":
-                    person_name = f"Personel {index + 1}"
+                # Sonuçları Session State'e kaydet (Sonraki etkileşimlerde kaybolmaması için)
+                st.session_state['results'] = results
+                st.session_state['payroll_block'] = payroll_block
+                st.session_state['stage_status'] = pipeline.status
+                st.session_state['result_key'] = pipeline.result_key
+                st.session_state['dedup_stats'] = pipeline.dedup_stats()
+                st.session_state['invalid_wage_rows'] = pipeline.invalid_wage_rows()
+
+            except Exception as e:
+                st.error(f"Bir hata oluştu: {e}")
+    else:
+        if input_method == "📁 Excel Listesi Yükle":
+            st.info("Lütfen sol menüden parametreleri ayarlayın ve bir Excel dosyası yükleyin.")
+
+    # --- SENARYO KARŞILAŞTIRMASI ---
+    if df is not None and input_method == "📁 Excel Listesi Yükle":
+        with st.expander("📈 Senaryo Karşılaştırması (Artış Oranı x Teşvik x Brüt/Net)"):
+            st.caption("Seçilen tüm kombinasyonlar tek seferde hesaplanır; teşvik seçenekleri aynı brüt ücretleri paylaşır.")
+            sc1, sc2, sc3 = st.columns(3)
+            min_raise = sc1.number_input("En Düşük Artış (%)", min_value=0.0, value=20.0, step=5.0)
+            max_raise = sc2.number_input("En Yüksek Artış (%)", min_value=0.0, value=50.0, step=5.0)
+            raise_step = sc3.number_input("Adım (%)", min_value=0.5, value=5.0, step=0.5)
+            scenario_incentives = st.multiselect(
+                "SGK Teşvik Durumları", list(SGK_TESVIK_SECENEKLERI), default=list(SGK_TESVIK_SECENEKLERI)
+            )
+            scenario_types = st.multiselect("Ücret Tipleri", ["Brüt", "Net"], default=["Brüt", "Net"])
+
+            if st.button("Senaryoları Hesapla"):
+                raise_rates = [
+                    round(min_raise + i * raise_step, 6) / 100.0
+                    for i in range(int((max_raise - min_raise) // raise_step) + 1)
+                ] if max_raise >= min_raise else []
+                if not (raise_rates and scenario_incentives and scenario_types):
+                    st.warning("Lütfen en az bir artış oranı, teşvik durumu ve ücret tipi seçiniz.")
                 else:
-                    person_name = row.get(col_name, f"Personel {index + 1}")
-
-                # 3. Yıllık Simülasyon
-                emp_results = {
-                    "Personel": person_name,
-                    "Departman": dept_val,
-                    "Mevcut Ücret": raw_wage,
-                    "2026 Hedef Ücret": target_wage_2026,
-                    "Ücret Tipi": calc_type_key
-                }
-                
-                yearly_total_cost = 0.0
-                cum_tax_base = 0.0
-                
-                # Yıllık Toplamları Tutacak Değişkenler
-                year_net_pay = 0.0
-                year_sgk_worker = 0.0
-                year_sgk_employer = 0.0
-                year_income_tax = 0.0
-                year_stamp_tax = 0.0
-                
-                person_monthly_list = []
-                
-                for month in range(12):
-                    res = calculate_payroll_month(target_wage_2026, calc_type_key, month, cum_tax_base)
-                    
-                    # Kümülatifi güncelle
-                    cum_tax_base += res['income_tax_base']
-                    yearly_total_cost += res['total_cost']
-                    
-                    # Detayları topla
-                    year_net_pay += res['net_pay']
-                    year_sgk_worker += res['sgk_worker']
-                    year_sgk_employer += res['sgk_employer']
-                    year_income_tax += res['income_tax']
-                    year_stamp_tax += res['stamp_tax']
-                    
-                    # Aylık verileri kaydet
-                    emp_results[f"Ay_{month+1}_Maliyet"] = res['total_cost']
-                    emp_results[f"Ay_{month+1}_Net"] = res['net_pay']
-                    emp_results[f"Ay_{month+1}_Brut"] = res['gross_wage']
-                    
-                    # Detaylı liste için kaydet
-                    res['month_name'] = ["Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran", "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"][month]
-                    person_monthly_list.append(res)
-
-                emp_results["Toplam_Yillik_Maliyet"] = yearly_total_cost
-                emp_results["Yillik_Net_Ucret"] = year_net_pay
-                emp_results["Yillik_SGK_Isci"] = year_sgk_worker
-                emp_results["Yillik_SGK_Isveren"] = year_sgk_employer
-                emp_results["Yillik_Gelir_Vergisi"] = year_income_tax
-                emp_results["Yillik_Damga_Vergisi"] = year_stamp_tax
-                
-                emp_results["Kurumlar_Vergisi_Tasarrufu"] = yearly_total_cost * corporate_tax_rate
-                emp_results["Net_Isveren_Maliyeti"] = yearly_total_cost - emp_results["Kurumlar_Vergisi_Tasarrufu"]
-                
-                results.append(emp_results)
-                detailed_payroll_data[person_name] = person_monthly_list
-            
-            # Sonuçları Session State'e kaydet (Sonraki etkileşimlerde kaybolmaması için)
-            st.session_state['results'] = results
-            st.session_state['detailed_payroll_data'] = detailed_payroll_data
+                    scenario_key = (
+                        "scenarios", roster_digest, col_wage, tuple(raise_rates), tuple(scenario_incentives),
+                        tuple(scenario_types), corporate_tax_rate
+                    )
+                    scenario_table = result_cache.get(scenario_key)
+                    if scenario_table is None:
+                        raw_wages = extract_roster_columns(df, col_wage, "Otomatik İsimlendir", "Seçiniz")["raw_wages"]
+                        scenario_table = result_cache.put(scenario_key, run_scenarios(
+                            raw_wages, raise_rates, scenario_incentives, scenario_types, corporate_tax_rate
+                        ))
+                    st.session_state['scenario_table'] = (roster_digest, scenario_table)
 
-        except Exception as e:
-            st.error(f"Bir hata oluştu: {e}")
-else:
-    if input_method == "📁 Excel Listesi Yükle":
-        st.info("Lütfen sol menüden parametreleri ayarlayın ve bir Excel dosyası yükleyin.")
+            # Sadece yüklü listeye ait son karşılaştırma gösterilir
+            scenario_digest, scenario_table = st.session_state.get('scenario_table', (None, None))
+            if scenario_table is not None and scenario_digest == roster_digest:
+                money_cols = ["Toplam_Yillik_Maliyet", "Kurumlar_Vergisi_Tasarrufu", "Net_Isveren_Maliyeti"]
+                st.dataframe(scenario_table.style.format({"Artış Oranı (%)": "{:.1f}", **{c: "{:,.2f}" for c in money_cols}}))
+                chart = scenario_table.assign(
+                    Senaryo=scenario_table["Teşvik"] + " · " + scenario_table["Ücret Tipi"]
+                ).pivot(index="Artış Oranı (%)", columns="Senaryo", values="Net_Isveren_Maliyeti")
+                st.caption("Vergi sonrası net işveren maliyeti (TL)")
+                st.line_chart(chart)
+
+        # --- BÜTÇE ÇÖZÜCÜ ---
+        with st.expander("💰 Bütçe Çözücü (Hedef Maliyete Göre Artış Oranı)"):
+            st.caption(
+                f"Kenar çubuğundaki teşvik durumu ve hesaplama yöntemi (**{calc_type_key}**) ile, hedef toplama ulaşan "
+                "tek tip artış oranı birkaç tam liste hesabıyla bulunur."
+            )
+            budget_metric_label = st.radio(
+                "Hedef", ("Toplam Yıllık İşveren Maliyeti", "Vergi Sonrası Net Maliyet"), horizontal=True
+            )
+            budget_metric = (
+                "Toplam_Yillik_Maliyet" if budget_metric_label == "Toplam Yıllık İşveren Maliyeti" else "Net_Isveren_Maliyeti"
+            )
+            by_department = col_dept != "Seçiniz" and st.checkbox("Departman bazında hedef gir")
+
+            if by_department:
+                # Sadece departman sütunu okunur; maaşlar "Artış Oranını Bul" tıklanınca ayrıştırılır
+                departments_key = ("budget_departments", roster_digest, col_dept)
+                departments = result_cache.get(departments_key)
+                if departments is None:
+                    departments = result_cache.put(departments_key, sorted(df[col_dept].astype(str).unique()))
+                target_editor = st.data_editor(
+                    pd.DataFrame({"Departman": departments, "Hedef (TL)": [0.0] * len(departments)}),
+                    disabled=["Departman"], hide_index=True
+                )
+            else:
+                budget_target = st.number_input("Hedef Tutar (TL)", min_value=0.0, value=0.0, step=1_000_000.0)
+
+            if st.button("Artış Oranını Bul"):
+                budget_key = ("budget_roster", roster_digest, col_wage, col_dept)
+                roster_for_budget = result_cache.get(budget_key)
+                if roster_for_budget is None:
+                    roster_columns = extract_roster_columns(df, col_wage, "Otomatik İsimlendir", col_dept)
+                    roster_for_budget = result_cache.put(budget_key, {
+                        "raw_wages": roster_columns["raw_wages"], "dept_vals": roster_columns["dept_vals"]
+                    })
+                try:
+                    if by_department:
+                        targets = {
+                            row["Departman"]: row["Hedef (TL)"]
+                            for _, row in target_editor.iterrows() if row["Hedef (TL)"] > 0
+                        }
+                        budget_result = solve_department_budgets(
+                            roster_for_budget["raw_wages"], roster_for_budget["dept_vals"], targets, calc_type_key,
+                            rules, corporate_tax_rate, budget_metric
+                        )
+                    else:
+                        budget_result = solve_raise_for_budget(
+                            roster_for_budget["raw_wages"], budget_target, calc_type_key, rules, corporate_tax_rate,
+                            budget_metric
+                        )
+                    st.session_state['budget_result'] = (roster_digest, budget_result)
+                except ValueError as e:
+                    st.session_state.pop('budget_result', None)
+                    st.error(str(e))
+
+            budget_digest, budget_result = st.session_state.get('budget_result', (None, None))
+            if budget_result is not None and budget_digest == roster_digest:
+                if isinstance(budget_result, BudgetSolution):
+                    st.success(
+                        f"Gerekli artış oranı: **%{budget_result.raise_rate * 100:.4f}** "
+                        f"({budget_result.achieved:,.2f} TL, {budget_result.evaluations} tam liste hesabı)"
+                    )
+                else:
+                    st.dataframe(budget_result.style.format({
+                        "Hedef": "{:,.2f}", "Ulaşılan": "{:,.2f}", "Artış Oranı (%)": "{:.4f}"
+                    }, na_rep="-"))
+                st.caption("Bulunan oranı kenar çubuğundaki **Maaş Artış Oranı** alanına girerek detaylı hesaplama yapabilirsiniz.")
             
-# --- SONUÇLARIN GÖSTERİMİ (Session State'den oku) ---
+    # --- SONUÇLARIN GÖSTERİMİ (Session State'den oku) ---
 
-if 'results' in st.session_state and st.session_state['results']:
-    results = st.session_state['results']
-    res_df = pd.DataFrame(results)
-    detailed_data = st.session_state['detailed_payroll_data']
-    
-    # 1. Özet Metrikler
-    total_cost_all = res_df["Toplam_Yillik_Maliyet"].sum()
-    total_tax_saving = res_df["Kurumlar_Vergisi_Tasarrufu"].sum()
-    net_cost_all = res_df["Net_Isveren_Maliyeti"].sum()
-    
-    st.divider()
-    col1, col2, col3 = st.columns(3)
-    col1.metric("Toplam Yıllık İşveren Maliyeti (2026)", f"{total_cost_all:,.2f} TL")
-    col2.metric("Toplam Kurumlar Vergisi Avantajı", f"{total_tax_saving:,.2f} TL")
-    col3.metric("Vergi Sonrası Net Maliyet", f"{net_cost_all:,.2f} TL")
-    st.divider()
-    
-    # 2. Detaylı Tablo
-    st.subheader("Personel Bazlı Detaylar")
-    
-    display_cols = [
-        "Personel", "Mevcut Ücret", "2026 Hedef Ücret", 
-        "Yillik_Net_Ucret", "Yillik_SGK_Isveren", "Toplam_Yillik_Maliyet"
-    ]
-    
-    st.dataframe(res_df[display_cols].style.format({
-        "Mevcut Ücret": "{:,.2f}", 
-        "2026 Hedef Ücret": "{:,.2f}",
-        "Yillik_Net_Ucret": "{:,.2f}",
-        "Yillik_SGK_Isveren": "{:,.2f}",
-        "Toplam_Yillik_Maliyet": "{:,.2f}"
-    }))
-    
-    # 3. Excel İndirme
-    st.subheader("Rapor İndir")
-    
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        res_df.to_excel(writer, index=False, sheet_name='2026_Maliyet_Simulasyonu')
+    if 'results' in st.session_state and len(st.session_state['results']):
+        res_df = st.session_state['results']
+        payroll_block = st.session_state['payroll_block']
+        result_key = st.session_state['result_key']
+    
+        # 1. Özet Metrikler
+        total_cost_all = res_df["Toplam_Yillik_Maliyet"].sum()
+        total_tax_saving = res_df["Kurumlar_Vergisi_Tasarrufu"].sum()
+        net_cost_all = res_df["Net_Isveren_Maliyeti"].sum()
+    
+        stage_status = st.session_state.get('stage_status')
+        if stage_status:
+            st.caption("Hesaplama aşamaları: " + " → ".join(
+                f"{PayrollPipeline.STAGE_LABELS[name]} {'⚙️' if stage_status[name] == 'computed' else '♻️'}"
+                for name in PayrollPipeline.STAGES
+            ) + "  (⚙️ yeniden hesaplandı, ♻️ önbellekten)")
+        dedup_stats = st.session_state.get('dedup_stats')
+        if dedup_stats and dedup_stats.rows > 1:
+            st.caption(
+                f"Tekilleştirme: {dedup_stats.rows:,} personel → {dedup_stats.unique:,} farklı hedef ücret, "
+                f"{dedup_stats.memo_hits:,} tanesi önbellekten; bordro motoru {dedup_stats.computed:,} kez çalıştı "
+                f"(**{dedup_stats.ratio:.1f}x** daha az iş)"
+            )
     
-    st.download_button(
-        label="📥 Detaylı Excel Raporunu İndir",
-        data=output.getvalue(),
-        file_name="2026_Maas_Maliyet_Simulasyonu.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
+        invalid_wage_rows = st.session_state.get('invalid_wage_rows')
+        if invalid_wage_rows:
+            # Excel satır numarası: başlık 1. satır, veriler 2. satırdan başlar
+            shown = ", ".join(f"Satır {i + 2} ('{value}')" for i, value in invalid_wage_rows[:20])
+            more = f" ve {len(invalid_wage_rows) - 20} satır daha" if len(invalid_wage_rows) > 20 else ""
+            st.warning(f"⚠️ {len(invalid_wage_rows)} satırda maaş değeri okunamadı ve hesaplamaya alınmadı: {shown}{more}")
+    
+        st.divider()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Toplam Yıllık İşveren Maliyeti (2026)", f"{total_cost_all:,.2f} TL")
+        col2.metric("Toplam Kurumlar Vergisi Avantajı", f"{total_tax_saving:,.2f} TL")
+        col3.metric("Vergi Sonrası Net Maliyet", f"{net_cost_all:,.2f} TL")
+        st.divider()
+    
+        # 2. Detaylı Tablo
+        st.subheader("Personel Bazlı Detaylar")
+    
+        display_cols = [
+            "Personel", "Mevcut Ücret", "2026 Hedef Ücret", 
+            "Yillik_Net_Ucret", "Yillik_SGK_Isveren", "Toplam_Yillik_Maliyet"
+        ]
+    
+        # Filtre, sıralama ve sayfalama sunucuda yapılır; sadece görünen sayfa biçimlendirilip gönderilir
+        filter_cols = st.columns([2, 2, 2, 1])
+        name_query = filter_cols[0].text_input("İsim Ara")
+        dept_options = sorted({str(dept) for dept in res_df["Departman"].unique()})
+        departments = filter_cols[1].multiselect("Departman", dept_options) if len(dept_options) > 1 else []
+        sort_by = filter_cols[2].selectbox("Sırala", ["Liste sırası"] + display_cols)
+        descending = filter_cols[3].toggle("Azalan", value=True)
+    
+        view_key = ("view", name_query, tuple(departments), sort_by, descending) + result_key
+        view_rows = result_cache.get(view_key)
+        if view_rows is None:
+            with profiling.stage("Filtre / Sıralama", rows=len(res_df)):
+                view_rows = result_cache.put(view_key, filter_sort_rows(
+                    res_df, name_query, departments, None if sort_by == "Liste sırası" else sort_by, descending
+                ))
+    
+        page_cols = st.columns([1, 1, 4])
+        page_size = page_cols[0].selectbox("Satır/Sayfa", PAGE_SIZES, index=1)
+        page_count = max(-(-len(view_rows) // page_size), 1)
+        page_number = page_cols[1].number_input("Sayfa", min_value=1, max_value=page_count, value=1)
+        result_page = results_page(res_df, view_rows, page_number - 1, page_size)
+        page_cols[2].caption(
+            f"{result_page.rows:,} / {len(res_df):,} personel · Sayfa {result_page.page + 1} / {result_page.pages}"
+        )
+    
+        with profiling.stage("Tablo Görüntüleme", rows=len(result_page.table)):
+            st.dataframe(result_page.table[display_cols].style.format({
+                "Mevcut Ücret": "{:,.2f}", 
+                "2026 Hedef Ücret": "{:,.2f}",
+                "Yillik_Net_Ucret": "{:,.2f}",
+                "Yillik_SGK_Isveren": "{:,.2f}",
+                "Toplam_Yillik_Maliyet": "{:,.2f}"
+            }))
+    
+        # Departman özeti sonuçla birlikte bir kez hesaplanır; departman seçimi sadece küçük özet dizisini okur
+        department_key = ("departments",) + result_key
+        department_summary = result_cache.get(department_key)
+        if department_summary is None:
+            with profiling.stage("Departman Özeti", rows=len(res_df)):
+                department_summary = result_cache.put(department_key, DepartmentSummary(res_df, payroll_block))
+    
+        if len(department_summary) > 1:
+            st.subheader("🏢 Departman Analizi")
+            department_table = department_summary.yearly_table()
+            st.dataframe(
+                department_table.style.format({col: "{:,.2f}" for col in department_table.columns[2:]}),
+                hide_index=True
+            )
+            chart_cols = st.columns(2)
+            chart_cols[0].caption("Yıllık Toplam Maliyet")
+            chart_cols[0].bar_chart(department_table.set_index("Departman")["Toplam_Yillik_Maliyet"])
+            chart_cols[1].caption("Aylık Toplam Maliyet")
+            chart_cols[1].line_chart(department_summary.month_table("total_cost"))
+        
+            selected_department = st.selectbox("Departman Detayı", department_table["Departman"])
+            department_months = department_summary.department_table(selected_department)
+            st.dataframe(
+                department_months.style.format({col: "{:,.2f}" for col in department_months.columns if col != "Ay"}),
+                hide_index=True
+            )
     
-    # --- 4. PERSONEL BAZLI DETAYLI BORDRO (YENİ) ---
-    st.markdown("---")
-    st.header("📄 Personel Bazlı Detaylı Bordro")
-    st.info("Aşağıdan bir personel seçerek aylık detaylı brütten nete hesap pusulasını görüntüleyebilirsiniz.")
+        # 3. Excel İndirme
+        st.subheader("Rapor İndir")
     
-    selected_person = st.selectbox("Personel Seçiniz:", list(detailed_data.keys()))
+        report_format = st.radio(
+            "Biçim", tuple(REPORT_FORMATS), horizontal=True,
+            help="Çok büyük listelerde CSV veya Parquet daha hızlı oluşturulur ve daha küçüktür."
+        )
+        report_suffix = REPORT_FORMATS[report_format]
     
-    if selected_person:
-        months_data = detailed_data[selected_person]
-        
-        # Veriyi kullanıcı formatına uygun hale getir
-        # İstenen Kolonlar: 
-        # Ay | Brüt | SGK İşçi | İşsizlik İşçi | GV Matrahı | Kümülatif Matrah | Hesaplanan GV | GV İstisnası | Asgari GV İstisna?? | DV | DV İstisna | Net | SGK İşveren | İşsizlik İşveren | Toplam Maliyet
-        
-        payroll_rows = []
-        totals = {k: 0.0 for k in ["gross_wage", "sgk_worker", "unemp_worker", "income_tax_base", "raw_income_tax", "gv_exemption", "income_tax", "raw_stamp_tax", "dv_exemption", "stamp_tax", "net_pay", "sgk_employer", "unemp_employer", "total_cost"]}
-        
-        for m_item in months_data:
-            row = {
-                "Ay": m_item['month_name'],
-                "Brüt Ücret": m_item['gross_wage'],
-                "SGK İşçi": m_item['sgk_worker'],
-                "İşsizlik İşçi": m_item['unemp_worker'],
-                "GV Matrahı": m_item['income_tax_base'],
-                "Kümülatif GV Matrahı": m_item['cumulative_tax_base'], # Bunun toplamı olmaz
-                "Hesaplanan GV": m_item['raw_income_tax'],
-                "GV İstisnası": m_item['gv_exemption'],
-                "Ödenecek GV": m_item['income_tax'],
-                "Hesaplanan DV": m_item['raw_stamp_tax'],
-                "DV İstisnası": m_item['dv_exemption'],
-                "Ödenecek DV": m_item['stamp_tax'],
-                "Net Ele Geçen": m_item['net_pay'],
-                "SGK İşveren": m_item['sgk_employer'],
-                "İşsizlik İşveren": m_item['unemp_employer'],
-                "Toplam Maliyet": m_item['total_cost']
-            }
-            payroll_rows.append(row)
-            
-            # Toplamları güncelle
-            for k in totals.keys():
-                if k in m_item:
-                    totals[k] += m_item[k]
-        
-        # Toplam Satırı Ekle
-        total_row = {
-            "Ay": "TOPLAM",
-            "Brüt Ücret": totals['gross_wage'],
-            "SGK İşçi": totals['sgk_worker'],
-            "İşsizlik İşçi": totals['unemp_worker'],
-            "GV Matrahı": totals['income_tax_base'],
-            "Kümülatif GV Matrahı": 0, # Anlamsız
-            "Hesaplanan GV": totals['raw_income_tax'],
-            "GV İstisnası": totals['gv_exemption'],
-            "Ödenecek GV": totals['income_tax'],
-            "Hesaplanan DV": totals['raw_stamp_tax'],
-            "DV İstisnası": totals['dv_exemption'],
-            "Ödenecek DV": totals['stamp_tax'],
-            "Net Ele Geçen": totals['net_pay'],
-            "SGK İşveren": totals['sgk_employer'],
-            "İşsizlik İşveren": totals['unemp_employer'],
-            "Toplam Maliyet": totals['total_cost']
-        }
-        payroll_rows.append(total_row)
-        
-        payroll_df = pd.DataFrame(payroll_rows)
-        
-        # Formatlama
-        format_dict = {col: "{:,.2f}" for col in payroll_df.columns if col != "Ay"}
+        st.download_button(
+            label="📥 Detaylı Raporu İndir",
+            # Dosya sadece indirme istendiğinde oluşturulur; aynı sonuç kümesi için önbellekten gelir
+            data=profiled(lambda: export_cached(
+                ("report", report_suffix) + result_key,
+                lambda: export_bytes(iter_report_chunks(res_df, payroll_block), report_suffix)
+            )),
+            file_name=f"2026_Maas_Maliyet_Simulasyonu{report_suffix}",
+            mime=EXPORT_FORMATS[report_suffix],
+            on_click="ignore"
+        )
+    
+        # --- 4. PERSONEL BAZLI DETAYLI BORDRO (YENİ) ---
+        st.markdown("---")
+        st.header("📄 Personel Bazlı Detaylı Bordro")
+        st.info("Aşağıdan bir personel seçerek aylık detaylı brütten nete hesap pusulasını görüntüleyebilirsiniz.")
+    
+        # Aynı isimli personeller ayrı seçenek olarak listelenir ("Ad (2)")
+        selected_person = st.selectbox("Personel Seçiniz:", payroll_block.labels)
+    
+        if selected_person:
+            # Kişi tablosu sadece seçilen personel için bloktan oluşturulur
+            payroll_df = payroll_block.person_table(payroll_block.index[selected_person])
         
-        st.dataframe(payroll_df.style.format(format_dict))
+            # Formatlama
+            format_dict = {col: "{:,.2f}" for col in payroll_df.columns if col != "Ay"}
         
-        # Excel İndir (Seçili Personel)
-        p_output = io.BytesIO()
-        with pd.ExcelWriter(p_output, engine='openpyxl') as writer:
-            payroll_df.to_excel(writer, index=False, sheet_name=f'{selected_person[:30]}')
+            st.dataframe(payroll_df.style.format(format_dict))
         
+            # Excel İndir (Seçili Personel): sadece tıklandığında oluşturulur
+            st.download_button(
+                label=f"📥 {selected_person} - Detaylı Bordrosunu İndir",
+                data=profiled(lambda: export_cached(
+                    ("person", selected_person) + result_key,
+                    lambda: export_bytes([payroll_df], ".xlsx", sheet_name=selected_person[:30])
+                )),
+                file_name=f"Bordro_{selected_person}.xlsx",
+                mime=EXPORT_FORMATS[".xlsx"],
+                on_click="ignore"
+            )
+    
+        # Toplu bordro: tüm personelin pusulaları tek ZIP. Tıklanınca seçili süreç sayısıyla geçici dosyaya üretilir;
+        # arşiv önbelleğe alınmaz (boyutu personel sayısıyla büyür, indirme sırasında bir kez bellekte tutulur)
+        slip_layout = st.radio(
+            "Toplu bordro düzeni", ("Kişi başına ayrı Excel dosyası", "Çok sayfalı Excel kitapları (100 kişi/kitap)"),
+            horizontal=True
+        )
+        slip_layout = "kisi" if slip_layout.startswith("Kişi") else "sayfa"
         st.download_button(
-            label=f"📥 {selected_person} - Detaylı Bordrosunu İndir",
-            data=p_output.getvalue(),
-            file_name=f"Bordro_{selected_person}.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
\ No newline at end of file
+            label=f"📦 Tüm Personelin Bordrolarını İndir ({len(payroll_block):,} kişi, ZIP)",
+            data=profiled(lambda: slip_archive(payroll_block, slip_layout, workers)),
+            file_name="2026_Personel_Bordrolari.zip",
+            mime="application/zip",
+            on_click="ignore"
+        )
+
+    # --- ÖNBELLEK DURUMU ---
+    with st.sidebar:
+        cache_stats = result_cache.stats()
+        with st.expander("🗄️ Önbellek Durumu"):
+            st.caption(
+                f"İsabet: **{cache_stats['hits']}** · Iskalama: **{cache_stats['misses']}** "
+                f"(İsabet oranı %{cache_stats['hit_rate'] * 100:.0f})"
+            )
+            st.caption(
+                f"Kayıt: **{cache_stats['entries']}** · Kullanım: **{cache_stats['bytes'] / 2**20:,.1f} MB** / "
+                f"{cache_stats['max_bytes'] / 2**20:,.0f} MB · Atılan: {cache_stats['evictions']}"
+            )
+finally:
+    # Ölçüm sadece bu çalıştırmayı kapsar; betik iş parçacığında sonraki çalıştırmalara taşınmaz
+    profiling.deactivate(token)
+
+# --- PERFORMANS ÖLÇÜMÜ ---
+if profiler is not None:
+    with st.sidebar:
+        with st.expander("🩺 Bu Çalıştırmanın Ölçümü", expanded=True):
+            profile = profiler.to_dict()
+            st.caption(
+                f"Toplam: **{profile['total_seconds']:,.3f} sn** · En yüksek RSS: **{profile['max_rss_mb'] or 0:,.0f} MB**"
+            )
+            if profile["stages"]:
+                st.dataframe(profiler.table(), hide_index=True)
+            for name, count in profile["counters"].items():
+                st.caption(f"{name}: **{count:,}**")
+            st.download_button(
+                "📥 Ölçümü İndir (JSON)", data=profiler.to_json(indent=2), file_name="maas_profil.json",
+                mime="application/json", on_click="ignore"
+            )
+            download_profiler = st.session_state['download_profiler']
+            if download_profiler.stages:
+                st.caption("İndirmeler (oturum boyunca, tıklamadan sonraki çalıştırmada güncellenir):")
+                st.dataframe(download_profiler.table(), hide_index=True)
@@ -0,0 +1,47 @@
+"""Vektörel (tüm liste x 12 ay) motorun skaler motorla birebir karşılaştırılması."""
+import numpy as np
+import pytest
+
+from bordro import (
+    DEFAULT_RULES, PAYROLL_FIELDS, SGK_TESVIK_SECENEKLERI, calculate_payroll_batch, calculate_payroll_month,
+    rules_for_incentive
+)
+
+def _roster(seed, n=200):
+    """Asgari ücret, SGK tavanı üstü ve tüm GV dilimlerini gezen ücretler; karışık Brüt/Net."""
+    rng = np.random.default_rng(seed)
+    wages = np.round(rng.uniform(10_000, 600_000, n), 2)
+    wages[:10] = DEFAULT_RULES.asgari_ucret_brut
+    wages[10:15] = DEFAULT_RULES.asgari_ucret_net
+    types = np.where(rng.random(n) < 0.5, "Net", "Brüt")
+    return wages, types
+
+def _scalar_payroll(wage, calc_type, rules):
+    """Skaler motorla 12 ay (kümülatif matrah aydan aya taşınır): {alan: (12,)}."""
+    months = []
+    cumulative = 0.0
+    for month in range(12):
+        result = calculate_payroll_month(wage, calc_type, month, cumulative, rules)
+        cumulative += result["income_tax_base"]
+        months.append(result)
+    return {field: np.array([result[field] for result in months]) for field in PAYROLL_FIELDS}
+
+@pytest.mark.parametrize("incentive", list(SGK_TESVIK_SECENEKLERI))
+def test_batch_equals_scalar(incentive):
+    rules = rules_for_incentive(incentive)
+    wages, types = _roster(seed=1)
+    batch = calculate_payroll_batch(wages, types, rules)
+    for i, (wage, calc_type) in enumerate(zip(wages, types)):
+        expected = _scalar_payroll(wage, calc_type, rules)
+        for field in PAYROLL_FIELDS:
+            np.testing.assert_array_equal(batch[field][i], expected[field], err_msg=f"{field} satır {i}")
+
+@pytest.mark.parametrize("calc_type", ["Brüt", "Net"])
+def test_single_calc_type(calc_type):
+    wages, _ = _roster(seed=2, n=50)
+    batch = calculate_payroll_batch(wages, calc_type)
+    assert all(batch[field].shape == (len(wages), 12) for field in PAYROLL_FIELDS)
+    for i, wage in enumerate(wages):
+        expected = _scalar_payroll(wage, calc_type, DEFAULT_RULES)
+        np.testing.assert_array_equal(batch["net_pay"][i], expected["net_pay"])
+        np.testing.assert_array_equal(batch["total_cost"][i], expected["total_cost"])
@@ -0,0 +1,38 @@
+"""Bütçe çözücü: bulunan oranın hedefi sağlaması ve hata mesajları."""
+import numpy as np
+import pytest
+
+from bordro import DEFAULT_RULES, solve_department_budgets, solve_raise_for_budget
+from bordro.budget import yearly_cost_total
+
+WAGES = np.round(np.linspace(30_000, 250_000, 100), 2)
+
+@pytest.mark.parametrize("calc_type", ["Brüt", "Net"])
+@pytest.mark.parametrize("metric, corporate_tax_rate", [("Toplam_Yillik_Maliyet", 0.0), ("Net_Isveren_Maliyeti", 0.25)])
+def test_solution_meets_target(calc_type, metric, corporate_tax_rate):
+    base = yearly_cost_total(WAGES, 0.0, calc_type, DEFAULT_RULES)
+    scale = 1 - corporate_tax_rate if metric == "Net_Isveren_Maliyeti" else 1.0
+    target = base * scale * 1.35
+    solution = solve_raise_for_budget(WAGES, target, calc_type, DEFAULT_RULES, corporate_tax_rate, metric)
+    assert abs(solution.achieved - target) <= 1.0
+    achieved = yearly_cost_total(WAGES, solution.raise_rate, calc_type, DEFAULT_RULES) * scale
+    assert abs(achieved - target) <= 1.0
+
+def test_target_below_cost_without_raise():
+    with pytest.raises(ValueError, match="artışsız maliyetin"):
+        solve_raise_for_budget(WAGES, 1.0, "Brüt", DEFAULT_RULES)
+
+def test_empty_roster():
+    with pytest.raises(ValueError, match="personel yok"):
+        solve_raise_for_budget(np.array([]), 1_000_000.0, "Brüt", DEFAULT_RULES)
+
+def test_net_cost_with_full_corporate_tax():
+    with pytest.raises(ValueError, match="artış oranından bağımsızdır"):
+        solve_raise_for_budget(WAGES, 1_000_000.0, "Brüt", DEFAULT_RULES, 1.0, "Net_Isveren_Maliyeti")
+
+def test_department_budgets_report_unreachable_targets():
+    departments = np.where(np.arange(len(WAGES)) % 2, "A", "B")
+    base_a = yearly_cost_total(WAGES[departments == "A"], 0.0, "Brüt", DEFAULT_RULES)
+    table = solve_department_budgets(WAGES, departments, {"A": base_a * 1.2, "B": 1.0}, "Brüt", DEFAULT_RULES)
+    assert table["Durum"][0] == "Tamam" and table["Durum"][1] != "Tamam"
+    assert abs(table["Ulaşılan"][0] - base_a * 1.2) <= 1.0
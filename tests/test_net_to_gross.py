@@ -0,0 +1,65 @@
+"""Netten brüte kapalı form çözümün eski ikili aramayla karşılaştırılması."""
+import numpy as np
+import pytest
+
+from bordro import (
+    DEFAULT_RULES, SGK_TESVIK_SECENEKLERI, calculate_deductions, calculate_deductions_batch, find_gross_wage_bisection,
+    rules_for_incentive, solve_gross_for_net, solve_gross_for_net_batch
+)
+
+NET_TOLERANCE = 0.01  # İkili aramanın durma ölçütü (TL, net)
+
+def _cases(seed, n=300):
+    """Rastgele net hedefler (asgari ücret netinden yüksek ücretlere) ve tüm dilimleri gezen kümülatif matrahlar."""
+    rng = np.random.default_rng(seed)
+    targets = np.round(rng.uniform(DEFAULT_RULES.asgari_ucret_net, 400_000, n), 2)
+    bases = np.round(rng.uniform(0, 6_000_000, n), 2)
+    bases[: n // 4] = 0.0
+    months = rng.integers(0, 12, n)
+    return targets, bases, months
+
+def _bisection_tolerance(target):
+    """
+    İkili arama net farkı 0.01'in altına inince ya da 20 adımda durur: brüt farkı en fazla
+    0.01 / (en küçük net/brüt eğimi) artı son aralık genişliği (hedef / 2**20) kadardır.
+    """
+    return NET_TOLERANCE / 0.5 + target / 2**20
+
+@pytest.mark.parametrize("incentive", list(SGK_TESVIK_SECENEKLERI))
+def test_matches_bisection(incentive):
+    rules = rules_for_incentive(incentive)
+    targets, bases, months = _cases(seed=2026)
+    expected = np.array([
+        find_gross_wage_bisection(target, month, base, rules) for target, base, month in zip(targets, bases, months)
+    ])
+    scalar = np.array([
+        solve_gross_for_net(target, month, base, rules) for target, base, month in zip(targets, bases, months)
+    ])
+    batch = np.empty_like(scalar)
+    for month in range(12):
+        rows = months == month
+        batch[rows] = solve_gross_for_net_batch(targets[rows], month, bases[rows], rules)
+    tolerance = _bisection_tolerance(targets)
+    assert np.all(np.abs(scalar - expected) <= tolerance)
+    assert np.all(np.abs(batch - expected) <= tolerance)
+
+def test_net_of_solved_gross_equals_target():
+    targets, bases, months = _cases(seed=7)
+    for month in range(12):
+        rows = months == month
+        gross = solve_gross_for_net_batch(targets[rows], month, bases[rows])
+        net = calculate_deductions_batch(gross, month, bases[rows])["net_pay"]
+        np.testing.assert_allclose(net, targets[rows], rtol=0, atol=NET_TOLERANCE)
+        for target, base in zip(targets[rows], bases[rows]):
+            scalar_net = calculate_deductions(solve_gross_for_net(target, month, base), month, base)["net_pay"]
+            assert abs(scalar_net - target) <= NET_TOLERANCE
+
+def test_scalar_equals_batch():
+    targets, bases, months = _cases(seed=11)
+    # Asgari ücret netinin altındaki hedefler asgari ücrete sabitlenir
+    targets[:10] = np.linspace(1.0, DEFAULT_RULES.asgari_ucret_net, 10)
+    for month in range(12):
+        rows = months == month
+        batch = solve_gross_for_net_batch(targets[rows], month, bases[rows])
+        scalar = [solve_gross_for_net(target, month, base) for target, base in zip(targets[rows], bases[rows])]
+        np.testing.assert_allclose(batch, scalar, rtol=1e-12, atol=1e-9)
@@ -0,0 +1,50 @@
+"""Maaş sütununun vektörel ayrıştırılması ve biçim tespiti."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from bordro import parse_number_column, parse_turkish_float
+
+@pytest.mark.parametrize("values, expected, number_format", [
+    (["22.104,67", "1.234", "33.030,00", "500"], [22104.67, 1234.0, 33030.0, 500.0], "tr"),
+    (["22104.67", "1234.5", "33030", "0.5"], [22104.67, 1234.5, 33030.0, 0.5], "plain"),
+    # Belirsiz "1.234" iki biçime de uyar; tek başına Türkçe (binlik ayracı) okunur
+    (["1.234", "2.500"], [1234.0, 2500.0], "tr"),
+    # Belirgin düz hücreler çoğunluktaysa belirsiz metin de ondalık nokta ile okunur
+    (["22104.67", "1.234", "500.5"], [22104.67, 1.234, 500.5], "plain"),
+    (["22.104,67", "22104.67", "1.234", "45.000,5"], [22104.67, 22104.67, 1234.0, 45000.5], "mixed"),
+])
+def test_formats(values, expected, number_format):
+    parsed = parse_number_column(pd.Series(values))
+    np.testing.assert_array_equal(parsed.values, expected)
+    assert parsed.number_format == number_format
+    assert parsed.invalid_rows == []
+
+def test_blanks_are_zero_and_invalid_rows_reported():
+    parsed = parse_number_column(pd.Series(["22.104,67", None, "", "  ", "abc", "1e5", "12,5 TL", "-1.000"]))
+    np.testing.assert_array_equal(parsed.values[[0, 1, 2, 3, 7]], [22104.67, 0.0, 0.0, 0.0, -1000.0])
+    assert np.isnan(parsed.values[[4, 5, 6]]).all()
+    assert parsed.invalid_rows == [4, 5, 6]
+
+def test_excel_number_cells_and_text_mixed():
+    parsed = parse_number_column(pd.Series([45000, 33030.5, "22.104,67", None, "x"], dtype=object))
+    np.testing.assert_array_equal(parsed.values[:4], [45000.0, 33030.5, 22104.67, 0.0])
+    assert parsed.invalid_rows == [4]
+
+def test_numeric_column():
+    parsed = parse_number_column(pd.Series([45000.0, np.nan, 1.5]))
+    np.testing.assert_array_equal(parsed.values, [45000.0, 0.0, 1.5])
+    assert parsed.number_format == "numeric"
+
+@pytest.mark.parametrize("text", [
+    "22.104,67", "22104,67", "22104.67", "1.234.567", "1.234.567,89", "-5", "+12,5", "0.5", ".5", "500",
+    "1e5", "inf", "nan", "12,5 TL", "1,2,3", "abc"
+])
+def test_scalar_agrees_with_column_parser(text):
+    """Tek hücrelik sütunda (biçim çoğunluğu yok) vektörel sonuç skaler ile aynıdır; geçersizler 0 / NaN."""
+    parsed = parse_number_column(pd.Series([text]))
+    scalar = parse_turkish_float(text)
+    if parsed.invalid_rows:
+        assert scalar == 0.0
+    else:
+        assert parsed.values[0] == scalar
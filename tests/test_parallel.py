@@ -0,0 +1,42 @@
+"""Süreç havuzundaki çalışan bordrosunun seri hesapla birebir karşılaştırılması."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from bordro import (
+    EMPLOYEE_FIELDS, PayrollPipeline, ResultCache, SGK_TESVIK_SECENEKLERI, calculate_employee_payroll_batch,
+    rules_for_incentive
+)
+from bordro.parallel import ParallelPayroll
+
+INCENTIVES = list(SGK_TESVIK_SECENEKLERI)
+
+@pytest.fixture(scope="module")
+def pool():
+    with ParallelPayroll(workers=2, min_rows_per_worker=50) as pool:
+        yield pool
+
+def _wages(seed, n=400):
+    rng = np.random.default_rng(seed)
+    return np.round(rng.uniform(20_000, 500_000, n), 2), np.where(rng.random(n) < 0.5, "Net", "Brüt")
+
+@pytest.mark.parametrize("incentive", INCENTIVES)
+def test_parallel_equals_serial(pool, incentive):
+    rules = rules_for_incentive(incentive)
+    wages, types = _wages(seed=3)
+    serial = calculate_employee_payroll_batch(wages, types, rules)
+    parallel = pool.employee_payroll(wages, types, rules)
+    assert pool.parallel_runs > 0
+    for i, field in enumerate(EMPLOYEE_FIELDS):
+        np.testing.assert_array_equal(parallel[i], serial[field], err_msg=field)
+
+def test_pipeline_with_executor_equals_serial(pool):
+    wages, _ = _wages(seed=4)
+    roster = pd.DataFrame({"Maaş": wages, "Personel": [f"P{i}" for i in range(len(wages))], "Departman": "Genel"})
+    args = (roster, "digest", "Maaş", "Personel", "Departman", 0.3, "Net", rules_for_incentive(INCENTIVES[1]), 0.25)
+    runs = pool.parallel_runs
+    serial, serial_block = PayrollPipeline(ResultCache(max_bytes=64 * 2**20)).run(*args)
+    parallel, parallel_block = PayrollPipeline(ResultCache(max_bytes=64 * 2**20), executor=pool).run(*args)
+    assert pool.parallel_runs > runs
+    pd.testing.assert_frame_equal(parallel, serial)
+    np.testing.assert_array_equal(parallel_block.data, serial_block.data)
@@ -0,0 +1,74 @@
+"""Aşamalı hesaplama hattı: değişen parametreden sadece sonraki aşamalar yeniden hesaplanır."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from bordro import PayrollPipeline, ResultCache, SGK_TESVIK_SECENEKLERI, rules_for_incentive
+
+STAGES = PayrollPipeline.STAGES
+INCENTIVES = list(SGK_TESVIK_SECENEKLERI)
+
+BASE = {"raise_rate": 0.3, "calc_type": "Brüt", "rules": rules_for_incentive(INCENTIVES[0]), "corporate_tax_rate": 0.25}
+
+@pytest.fixture
+def pipeline():
+    return PayrollPipeline(ResultCache(max_bytes=64 * 2**20))
+
+@pytest.fixture
+def roster():
+    wages = np.round(np.linspace(25_000, 350_000, 200), 2)
+    return pd.DataFrame({"Maaş": wages, "Personel": [f"P{i}" for i in range(200)], "Departman": "Genel"})
+
+def _run(pipeline, df, **changes):
+    params = {**BASE, **changes}
+    return pipeline.run(
+        df, "digest", "Maaş", "Personel", "Departman", params["raise_rate"], params["calc_type"], params["rules"],
+        params["corporate_tax_rate"]
+    )
+
+def _computed(pipeline):
+    return [name for name in STAGES if pipeline.status[name] == "computed"]
+
+def test_first_run_computes_all(pipeline, roster):
+    _run(pipeline, roster)
+    assert _computed(pipeline) == list(STAGES)
+
+@pytest.mark.parametrize("changes, recomputed", [
+    ({}, []),
+    ({"corporate_tax_rate": 0.2}, ["corporate", "aggregate"]),
+    ({"rules": rules_for_incentive(INCENTIVES[2])}, ["employer", "corporate", "aggregate"]),
+    ({"calc_type": "Net"}, ["employee", "employer", "corporate", "aggregate"]),
+    ({"raise_rate": 0.1}, ["target", "employee", "employer", "corporate", "aggregate"]),
+])
+def test_only_downstream_stages_recompute(pipeline, roster, changes, recomputed):
+    _run(pipeline, roster)
+    _run(pipeline, roster, **changes)
+    assert _computed(pipeline) == recomputed
+
+def test_incentive_change_keeps_employee_side(pipeline, roster):
+    before, _ = _run(pipeline, roster)
+    after, _ = _run(pipeline, roster, rules=rules_for_incentive(INCENTIVES[2]))
+    np.testing.assert_array_equal(after["Yillik_Net_Ucret"], before["Yillik_Net_Ucret"])
+    assert (after["Yillik_SGK_Isveren"] > before["Yillik_SGK_Isveren"]).all()
+
+def test_incremental_result_matches_fresh_run(pipeline, roster):
+    changes = {"rules": rules_for_incentive(INCENTIVES[1]), "corporate_tax_rate": 0.3}
+    _run(pipeline, roster)
+    incremental, block = _run(pipeline, roster, **changes)
+    fresh, fresh_block = _run(PayrollPipeline(), roster, **changes)
+    pd.testing.assert_frame_equal(incremental, fresh)
+    np.testing.assert_array_equal(block.data, fresh_block.data)
+
+def test_summary_survives_upstream_eviction(pipeline, roster):
+    roster["Maaş"] = roster["Maaş"].astype(object)
+    roster.loc[3, "Maaş"] = "yok"
+    _run(pipeline, roster)
+    stats, invalid = pipeline.dedup_stats(), pipeline.invalid_wage_rows()
+    # Sonuç tablosu dışındaki aşamalar önbellekten düşmüş gibi: özet yine de yeniden hesap gerektirmez
+    for key in [key for key in pipeline.cache._items if key[:2] != ("stage", "aggregate")]:
+        pipeline.cache._items.pop(key)
+    rerun = PayrollPipeline(pipeline.cache)
+    _run(rerun, roster)
+    assert _computed(rerun) == []
+    assert rerun.dedup_stats() == stats
+    assert rerun.invalid_wage_rows() == invalid == [(3, "yok")]
@@ -0,0 +1,53 @@
+"""Bellek bütçeli sonuç önbelleği ve oturumlar arası sonuç paylaşımı."""
+import numpy as np
+import pandas as pd
+
+from bordro import DEFAULT_RULES, PayrollPipeline, ResultCache, file_digest
+
+def _roster(n=300):
+    wages = np.round(np.linspace(30_000, 400_000, n), 2)
+    return pd.DataFrame({"Maaş": wages, "Personel": [f"P{i}" for i in range(n)], "Departman": "Genel"})
+
+def _run(pipeline, df, digest, raise_rate=0.3, calc_type="Brüt"):
+    return pipeline.run(df, digest, "Maaş", "Personel", "Departman", raise_rate, calc_type, DEFAULT_RULES, 0.25)
+
+def test_lru_eviction_and_counters():
+    cache = ResultCache(max_bytes=3 * 800)
+    for key in "abc":
+        cache.put(key, np.zeros(100))  # 800 bayt
+    assert cache.get("a") is not None  # "a" en son kullanılan olur
+    cache.put("d", np.zeros(100))      # En uzun süre kullanılmayan "b" atılır
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in "acd")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (4, 1, 1, 3)
+    assert stats["bytes"] <= stats["max_bytes"]
+
+def test_oversized_value_is_not_stored():
+    cache = ResultCache(max_bytes=100)
+    value = np.zeros(100)
+    assert cache.put("big", value) is value
+    assert cache.get("big") is None and cache.stats()["bytes"] == 0
+
+def test_sessions_share_results():
+    df = _roster()
+    digest = file_digest(df.to_csv().encode())
+    cache = ResultCache(max_bytes=64 * 2**20)
+    first, first_block = _run(PayrollPipeline(cache), df, digest)
+
+    # Başka bir oturum (yeni hat) aynı dosya ve parametrelerle: sonuç önbellekten, hiçbir aşama hesaplanmaz
+    session = PayrollPipeline(cache)
+    again, again_block = _run(session, df, digest)
+    assert again is first and again_block is first_block
+    assert set(session.status.values()) == {"reused"}
+
+    # Farklı parametre farklı anahtardır
+    other, _ = _run(PayrollPipeline(cache), df, digest, raise_rate=0.1)
+    assert other is not first
+    assert not np.array_equal(other["Toplam_Yillik_Maliyet"], first["Toplam_Yillik_Maliyet"])
+
+def test_uncached_pipeline_matches_cached():
+    df = _roster()
+    cached, _ = _run(PayrollPipeline(ResultCache(max_bytes=64 * 2**20)), df, "x", calc_type="Net")
+    uncached, _ = _run(PayrollPipeline(), df, "x", calc_type="Net")
+    pd.testing.assert_frame_equal(cached, uncached)
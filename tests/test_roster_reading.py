@@ -0,0 +1,60 @@
+"""Parça parça okumanın pandas'ın tek seferlik okumasıyla karşılaştırılması."""
+import pandas as pd
+import pytest
+
+from bordro import iter_roster_chunks, read_roster
+
+HEADER = ["Personel", "Maaş", "Departman", "Maaş", None, "Maaş.1", "Maaş"]
+ROWS = [
+    ["Ayşe Yılmaz", 45000, "Muhasebe", "22.104,67", "x", 1, 7],
+    ["Mehmet Demir", 33030.5, "Satış", "22104.67", None, 2, 8],
+    ["Zeynep Kaya", None, "Üretim", "", "y", 3, 9],
+    ["Ali Can", 120000, None, "1.234", "z", 4, 10],
+    ["Elif Şahin", 52000, "Muhasebe", "abc", None, 5, 11],
+]
+
+@pytest.fixture
+def xlsx_path(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER)
+    for row in ROWS:
+        sheet.append(row)
+    path = tmp_path / "personel.xlsx"
+    workbook.save(path)
+    return path
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "personel.csv"
+    header = ";".join(name or "" for name in HEADER)
+    lines = [";".join("" if value is None else str(value) for value in row) for row in ROWS]
+    path.write_text("\n".join([header, *lines]) + "\n", encoding="utf-8")
+    return path
+
+def _normalized(df):
+    """Parça başına tür çıkarımı boş hücreleri None veya NaN yapabilir; karşılaştırmada ikisi de None sayılır."""
+    return df.astype(object).where(df.notna(), None)
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 50])
+def test_xlsx_chunks_match_read_excel(xlsx_path, chunk_rows):
+    chunks = list(iter_roster_chunks(xlsx_path, chunk_rows=chunk_rows))
+    assert [len(chunk) for chunk in chunks[:-1]] == [chunk_rows] * (len(chunks) - 1)
+    expected = pd.read_excel(xlsx_path)
+    # Tekrarlanan ve boş başlıklar pd.read_excel ile aynı adlandırılır
+    assert list(chunks[0].columns) == ["Personel", "Maaş", "Departman", "Maaş.2", "Unnamed: 4", "Maaş.1", "Maaş.3"]
+    combined = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(_normalized(combined), _normalized(expected), check_dtype=False)
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 50])
+def test_csv_chunks_match_read_csv(csv_path, chunk_rows):
+    chunks = list(iter_roster_chunks(csv_path, chunk_rows=chunk_rows))
+    expected = pd.read_csv(csv_path, sep=";", dtype=str)
+    expected.columns = expected.columns.str.strip()
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+def test_read_roster_reports_progress(xlsx_path):
+    progress = []
+    df = read_roster(xlsx_path, on_progress=progress.append)
+    assert len(df) == len(ROWS) and progress[-1] == len(ROWS)
@@ -0,0 +1,116 @@
+"""JSON/HTTP bordro servisi: başarılı yanıt, doğrulama hataları (400) ve toplu hesabın skaler motorla eşitliği."""
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from bordro import PAYROLL_FIELDS, calculate_payroll_month
+from bordro.server import MAX_AMOUNT, PayrollService, RequestError, _encode, parse_rules
+
+async def _request(port, method, path, payload=None):
+    """Tek bağlantıda bir HTTP isteği: (durum kodu, JSON gövde)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b"" if payload is None else json.dumps(payload).encode()
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+def _call(requests, window=0.002):
+    """Servisi rastgele bir portta başlatıp istekleri (yöntem, yol, gövde) eşzamanlı gönderir."""
+    async def main():
+        async with PayrollService(workers=1, window=window) as service:
+            server = await service.start("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                responses = await asyncio.gather(*(_request(port, *request) for request in requests))
+            return responses, service
+    return asyncio.run(main())
+
+def _scalar_months(wage, wage_type, rules):
+    months, cumulative = [], 0.0
+    for month in range(12):
+        result = calculate_payroll_month(wage, wage_type, month, cumulative, rules)
+        cumulative += result["income_tax_base"]
+        months.append([result[field] for field in PAYROLL_FIELDS])
+    return np.array(months)
+
+def _months(result):
+    return np.array([[month[field] for field in PAYROLL_FIELDS] for month in result["months"]])
+
+def test_single_request():
+    [(status, result)], _ = _call([("POST", "/v1/bordro", {"wage": 50_000, "type": "net", "round": False})])
+    assert status == 200
+    assert result["type"] == "Net" and len(result["months"]) == 12
+    np.testing.assert_array_equal(_months(result), _scalar_months(50_000, "Net", parse_rules({})))
+    assert result["yearly"]["net_pay"] == pytest.approx(12 * 50_000)
+    assert "cumulative_tax_base" not in result["yearly"]
+
+@pytest.mark.parametrize("payload", [
+    {"wage": 1e308},
+    {"wage": MAX_AMOUNT * 2},
+    {"wage": -1},
+    {"wage": 0},
+    {"wage": True},
+    {"wage": "50000"},
+    {},
+    {"wage": 50_000, "type": "yarım"},
+    {"wage": 50_000, "incentive": "bilinmeyen"},
+    {"wage": 50_000, "rules": {"sgk_tavan": 1e300}},
+    {"wage": 50_000, "rules": {"bilinmeyen_alan": 1}},
+    {"wage": 50_000, "rules": {"sgk_isci_orani": 1.5}},
+    {"wage": 50_000, "rules": {"sgk_isci_orani": 0.6, "issizlik_isci_orani": 0.5}},
+    {"wage": 50_000, "rules": {"sgk_taban": 400_000, "sgk_tavan": 300_000}},
+    {"wage": 50_000, "rules": {"gelir_vergisi_dilimleri": []}},
+    {"wage": 50_000, "rules": {"gelir_vergisi_dilimleri": [[100_000, 0.15], [50_000, 0.2], ["inf", 0.4]]}},
+    {"wage": 50_000, "rules": {"gelir_vergisi_dilimleri": [[100_000, 0.15], ["inf", 1.2]]}},
+    {"wage": 50_000, "rules": {"gelir_vergisi_dilimleri": [[100_000, 0.15], [200_000, 0.2]]}},
+    {"wage": 50_000, "rules": {"gelir_vergisi_dilimleri": [[1e300, 0.15], ["inf", 0.2]]}},
+    {"wage": 50_000, "rules": {"gelir_vergisi_dilimleri": "15%"}},
+])
+def test_invalid_requests(payload):
+    [(status, result)], service = _call([("POST", "/v1/bordro", payload)])
+    assert status == 400
+    assert result["error"]
+    assert service.errors == 1
+
+def test_non_finite_result_is_rejected():
+    with pytest.raises(RequestError) as error:
+        _encode({"net_pay": float("inf")})
+    assert error.value.status == 400
+
+def test_routes():
+    responses, _ = _call([
+        ("GET", "/v1/bordro"), ("POST", "/v1/yok", {}), ("POST", "/v1/bordro/toplu", {"employees": []}),
+        ("GET", "/v1/durum")
+    ])
+    assert [status for status, _ in responses] == [405, 404, 400, 200]
+
+def test_micro_batches_equal_scalar():
+    rng = np.random.default_rng(21)
+    wages = np.round(rng.uniform(20_000, 500_000, 40), 2).tolist()
+    types = ["Brüt", "Net"] * 20
+    incentives = ["imalat", "yok"]
+    requests = [
+        ("POST", "/v1/bordro", {"wage": wage, "type": wage_type, "incentive": incentives[i % 2], "round": False})
+        for i, (wage, wage_type) in enumerate(zip(wages, types))
+    ]
+    requests.append(("POST", "/v1/bordro/toplu", {
+        "incentive": "yok", "round": False,
+        "employees": [{"wage": wage, "type": wage_type} for wage, wage_type in zip(wages, types)]
+    }))
+    responses, service = _call(requests, window=0.05)
+    assert all(status == 200 for status, _ in responses)
+    # Eşzamanlı istekler kural seti başına birkaç toplu hesapta birleşir
+    assert service.batcher.batches < len(requests)
+    for i, (wage, wage_type) in enumerate(zip(wages, types)):
+        rules = parse_rules({"incentive": incentives[i % 2]})
+        np.testing.assert_array_equal(_months(responses[i][1]), _scalar_months(wage, wage_type, rules))
+    for result, wage, wage_type in zip(responses[-1][1]["employees"], wages, types):
+        np.testing.assert_array_equal(_months(result), _scalar_months(wage, wage_type, parse_rules({"incentive": "yok"})))
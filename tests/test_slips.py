@@ -0,0 +1,76 @@
+"""Toplu bordro arşivinin içeriği: dosya/sayfa sayısı, aylık satırlar ve TOPLAM satırı skaler motora göre."""
+import io
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import openpyxl
+import pytest
+
+from bordro import MONTH_NAMES, DEFAULT_RULES, PayrollBlock, calculate_payroll_batch, calculate_payroll_month
+from bordro.parallel import mp_context
+from bordro.pipeline import PERSON_PAYROLL_COLUMNS
+from bordro.slips import SHEETS_PER_WORKBOOK, slip_archive_bytes, slip_archive_file
+
+NAMES = [f"P{i}" for i in range(SHEETS_PER_WORKBOOK + 5)] + ["P1", "Ad/Soyad"]
+
+@pytest.fixture(scope="module")
+def block():
+    wages = np.linspace(DEFAULT_RULES.asgari_ucret_brut, 400_000, len(NAMES)).round(2)
+    types = np.where(np.arange(len(NAMES)) % 2, "Net", "Brüt")
+    return PayrollBlock(NAMES, calculate_payroll_batch(wages, types)), wages, types
+
+def _scalar_rows(wage, calc_type):
+    """Skaler motorla 12 ay + TOPLAM (kümülatif matrahın toplamı 0), kişi bordrosu sütun sırasıyla."""
+    rows, cumulative = [], 0.0
+    for month in range(12):
+        result = calculate_payroll_month(wage, calc_type, month, cumulative)
+        cumulative += result["income_tax_base"]
+        rows.append([result[field] for field in PERSON_PAYROLL_COLUMNS])
+    totals = [sum(column) for column in zip(*rows)]
+    totals[list(PERSON_PAYROLL_COLUMNS).index("cumulative_tax_base")] = 0
+    return rows + [totals]
+
+def _sheets(data):
+    """ZIP'teki tüm çalışma kitaplarının sayfaları sırasıyla: [(dosya, sayfa adı, satırlar)]."""
+    sheets = []
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for name in archive.namelist():
+            workbook = openpyxl.load_workbook(io.BytesIO(archive.read(name)), read_only=True)
+            for sheet in workbook.worksheets:
+                sheets.append((name, sheet.title, [list(row) for row in sheet.iter_rows(values_only=True)]))
+    return sheets
+
+@pytest.mark.parametrize("layout, files", [("kisi", len(NAMES)), ("sayfa", 2)])
+def test_archive_contents(block, layout, files):
+    payroll_block, wages, types = block
+    sheets = _sheets(slip_archive_bytes(payroll_block, layout, workers=1))
+    assert len({name for name, _, _ in sheets}) == files
+    assert len(sheets) == len(NAMES)
+    for (name, title, rows), wage, calc_type in zip(sheets, wages, types):
+        assert rows[0] == ["Ay", *PERSON_PAYROLL_COLUMNS.values()]
+        assert [row[0] for row in rows[1:]] == MONTH_NAMES + ["TOPLAM"]
+        # xlsx sayıları 16 anlamlı basamakla saklar
+        np.testing.assert_allclose([row[1:] for row in rows[1:]], _scalar_rows(wage, calc_type), rtol=1e-15, atol=0)
+    titles = [title for _, title, _ in sheets]
+    assert titles[-2:] == ["P1 (2)", "Ad_Soyad"]
+
+def test_archive_matches_person_table(block):
+    payroll_block, _, _ = block
+    _, _, rows = _sheets(slip_archive_bytes(payroll_block, "kisi", workers=1))[3]
+    table = payroll_block.person_table(3)
+    assert [row[0] for row in rows[1:]] == table["Ay"].tolist()
+    np.testing.assert_allclose([row[1:] for row in rows[1:]], table.iloc[:, 1:].to_numpy(), rtol=1e-15, atol=0)
+
+def test_shared_pool_and_temp_file(block):
+    payroll_block, _, _ = block
+    expected = _sheets(slip_archive_bytes(payroll_block, "sayfa", workers=1))
+    # Bellek sınırı aşılınca arşiv diske taşınır; with bloğundan çıkınca kapatılıp silinir
+    with slip_archive_file(payroll_block, "sayfa", workers=1, max_memory=1024) as archive:
+        assert _sheets(archive.read()) == expected
+    assert archive.closed
+    with ProcessPoolExecutor(2, mp_context=mp_context()) as pool:
+        first = slip_archive_bytes(payroll_block, "sayfa", workers=2, executor=pool)
+        # Dışarıdan verilen havuz yazıcıyla kapanmaz, sonraki arşivde yeniden kullanılır
+        second = slip_archive_bytes(payroll_block, "sayfa", workers=2, executor=pool)
+    assert _sheets(first) == _sheets(second) == expected